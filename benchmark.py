@@ -0,0 +1,297 @@
+"""
+배정 성능 벤치마크
+
+현재 input 데이터(신청자/좌석/config)를 N배로 복제한 합성 데이터셋을 임시 폴더에 만들고,
+단계별 소요 시간·처리량·최대 메모리를 측정합니다.
+
+측정 단계:
+  - load_students / load_seats
+  - seat_pool (좌석 풀 인덱스 구축)
+  - run_allocation의 각 phase
+  - write_result_csv (seat_result.csv)
+  - locker.main (seat_result.csv 로드 + 사물함 배정 + CSV/xlsx 저장)
+  - locker CSV / xlsx 저장 (write_locker_csv / write_locker_xlsx 단독)
+
+합성 데이터: 배율 k면 열람실을 k벌 복제하고(이름 뒤에 " #i"), 신청자도 k벌 복제하여
+i번째 복제본은 i번째 열람실 복제본만 지망합니다 (열람실별 수요/공급 비율은 원본과 같음).
+사물함 매핑(사용 불가 사물함 포함)과 노트북 금지 열람실도 같이 복제합니다.
+
+시간은 --repeat회 중 최솟값, 메모리는 tracemalloc으로 1회 따로 측정합니다
+(tracemalloc은 실행을 느리게 하므로 시간 측정과 분리).
+
+결과는 JSON으로 저장되며, --compare로 이전 결과와 단계별 시간 비율을 비교할 수 있습니다.
+
+사용법: python benchmark.py [--scales 1 10 100] [--repeat 3] [--output output/benchmark.json]
+        python benchmark.py --compare output/benchmark_old.json
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import yaml
+
+import locker
+from config import load_config
+from records import Codebook
+from seat import load_students, load_seats, run_allocation, write_result_csv
+from seat_pool import SeatPool
+
+
+# ============================================================
+# 합성 데이터셋
+# ============================================================
+
+def _replica(name, i):
+    """i번째 복제본 이름 (0번은 원본 이름 그대로)"""
+    return name if i == 0 else f"{name} #{i + 1}"
+
+
+def make_dataset(workdir, scale, base_config):
+    """
+    base_config의 입력 파일을 scale배로 복제하여 workdir에 config.yaml과 input/을 만듭니다.
+
+    Returns: (신청자 수, 좌석 수)
+    """
+    paths = base_config['paths']
+    os.makedirs(os.path.join(workdir, 'input'), exist_ok=True)
+    os.makedirs(os.path.join(workdir, 'output'), exist_ok=True)
+
+    # config: 열람실 관련 설정을 복제
+    config = dict(base_config)
+    config['valid_rooms'] = [_replica(r, i) for i in range(scale) for r in base_config['valid_rooms']]
+    config['laptop_not_allowed_zones'] = [
+        _replica(r, i) for i in range(scale) for r in base_config['laptop_not_allowed_zones']]
+    config['locker_mapping'] = {
+        _replica(room, i): {'lockers': [dict(lk, location=_replica(lk['location'], i))
+                                        for lk in info['lockers']]}
+        for i in range(scale) for room, info in base_config['locker_mapping'].items()
+    }
+    config['locker_out_of_service'] = {
+        _replica(loc, i): list(numbers)
+        for i in range(scale) for loc, numbers in base_config.get('locker_out_of_service', {}).items()
+    }
+    config['paths'] = {key: './' + os.path.relpath(value, '.').replace(os.sep, '/')
+                       for key, value in paths.items()}
+    with open(os.path.join(workdir, 'config.yaml'), mode='wt', encoding='UTF-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+    # 신청자: i번째 복제본은 i번째 열람실 복제본을 지망, 학번 앞에 복제 번호를 붙여 중복 방지
+    with open(paths['input_students'], mode='rt', encoding='UTF-8') as f:
+        rows = list(csv.reader(f))
+    header, applicants = rows[0], [r for r in rows[1:] if len(r) >= 8]
+    with open(os.path.join(workdir, paths['input_students']), mode='wt', encoding='UTF-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(scale):
+            for r in applicants:
+                writer.writerow(r[:3] + [f"{i}{r[3]}", r[4]] + [_replica(p, i) for p in r[5:8]])
+
+    # 좌석
+    with open(paths['input_seats'], mode='rt', encoding='UTF-8') as f:
+        rows = list(csv.reader(f))
+    header, seats = rows[0], [r for r in rows[1:] if len(r) > 1]
+    with open(os.path.join(workdir, paths['input_seats']), mode='wt', encoding='UTF-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i in range(scale):
+            for r in seats:
+                writer.writerow([r[0], _replica(r[1], i)] + r[2:])
+
+    return len(applicants) * scale, len(seats) * scale
+
+
+# ============================================================
+# 단계별 측정
+# ============================================================
+
+class StageRecorder:
+    """단계별 소요 시간(초), 처리 건수, (선택) 최대 메모리를 기록합니다."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        with recorder.stage(name) as rec: ... 형태로 사용합니다.
+        처리 건수는 블록 안에서 rec['items']에 넣습니다.
+        """
+        rec = {'items': 0}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield rec
+        rec['seconds'] = time.perf_counter() - start
+        if self.trace_memory:
+            rec['peak_bytes'] = tracemalloc.get_traced_memory()[1] - base
+        self.stages[name] = rec
+
+
+def run_stages(recorder, seed=0):
+    """현재 폴더(make_dataset으로 만든 폴더)의 config.yaml로 전체 배정 흐름을 단계별로 실행합니다."""
+    config = load_config()
+    paths = config['paths']
+    codebook = Codebook(config)
+
+    with recorder.stage('load_students') as rec:
+        students = load_students(paths['input_students'], codebook)
+        rec['items'] = len(students)
+
+    with recorder.stage('load_seats') as rec:
+        seatlist = [s for s in load_seats(paths['input_seats'], codebook) if s.status == 'open']
+        rec['items'] = len(seatlist)
+
+    with recorder.stage('seat_pool') as rec:
+        pool = SeatPool(seatlist, mode=config.get('seat_pool_mode', 'compat'),
+                        laptop_rooms=codebook.laptop_rooms)
+        rec['items'] = len(seatlist)
+
+    random.seed(seed)
+    result = {}
+    for i, phase in enumerate(config['phases']):
+        with recorder.stage(f"phase[{i}] {phase['name']}") as rec:
+            rec['candidates'] = len(students)
+            assigned = run_allocation(students, pool, config, codebook, phases=[phase])
+            rec['items'] = len(assigned)
+        result.update(assigned)
+
+    with recorder.stage('write_result_csv') as rec:
+        write_result_csv(paths['output_result'], result, codebook)
+        rec['items'] = len(result)
+
+    with recorder.stage('locker.main') as rec:
+        locker.main(mode='normal')
+        rec['items'] = len(result)
+
+    rows = list(locker.read_locker_csv(paths['output_locker_result']))
+
+    with recorder.stage('write_locker_csv') as rec:
+        locker.write_locker_csv(paths['output_locker_result'], rows)
+        rec['items'] = len(rows)
+
+    with recorder.stage('write_locker_xlsx') as rec:
+        locker.write_locker_xlsx(paths['output_locker_result_xlsx'], rows)
+        rec['items'] = len(rows)
+
+
+def benchmark_scale(scale, base_config, repeat):
+    """scale배 데이터셋을 만들어 단계별 시간(repeat회 중 최솟값)과 최대 메모리를 측정합니다."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f"seat_bench_{scale}x_") as workdir:
+        n_students, n_seats = make_dataset(workdir, scale, base_config)
+        os.chdir(workdir)
+        try:
+            timings = []
+            for _ in range(repeat):
+                recorder = StageRecorder()
+                run_stages(recorder)
+                timings.append(recorder.stages)
+
+            tracemalloc.start()
+            try:
+                memory = StageRecorder(trace_memory=True)
+                run_stages(memory)
+            finally:
+                tracemalloc.stop()
+        finally:
+            os.chdir(cwd)
+
+    stages = {}
+    for name in timings[0]:
+        seconds = min(t[name]['seconds'] for t in timings)
+        items = timings[0][name]['items']
+        stages[name] = {
+            'seconds': seconds,
+            'items': items,
+            'items_per_sec': items / seconds if seconds > 0 else None,
+            'peak_bytes': memory.stages[name]['peak_bytes'],
+        }
+        if 'candidates' in timings[0][name]:
+            stages[name]['candidates'] = timings[0][name]['candidates']
+
+    return {
+        'scale': scale,
+        'students': n_students,
+        'seats': n_seats,
+        'total_seconds': sum(st['seconds'] for st in stages.values()),
+        'stages': stages,
+    }
+
+
+# ============================================================
+# 출력 / 비교
+# ============================================================
+
+def print_report(report, baseline=None):
+    """결과 표를 출력합니다. baseline(이전 JSON)이 있으면 단계별 시간 비율(현재/이전)도 출력합니다."""
+    base_scales = {r['scale']: r for r in baseline['results']} if baseline else {}
+
+    for res in report['results']:
+        print(f"\n=== {res['scale']}배 (신청자 {res['students']}명, 좌석 {res['seats']}석) ===")
+        header = f"{'단계':<28} {'시간(ms)':>10} {'처리량(/s)':>12} {'최대메모리(KB)':>14}"
+        if baseline:
+            header += f" {'이전 대비':>9}"
+        print(header)
+        print("-" * (len(header) + 8))
+
+        base_stages = base_scales.get(res['scale'], {}).get('stages', {})
+        for name, st in res['stages'].items():
+            rate = f"{st['items_per_sec']:,.0f}" if st['items_per_sec'] else "-"
+            line = (f"{name:<28} {st['seconds'] * 1000:>10.1f} {rate:>12} "
+                    f"{st['peak_bytes'] / 1024:>14,.0f}")
+            if baseline:
+                prev = base_stages.get(name)
+                line += f" {st['seconds'] / prev['seconds']:>8.2f}x" if prev and prev['seconds'] else f" {'-':>9}"
+            print(line)
+        print(f"{'합계':<28} {res['total_seconds'] * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='좌석/사물함 배정 벤치마크')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='데이터 배율 목록 (기본: 1 10 100)')
+    parser.add_argument('--repeat', type=int, default=3, help='배율별 반복 횟수 (기본: 3, 최솟값 사용)')
+    parser.add_argument('--output', default='./output/benchmark.json',
+                        help='결과 JSON 저장 경로 (기본: ./output/benchmark.json)')
+    parser.add_argument('--compare', default=None, help='비교할 이전 결과 JSON 경로')
+    args = parser.parse_args()
+
+    base_config = load_config()
+
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': [],
+    }
+    for scale in args.scales:
+        print(f"[*] {scale}배 데이터셋 측정 중...")
+        report['results'].append(benchmark_scale(scale, base_config, args.repeat))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, mode='rt', encoding='UTF-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, mode='wt', encoding='UTF-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n[+] 벤치마크 결과 저장 경로: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
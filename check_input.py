@@ -1,90 +1,248 @@
 """
 입력 데이터 검증 모듈
 
-input_data.csv와 seatlist.csv를 읽어 다음을 검증합니다:
+input_data.csv와 seatlist.csv를 csv 모듈로 한 번씩 훑으며 다음을 검증합니다:
   - 이메일 중복 여부
   - 학번 중복 여부
   - 이름+학번뒤2자리 조합 중복 여부 (결과 파일에서 식별자로 사용되므로)
-  - 학생 수 ≤ 좌석 수 여부
-"""
-
-from config import load_config
-
+  - 학년/지위, 1~3지망 열람실 유효성
+  - 좌석 행의 좌석타입/열람실/배치유무 유효성, 좌석 중복
+  - 학생 수 ≤ 좌석 수 여부, phase별 좌석타입별 수요(대상 학생) 대비 open 좌석 수
 
-def main(config=None):
-    if config is None:
-        config = load_config()
-    paths = config['paths']
+처음 발견한 문제에서 멈추지 않고 모든 문제를 ValidationReport에 모아 한 번에 출력합니다.
+유효하지 않은 값(학년/지망/좌석 행)이 있으면 출력 후 ValueError를 발생시키고,
+중복과 좌석 수 부족은 경고로만 출력합니다.
+"""
 
-    valid_rooms = set(config.get('valid_rooms', []))
-    valid_student_types = set(config.get('valid_student_types', []))
+import contextlib
+import csv
+from collections import Counter
+
+from config import compiled_config, load_config
+
+
+STUDENT_COLUMNS = 8  # 타임스탬프, 이메일, 이름, 학번, 학년, 1지망, 2지망, 3지망
+SEAT_COLUMNS = 4     # 학년(좌석타입), 열람실, 번호, 배치유무
+SEAT_STATUSES = ('open', 'closed')
+
+
+class ValidationReport:
+    """
+    입력 검증 결과.
+
+    students / seats: 신청자 수 / open 좌석 수
+    duplicates: { 항목명: [(행번호, 값), ...] }  (경고)
+    invalid_values: [(파일, 행번호, 필드명, 값, 이름/열람실), ...]  (오류)
+    demand: { 학년/지위: 신청자 수 }
+    capacity: { 좌석타입: open 좌석 수 }
+    phases: [{'name', 'type', 'rows': [(좌석타입, 수요, 좌석 수), ...], 'demand', 'capacity'}]
+    """
+
+    def __init__(self):
+        self.students = 0
+        self.seats = 0
+        self.duplicates = {'이메일': [], '학번': [], '이름+학번뒤2자리': [], '좌석': []}
+        self.invalid_values = []
+        self.demand = Counter()
+        self.capacity = Counter()
+        self.phases = []
+
+    @property
+    def has_errors(self):
+        return bool(self.invalid_values)
+
+    @property
+    def seat_shortage(self):
+        return self.students > self.seats
+
+    def to_dict(self):
+        return {
+            'students': self.students,
+            'seats': self.seats,
+            'duplicates': {field: [list(item) for item in items] for field, items in self.duplicates.items()},
+            'invalid_values': [list(item) for item in self.invalid_values],
+            'demand': dict(self.demand),
+            'capacity': dict(self.capacity),
+            'phases': self.phases,
+        }
+
+    def print(self):
+        for field, items in self.duplicates.items():
+            for row_num, value in items:
+                print(f"[-] 중복 {field} 발생: {value} ({row_num}행)")
+
+        if self.invalid_values:
+            print(f"[!] 입력 데이터에 유효하지 않은 값 {len(self.invalid_values)}건:")
+            for filename, row_num, field, value, owner in self.invalid_values:
+                print(f"  - {filename} {row_num}행 {owner}: {field} = '{value}'")
+
+        print(f"[*] 신청자 {self.students}명 / open 좌석 {self.seats}석")
+        for phase in self.phases:
+            print(f"[*] [{phase['name']}] 수요 {phase['demand']}명 / 좌석 {phase['capacity']}석")
+            for seat_type, demand, capacity in phase['rows']:
+                mark = " (초과)" if demand > capacity else ""
+                print(f"      {seat_type:<8} 수요 {demand:>5} / 좌석 {capacity:>5}{mark}")
+
+        if self.seat_shortage:
+            print("[-]좌석 수 부족. 입력값 조정할 것!")
+
+
+# ============================================================
+# 파일별 검증 (각 파일 1회 순회)
+# ============================================================
+
+def check_students(rows, config, report):
+    """
+    신청자 CSV 행(헤더 포함)을 한 번 순회하며 중복/유효성을 검사하고 학년별 신청자 수를 셉니다.
+    행번호는 파일의 줄 번호(헤더 = 1행)입니다.
+    """
+    compiled = compiled_config(config)
+    valid_rooms = compiled.valid_rooms
+    valid_student_types = compiled.valid_student_types
 
-    stdnum, seatnum = 0, 0
     emails = set()
     student_ids = set()
     name_id2_set = set()  # 이름+학번뒤2자리 조합 중복 확인
-    invalid_values = []  # (행번호, 필드명, 값) 목록
-
-    with open(paths['input_students'], encoding="utf-8-sig") as f_std:
-        lines = f_std.readlines()
-
-        # 첫 줄(header) 건너뛰기
-        for line in lines[1:]:
-            if len(line.strip()) == 0:
-                break
-            stdnum += 1
-            vals = line.strip().split(",")
-            name = vals[2]       # 이름
-            email = vals[1]      # 이메일
-            student_id = vals[3] # 학번
-            grade = vals[4]      # 학년/지위
-            pref1 = vals[5]      # 1지망
-            pref2 = vals[6]      # 2지망
-            pref3 = vals[7]      # 3지망
-
-            # 이메일 중복 체크
-            if email in emails:
-                print(f"[-] 중복 이메일 발생: {email}")
-            else:
-                emails.add(email)
 
-            # 학번 중복 체크
-            if student_id in student_ids:
-                print(f"[-] 중복 학번 발생: {student_id}")
+    reader = csv.reader(rows)
+    next(reader, None)  # 헤더 건너뛰기
+    for vals in reader:
+        if not any(v.strip() for v in vals):
+            continue  # 빈 행
+        row_num = reader.line_num
+        if len(vals) < STUDENT_COLUMNS:
+            report.invalid_values.append(('input_data', row_num, "열 개수", len(vals), vals[2] if len(vals) > 2 else ""))
+            continue
+
+        report.students += 1
+        email = vals[1]       # 이메일
+        name = vals[2]        # 이름
+        student_id = vals[3]  # 학번
+        grade = vals[4]       # 학년/지위
+
+        # 이메일 / 학번 / 이름+학번뒤2자리 중복 체크
+        for field, seen, value in (('이메일', emails, email),
+                                   ('학번', student_ids, student_id),
+                                   ('이름+학번뒤2자리', name_id2_set, name + "_" + student_id[-2:])):
+            if value in seen:
+                report.duplicates[field].append((row_num, value))
             else:
-                student_ids.add(student_id)
+                seen.add(value)
+
+        # 학년/지위 유효성 검증
+        if valid_student_types and grade not in valid_student_types:
+            report.invalid_values.append(('input_data', row_num, "학년", grade, name))
+        report.demand[grade] += 1
+
+        # 1~3지망 열람실 유효성 검증
+        if valid_rooms:
+            for pref_idx, pref in enumerate(vals[5:8], 1):
+                if pref not in valid_rooms:
+                    report.invalid_values.append(('input_data', row_num, f"{pref_idx}지망", pref, name))
+
+
+def check_seats(rows, config, report):
+    """좌석 CSV 행(헤더 포함)을 한 번 순회하며 유효성/중복을 검사하고 좌석타입별 open 좌석 수를 셉니다."""
+    compiled = compiled_config(config)
+    valid_rooms = compiled.valid_rooms
+    valid_seat_types = compiled.valid_seat_types
+
+    seen = set()  # (열람실, 번호)
+
+    reader = csv.reader(rows)
+    next(reader, None)  # 헤더 건너뛰기
+    for vals in reader:
+        if not any(v.strip() for v in vals):
+            continue  # 빈 행
+        row_num = reader.line_num
+        if len(vals) < SEAT_COLUMNS:
+            report.invalid_values.append(('seatlist', row_num, "열 개수", len(vals), vals[1] if len(vals) > 1 else ""))
+            continue
+
+        seat_type, room, number, status = vals[:SEAT_COLUMNS]
+        if valid_seat_types and seat_type not in valid_seat_types:
+            report.invalid_values.append(('seatlist', row_num, "좌석타입", seat_type, room))
+        if valid_rooms and room not in valid_rooms:
+            report.invalid_values.append(('seatlist', row_num, "열람실", room, room))
+        if status not in SEAT_STATUSES:
+            report.invalid_values.append(('seatlist', row_num, "배치유무", status, room))
+
+        if (room, number) in seen:
+            report.duplicates['좌석'].append((row_num, f"{room} {number}번"))
+        else:
+            seen.add((room, number))
+
+        if status == 'open':
+            report.seats += 1
+            report.capacity[seat_type] += 1
+
+
+def check_phases(config, report):
+    """
+    phase마다 좌석타입별 수요와 open 좌석 수를 비교합니다.
+
+    수요: phase 대상 학생(student_types, 빈 목록 = 전체) 중 그 좌석타입을 우선 배정받는 학생 수
+    좌석: 그 좌석타입(seat_types, 빈 목록 = 전체)의 open 좌석 수
+    phase는 누적으로 진행되므로(앞 phase에서 남은 학생이 다음 phase로 넘어감) 수요 초과는 경고가 아니라 참고용입니다.
+    """
+    compiled = compiled_config(config)
+    grade_map = compiled.grade_to_seat_type
+    type_demand = {}  # 학년 → (우선 좌석타입, 신청자 수)
+    for grade, count in report.demand.items():
+        type_demand[grade] = (grade_map.get(grade, grade), count)
+
+    for phase, target_grades in zip(config.get('phases', []), compiled.phase_student_types):
+        seat_types = phase.get('seat_types') or list(config.get('valid_seat_types', []))
+
+        by_type = Counter()
+        for grade, (seat_type, count) in type_demand.items():
+            if not target_grades or grade in target_grades:
+                by_type[seat_type] += count
+
+        rows = [(t, by_type[t], report.capacity[t]) for t in seat_types]
+        # 수요 합계에는 우선 좌석타입이 이 phase에 없는 대상 학생도 포함 (다른 타입 좌석에 배정될 수 있음)
+        report.phases.append({
+            'name': phase.get('name', ''),
+            'type': phase.get('type', ''),
+            'rows': rows,
+            'demand': sum(by_type.values()),
+            'capacity': sum(report.capacity[t] for t in seat_types),
+        })
+
+
+def validate(config, student_rows, seat_rows):
+    """두 입력을 각각 한 번 순회하여 ValidationReport를 반환합니다 (출력/예외 없음)."""
+    report = ValidationReport()
+    check_students(student_rows, config, report)
+    check_seats(seat_rows, config, report)
+    check_phases(config, report)
+    return report
+
+
+def main(config=None, student_lines=None, seat_lines=None):
+    """
+    입력 데이터를 검증하고 결과를 출력합니다. 유효하지 않은 값이 있으면 ValueError.
+
+    student_lines/seat_lines: 이미 읽어 둔 input_data.csv/seatlist.csv의 텍스트 줄 목록
+    (run.py 파이프라인용, 없으면 파일을 한 줄씩 읽음)
+
+    Returns: ValidationReport
+    """
+    if config is None:
+        config = load_config()
+    paths = config['paths']
 
-            # 이름+학번뒤2자리 중복 체크
-            key = name + "_" + student_id[-2:]
-            if key in name_id2_set:
-                print(f"[-] 이름+학번뒤2자리 중복 발생: {key}")
-            else:
-                name_id2_set.add(key)
-
-            # 학년/지위 유효성 검증
-            if valid_student_types and grade not in valid_student_types:
-                invalid_values.append((stdnum + 1, "학년", grade, name))
-
-            # 1~3지망 열람실 유효성 검증
-            if valid_rooms:
-                for pref_idx, pref in enumerate([pref1, pref2, pref3], 1):
-                    if pref not in valid_rooms:
-                        invalid_values.append((stdnum + 1, f"{pref_idx}지망", pref, name))
-
-    # 유효하지 않은 값 출력
-    if invalid_values:
-        print(f"[!] 입력 데이터에 유효하지 않은 값 {len(invalid_values)}건:")
-        for row_num, field, value, name in invalid_values:
-            print(f"  - {row_num}행 {name}: {field} = '{value}'")
-        raise ValueError(f"[!] input_data에 유효하지 않은 값이 {len(invalid_values)}건 있습니다. 위 목록을 확인하세요.")
-
-    with open(paths['input_seats'], 'rt', encoding='UTF8') as f_seat:
-        for line in f_seat.readlines():
-            if "open" in line:
-                seatnum += 1
-
-    if stdnum > seatnum:
-        print("[-]좌석 수 부족. 입력값 조정할 것!")
+    with contextlib.ExitStack() as stack:
+        if student_lines is None:
+            student_lines = stack.enter_context(open(paths['input_students'], encoding="utf-8-sig", newline=''))
+        if seat_lines is None:
+            seat_lines = stack.enter_context(open(paths['input_seats'], encoding="utf-8-sig", newline=''))
+        report = validate(config, student_lines, seat_lines)
+
+    report.print()
+    if report.has_errors:
+        raise ValueError(f"[!] 입력 데이터에 유효하지 않은 값이 {len(report.invalid_values)}건 있습니다. 위 목록을 확인하세요.")
+    return report
 
 
 if __name__ == "__main__":
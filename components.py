@@ -0,0 +1,160 @@
+"""
+독립 열람실 묶음(component) 단위 병렬 배정
+
+지망 매칭(preference) phase에서 학생은 자기 1~3지망 열람실의 좌석만 받으므로,
+학생–열람실 지망 그래프에서 서로 연결되지 않은 열람실 묶음은 완전히 독립입니다.
+(어떤 학생도 함께 지망하지 않은 열람실끼리는 좌석을 두고 경쟁하지 않음)
+config.yaml의 allocation_jobs가 2 이상이면 run_allocation이 phase마다 이 그래프를 만들고,
+묶음이 2개 이상일 때 묶음별로 프로세스 풀에서 배정합니다.
+
+병렬화 비용:
+  - 묶음마다 학생/좌석을 pickle로 워커에 넘기는데, 레코드 1개 pickle 비용(수 µs)이 직렬 배정의
+    학생 1명 처리 비용(약 1µs)보다 큽니다. 실제 데이터와 10배/100배 복제 데이터(phase당 대상 학생
+    151/1,510/15,100명)에서 모두 직렬보다 느렸습니다.
+  - 그래서 phase 대상 학생이 MIN_PARALLEL_STUDENTS명 미만이면 묶음을 나누지 않고 직렬 경로로 실행합니다.
+
+재현성:
+  - 묶음마다 별도 난수 시드를 씁니다. 시드는 실행 시드(호출 전 random.seed)에서 뽑은 값과
+    묶음의 열람실 이름으로 만들므로, 워커 수나 실행 순서와 관계없이 같은 입력 → 같은 결과입니다.
+  - 다만 난수 소비 순서가 직렬 배정과 다르므로 결과는 allocation_jobs: 1(compat)과 다릅니다.
+    공개 추첨 결과 검증에는 allocation_jobs: 1을 사용합니다.
+  - 모든 열람실이 하나로 연결된 phase, 대상 학생이 MIN_PARALLEL_STUDENTS명 미만인 phase,
+    잔여석 배정(unmatched) phase는 기존 직렬 경로로 실행합니다 (그 phase는 allocation_jobs: 1과 같은 결과).
+"""
+
+import hashlib
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from seat_pool import SeatPool
+
+
+MIN_PARALLEL_STUDENTS = 100000  # 병렬 배정할 phase의 최소 대상 학생 수 (미만이면 직렬)
+
+
+def room_components(students, target_grades):
+    """
+    phase 대상 학생의 지망 그래프에서 연결된 열람실 묶음을 구합니다 (union-find).
+
+    Returns: [ frozenset(열람실코드), ... ] (대상 학생이 지망한 열람실만 포함)
+    """
+    parent = {}
+
+    def find(room):
+        while parent[room] != room:
+            parent[room] = parent[parent[room]]
+            room = parent[room]
+        return room
+
+    for student in students.values():
+        if target_grades and student.grade not in target_grades:
+            continue
+        prefs = student.prefs
+        for room in prefs:
+            parent.setdefault(room, room)
+        root = find(prefs[0])
+        for room in prefs[1:]:
+            other = find(room)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for room in parent:
+        groups.setdefault(find(room), set()).add(room)
+    return [frozenset(group) for group in groups.values()]
+
+
+def component_seed(base, room_names):
+    """실행 시드에서 뽑은 base와 묶음의 열람실 이름(정렬)으로 묶음별 32비트 시드를 만듭니다."""
+    text = f"{base}:" + "|".join(sorted(room_names))
+    return int(hashlib.sha256(text.encode('UTF-8')).hexdigest(), 16) % (2**32)
+
+
+def _allocate_component(task):
+    """
+    워커에서 묶음 하나를 배정합니다.
+
+    task: (시드, 학생 dict, 좌석 리스트, 대상 학년 코드 집합, 좌석타입 코드 집합, 풀 모드, 노트북 금지 열람실)
+    Returns: [(학생 key, 좌석 리스트 내 순번, 지망 순위), ...]
+    """
+    from seat import allocate_by_preference  # seat → components 순환 import 방지
+
+    seed, students, seats, target_grades, target_seat_types, pool_mode, laptop_rooms = task
+    pool = SeatPool(seats, mode=pool_mode, laptop_rooms=laptop_rooms)
+    index_of = {id(seat): i for i, seat in enumerate(pool.seats)}
+    random.seed(seed)
+    result = allocate_by_preference(students, pool, target_grades, target_seat_types)
+    return [(key, index_of[id(seat)], pref) for key, (_, seat, pref) in result.items()]
+
+
+class ComponentRunner:
+    """
+    run_allocation 1회 동안 쓰는 프로세스 풀. 필요할 때(묶음이 2개 이상인 첫 phase) 생성합니다.
+    with ComponentRunner(jobs) as runner: 형태로 사용하며, 끝나면 풀을 종료합니다.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.executor = None
+        self.base = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        return False
+
+    def allocate(self, students, pool, target_grades, target_seat_types, codebook, sec=None):
+        """
+        지망 매칭 phase 하나를 묶음별로 병렬 배정합니다.
+        대상 학생이 MIN_PARALLEL_STUDENTS명 미만이거나 묶음이 1개 이하면 아무것도 하지 않고
+        None을 반환합니다 (호출자가 직렬 경로로 실행).
+
+        배정 결과는 pool/students에 반영합니다 (직렬 경로와 같은 in-place 규칙).
+        Returns: { '이름_학번': (Student, Seat, 지망 순위) } 또는 None
+        """
+        targets = len(students) if not target_grades else sum(
+            1 for student in students.values() if student.grade in target_grades)
+        if sec is not None:
+            sec.fields['targets'] = targets
+        if targets < MIN_PARALLEL_STUDENTS:
+            return None
+
+        components = room_components(students, target_grades)
+        if sec is not None:
+            sec.fields['components'] = len(components)
+        if len(components) <= 1:
+            return None
+
+        if self.base is None:
+            self.base = random.getrandbits(64)  # 실행 시드에서 한 번만 뽑음
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+
+        # 열람실 → 묶음 번호, 묶음별 학생/남은 좌석(풀 순서 = seatlist 순서)
+        components.sort(key=lambda rooms: min(codebook.rooms[r] for r in rooms))
+        comp_of = {room: i for i, rooms in enumerate(components) for room in rooms}
+        comp_students = [{} for _ in components]
+        for key, student in students.items():
+            if not target_grades or student.grade in target_grades:
+                comp_students[comp_of[student.prefs[0]]][key] = student
+        comp_seat_ids = [[] for _ in components]
+        for seat_id, seat in enumerate(pool.seats):
+            if pool.alive[seat_id] and seat.room in comp_of:
+                comp_seat_ids[comp_of[seat.room]].append(seat_id)
+
+        tasks = [(component_seed(self.base, [codebook.rooms[r] for r in rooms]),
+                  comp_students[i], [pool.seats[s] for s in comp_seat_ids[i]],
+                  target_grades, target_seat_types, pool.mode, codebook.laptop_rooms)
+                 for i, rooms in enumerate(components)]
+
+        # 묶음 순서대로 결과를 합치므로 워커 수와 관계없이 결과 dict 순서도 같음
+        result = {}
+        for i, assigned in enumerate(self.executor.map(_allocate_component, tasks)):
+            for key, local_idx, pref in assigned:
+                seat_id = comp_seat_ids[i][local_idx]
+                pool.take(seat_id)
+                result[key] = (students.pop(key), pool.seats[seat_id], pref)
+        return result
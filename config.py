@@ -1,11 +1,180 @@
-import yaml
+"""
+config.yaml 로드/검증
+
+파싱·검증한 config는 파일 내용의 SHA256 해시를 키로 캐시합니다.
+  - 프로세스 내: 같은 내용이면 YAML을 다시 파싱/검증하지 않음
+  - 프로세스 간: config.yaml 옆 .cache/ 폴더에 검증된 config를 JSON으로 저장 (최근 사용한 몇 개만 유지)
+캐시 키에는 이 모듈(config.py)의 소스도 포함되므로, 검증 규칙이 바뀌면 캐시도 자동으로 무효화됩니다.
+config.yaml을 한 글자라도 고치면 해시가 바뀌어 다시 파싱/검증합니다.
+조회 테이블(CompiledConfig)은 config 내용의 해시로도 캐시하므로, 바꾼 config(sweep 변형 등)도 한 번만 계산합니다.
+"""
+
+import copy
+import hashlib
+import json
+import os
+
+
+CACHE_DIR = '.cache'  # config.yaml과 같은 폴더 기준
+
+MAX_DISK_CACHE_FILES = 8  # 디스크 캐시 파일 최대 개수 (넘으면 오래 안 쓴 것부터 삭제)
+
+MAX_CONTENT_CACHE = 64  # 내용 해시로 캐시하는 CompiledConfig 최대 개수 (sweep 변형 등)
+
+_compiled_cache = {}  # 캐시 키 → CompiledConfig
+_content_cache = {}   # 정규화한 config 내용의 SHA256 → CompiledConfig (compiled_config)
+_source_hash = None   # 이 모듈 소스의 SHA256 (_source_digest)
+
+
+class CompiledConfig:
+    """
+    검증된 config와 미리 계산해 둔 조회 테이블. 여러 곳에서 공유하므로 수정하면 안 됩니다.
+
+    config: 검증된 config dict
+    key: 캐시 키 (compiled_config로 새로 계산한 경우 None)
+    grade_to_seat_type: 학년/지위 → 우선 배정 좌석타입 (매핑이 없으면 학년명 그대로)
+    laptop_zones: 노트북 금지 열람실 집합
+    phase_student_types / phase_seat_types: phases 순서대로 대상 학년 / 좌석타입 집합 (빈 집합 = 전체)
+    valid_rooms / valid_student_types / valid_seat_types: 허용 값 집합
+    """
+
+    __slots__ = ('config', 'key', 'grade_to_seat_type', 'laptop_zones',
+                 'phase_student_types', 'phase_seat_types',
+                 'valid_rooms', 'valid_student_types', 'valid_seat_types')
+
+    def __init__(self, config, key):
+        self.config = config
+        self.key = key
+
+        grade_map = config.get('grade_to_seat_type', {})
+        self.grade_to_seat_type = {grade: grade_map.get(grade, grade)
+                                   for grade in config.get('valid_student_types', [])}
+        self.laptop_zones = frozenset(config.get('laptop_not_allowed_zones', []))
+        phases = config.get('phases', [])
+        self.phase_student_types = tuple(frozenset(p.get('student_types', [])) for p in phases)
+        self.phase_seat_types = tuple(frozenset(p.get('seat_types', [])) for p in phases)
+        self.valid_rooms = frozenset(config.get('valid_rooms', []))
+        self.valid_student_types = frozenset(config.get('valid_student_types', []))
+        self.valid_seat_types = frozenset(config.get('valid_seat_types', []))
+
+
+def _source_digest():
+    """이 모듈 소스의 SHA256 (프로세스당 한 번만 계산)"""
+    global _source_hash
+    if _source_hash is None:
+        with open(__file__, 'rb') as f:
+            _source_hash = hashlib.sha256(f.read()).digest()
+    return _source_hash
+
+
+def _cache_key(data):
+    """config.yaml 내용 + 이 모듈 소스의 SHA256"""
+    h = hashlib.sha256(data)
+    h.update(_source_digest())
+    return h.hexdigest()
+
+
+def _cache_path(path, key):
+    return os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR, f"config-{key}.json")
+
+
+def _read_disk_cache(path, key):
+    cache_file = _cache_path(path, key)
+    try:
+        with open(cache_file, mode='rt', encoding='UTF-8') as f:
+            config = json.load(f)
+        os.utime(cache_file)  # 마지막 사용 시각 갱신 (오래된 캐시 정리 기준)
+        return config
+    except (OSError, ValueError):
+        return None
+
+
+def _evict_disk_cache(cache_dir, keep):
+    """config 캐시 파일이 keep개를 넘으면 마지막 사용(수정) 시각이 오래된 것부터 지웁니다."""
+    files = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+             if name.startswith("config-") and name.endswith(".json")]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for old in files[keep:]:
+        os.remove(old)
+
+
+def _write_disk_cache(path, key, config):
+    """
+    검증된 config를 디스크 캐시에 저장합니다 (최근에 쓴 MAX_DISK_CACHE_FILES개만 유지).
+    config를 번갈아 바꿔 써도(작업 폴더 여러 개 등) 최근 것들은 다시 파싱하지 않습니다.
+    JSON으로 그대로 되돌릴 수 없는 값(날짜, 숫자 키 등)이 있거나 쓰기에 실패하면 저장하지 않습니다.
+    """
+    try:
+        text = json.dumps(config, ensure_ascii=False)
+        if json.loads(text) != config:
+            return
+        cache_file = _cache_path(path, key)
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp, mode='wt', encoding='UTF-8') as f:
+            f.write(text)
+        os.replace(tmp, cache_file)
+        _evict_disk_cache(os.path.dirname(cache_file), MAX_DISK_CACHE_FILES)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def load_compiled_config(path='config.yaml'):
+    """
+    config.yaml을 읽어 CompiledConfig를 반환합니다 (공유 객체, 수정 금지).
+    내용이 같으면 프로세스 내 캐시 → 디스크 캐시 순으로 재사용하고, 없을 때만 파싱/검증합니다.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    key = _cache_key(data)
+
+    compiled = _compiled_cache.get(key)
+    if compiled is None:
+        config = _read_disk_cache(path, key)
+        if config is None:
+            import yaml  # 캐시가 있으면 yaml 모듈 import 비용도 들지 않음
+            config = yaml.safe_load(data.decode('UTF-8'))
+            validate_config(config)
+            _write_disk_cache(path, key, config)
+        compiled = CompiledConfig(config, key)
+        _compiled_cache[key] = compiled
+        content_key = _content_key(config)
+        if content_key is not None:
+            _content_cache[content_key] = compiled
+    return compiled
 
 
 def load_config(path='config.yaml'):
-    with open(path, mode='rt', encoding='UTF-8') as f:
-        config = yaml.safe_load(f)
-    validate_config(config)
-    return config
+    """검증된 config dict를 반환합니다. 호출자가 수정해도 캐시에 영향이 없도록 복사본을 줍니다."""
+    return copy.deepcopy(load_compiled_config(path).config)
+
+
+def _content_key(config):
+    """config 내용(키 정렬 JSON)의 SHA256. JSON으로 직렬화할 수 없으면(숫자/문자 키 혼용 등) None."""
+    try:
+        text = json.dumps(config, ensure_ascii=False, sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(text.encode('UTF-8')).hexdigest()
+
+
+def compiled_config(config):
+    """
+    config dict의 CompiledConfig(조회 테이블)를 반환합니다 (Codebook, check_input, preview 등).
+    정규화한 내용의 해시로 캐시하므로 load_config로 읽은 config와 내용이 같으면 그 객체를,
+    호출자가 바꾼 config(sweep 변형, 벤치마크 합성 config 등)도 처음 한 번만 계산해 재사용합니다.
+    변형은 최근 MAX_CONTENT_CACHE개까지 보관하며, 호출자가 나중에 dict를 고쳐도 영향이 없도록 복사본을 둡니다.
+    """
+    content_key = _content_key(config)
+    if content_key is None:
+        return CompiledConfig(config, None)
+    compiled = _content_cache.get(content_key)
+    if compiled is None:
+        if len(_content_cache) >= MAX_CONTENT_CACHE:
+            del _content_cache[next(iter(_content_cache))]  # 가장 먼저 넣은 것부터 삭제
+        compiled = CompiledConfig(copy.deepcopy(config), None)
+        _content_cache[content_key] = compiled
+    return compiled
 
 
 def validate_config(config):
@@ -38,10 +207,51 @@ def validate_config(config):
             if st not in valid_seat_types:
                 errors.append(f"phases '{name}'의 seat_types '{st}'이(가) valid_seat_types에 없습니다.")
 
+    # seat_pool_mode 검증
+    pool_mode = config.get('seat_pool_mode', 'compat')
+    if pool_mode not in ('compat', 'fast'):
+        errors.append(f"seat_pool_mode '{pool_mode}'은(는) 'compat' 또는 'fast'여야 합니다.")
+
+    # allocation_jobs 검증
+    jobs = config.get('allocation_jobs', 1)
+    if not isinstance(jobs, int) or isinstance(jobs, bool) or jobs < 1:
+        errors.append(f"allocation_jobs '{jobs}'은(는) 1 이상의 정수여야 합니다.")
+
+    # allocation_engine 검증
+    engine = config.get('allocation_engine', 'lottery')
+    if engine not in ('lottery', 'optimal'):
+        errors.append(f"allocation_engine '{engine}'은(는) 'lottery' 또는 'optimal'이어야 합니다.")
+
+    # ledger 검증
+    ledger = config.get('ledger')
+    if ledger is not None and not isinstance(ledger, str):
+        errors.append(f"ledger '{ledger}'은(는) 파일 경로 문자열 또는 null이어야 합니다.")
+
     # locker_mapping 검증
-    for room in config.get('locker_mapping', {}):
+    ranges = {}  # 위치명 → [(시작, 끝, 열람실)]
+    for room, info in config.get('locker_mapping', {}).items():
         if room not in valid_rooms:
             errors.append(f"locker_mapping의 열람실 '{room}'이(가) valid_rooms에 없습니다.")
+        for locker in info.get('lockers', []):
+            ranges.setdefault(locker['location'], []).append((locker['start'], locker['end'], room))
+
+    # 같은 위치의 사물함 번호 구간은 겹치면 안 됨 (번호 하나는 한 구간에만 속함)
+    for location, items in ranges.items():
+        items.sort()
+        for (_, prev_end, prev_room), (start, end, room) in zip(items, items[1:]):
+            if start <= prev_end:
+                errors.append(f"locker_mapping의 '{location}' 사물함 {start}~{end}번({room})이(가) "
+                              f"{prev_room}의 구간과 겹칩니다.")
+
+    # locker_out_of_service 검증
+    for location, numbers in config.get('locker_out_of_service', {}).items():
+        if location not in ranges:
+            errors.append(f"locker_out_of_service의 위치 '{location}'이(가) locker_mapping에 없습니다.")
+            continue
+        for number in numbers:
+            if not any(start <= number <= end for start, end, _ in ranges[location]):
+                errors.append(f"locker_out_of_service의 '{location}' {number}번이(가) "
+                              f"locker_mapping 범위에 없습니다.")
 
     if errors:
         msg = "[!] config.yaml 검증 오류:\n" + "\n".join(f"  - {e}" for e in errors)
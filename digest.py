@@ -0,0 +1,97 @@
+"""
+파일 해시(SHA256) 유틸리티
+
+입력/출력 파일의 무결성 검증용 해시와 추가 배정 시드 계산에 사용합니다.
+  - 파일은 1MB 단위로 나눠 읽으며 해시합니다 (파일 전체를 메모리에 올리지 않음).
+  - 한 번의 실행 안에서 (경로, 크기, 수정시각)이 같은 파일은 다시 읽지 않고 기억해 둔 해시를 씁니다.
+    읽기 전에 stat하고, 읽는 동안 stat이 바뀌었으면 메모하지 않습니다.
+    크기와 수정시각을 유지한 변경은 메모로 알아챌 수 없으므로, 무결성 확인에는 fresh=True로 다시 해시합니다.
+  - 해시값과 시드는 기존 방식(f.read() 전체 해시)과 같습니다.
+"""
+
+import hashlib
+import json
+import os
+
+
+CHUNK_SIZE = 1 << 20
+
+_memo = {}  # (절대경로, 크기, 수정시각 ns) → SHA256 hex
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def _memoize(path, key, digest):
+    """읽기 전 stat(key)과 읽은 뒤 stat이 같을 때만 메모합니다 (읽는 동안 바뀐 파일 제외)."""
+    if _stat_key(path) == key:
+        _memo[key] = digest
+
+
+def file_sha256(path, fresh=False):
+    """
+    파일의 SHA256 hex digest (스트리밍 계산, 실행 중 메모).
+    fresh=True면 메모를 쓰지 않고 파일을 다시 읽어 계산합니다 (무결성 확인용).
+    """
+    key = _stat_key(path)
+    digest = None if fresh else _memo.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _memoize(path, key, digest)
+    return digest
+
+
+def read_file(path):
+    """
+    파일 내용(bytes)을 읽고 그 해시를 계산해 메모해 둡니다 (시드/매니페스트에서 다시 읽지 않도록).
+
+    Returns: (내용 bytes, SHA256 hex digest)
+    """
+    key = _stat_key(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    _memoize(path, key, digest)
+    return data, digest
+
+
+def seed_from_digest(digest):
+    """SHA256 hex digest → random.seed용 32비트 시드 (seat.get_seed_from_file과 같은 값)"""
+    return int(digest, 16) % (2**32)
+
+
+class Manifest:
+    """
+    한 번의 실행에서 다룬 입력/출력 파일의 해시 목록.
+
+    entries: [{'kind': 'input'/'output', 'name': 이름, 'path': 경로, 'sha256': ..., 'size': ...}]
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def add(self, kind, name, path, fresh=False):
+        """파일을 해시하여 목록에 추가합니다 (fresh는 file_sha256 참조). 없는 파일은 건너뜁니다."""
+        if not os.path.exists(path):
+            return None
+        entry = {'kind': kind, 'name': name, 'path': path,
+                 'sha256': file_sha256(path, fresh), 'size': os.path.getsize(path)}
+        self.entries.append(entry)
+        return entry
+
+    def print(self):
+        print("[***] 해시 매니페스트 (SHA256)")
+        for e in self.entries:
+            label = "입력값" if e['kind'] == 'input' else "출력값"
+            print(f"[***]{label} {e['path']} : {e['sha256']}")
+
+    def save(self, filepath, **extra):
+        """매니페스트를 JSON으로 저장합니다 (extra는 최상위 항목으로 함께 기록)."""
+        with open(filepath, mode='wt', encoding='UTF-8') as f:
+            json.dump({**extra, 'files': self.entries}, f, ensure_ascii=False, indent=2)
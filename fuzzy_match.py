@@ -0,0 +1,178 @@
+"""
+신청서 ↔ 학적부 유사 매칭 (validate_applicants.py)
+
+학번 오타가 있으면 같은 사람이 "compare에만 존재"와 "input에만 존재"에 따로 나타납니다.
+이 모듈은 매칭 안 된 양쪽 명단에서 같은 사람일 가능성이 높은 쌍을 점수와 함께 제안합니다.
+
+유사도:
+  - 학번: 숫자만 남긴 학번의 편집 거리 (인접 두 글자 바뀜도 1회로 셈)
+  - 이름: 한글을 자모 단위로 분해(NFD)한 이름의 편집 거리 (예: 김민준 ↔ 김민주는 자모 1개 차이)
+  - 이메일: 신청서 이메일 아이디(@ 앞)가 학적부 이메일 아이디와 같거나, 아이디의 숫자가 학번과 같으면 일치
+  점수 = (학번 유사도 + 이름 유사도) / 2, 이메일 일치 시 +EMAIL_BONUS (최대 1)
+
+후보 쌍은 전체 조합(all-pairs)을 비교하지 않고 blocking 색인으로만 고릅니다.
+  - 학번/이름: 원래 문자열과 한 글자씩 지운 문자열을 key로 하는 bucket (deletion neighborhood).
+    한 글자 바뀜/추가/삭제/자리바꿈은 양쪽에서 한 글자씩 지우면 같은 key가 되므로 반드시 같은 bucket에 들어갑니다.
+  - 이메일: 아이디, 아이디 속 숫자 bucket
+  학적부 수만 명이어도 레코드당 key가 10여 개라 거의 선형으로 동작합니다.
+  key 하나에 MAX_BUCKET명이 넘게 몰리면(흔한 이름 등) 그 key는 후보 생성에 쓰지 않습니다.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+
+
+MIN_SCORE = 0.85      # 제안할 최소 점수
+EMAIL_BONUS = 0.1     # 이메일 아이디 일치 시 가산점
+MAX_SUGGESTIONS = 3   # 신청자 1명당 최대 제안 수
+MAX_BUCKET = 200      # key 하나의 최대 bucket 크기 (넘으면 후보 생성에서 제외)
+
+
+# ============================================================
+# 정규화 / 유사도
+# ============================================================
+
+def normalize_sid(sid):
+    """학번에서 숫자만 남깁니다 (2024-12345 → 202412345)."""
+    return re.sub(r'\D', '', sid)
+
+
+def jamo(name):
+    """이름의 공백을 지우고 한글 음절을 자모로 분해합니다 (NFD)."""
+    return unicodedata.normalize('NFD', name.replace(' ', ''))
+
+
+def email_local(email):
+    """이메일 아이디(@ 앞, 소문자)"""
+    return email.split('@', 1)[0].strip().lower()
+
+
+def edit_distance(a, b):
+    """편집 거리 (추가/삭제/바꿈/인접 자리바꿈 각 1회, OSA)"""
+    if a == b:
+        return 0
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+def similarity(a, b):
+    """1 - 편집 거리 / 긴 쪽 길이 (둘 다 비어 있으면 0)"""
+    longest = max(len(a), len(b))
+    return 1 - edit_distance(a, b) / longest if longest else 0.0
+
+
+def deletion_keys(text):
+    """text와 text에서 한 글자씩 지운 문자열들"""
+    keys = {text}
+    keys.update(text[:i] + text[i + 1:] for i in range(len(text)))
+    return keys
+
+
+# ============================================================
+# blocking 색인 / 후보 제안
+# ============================================================
+
+class Record:
+    """
+    유사 매칭 대상 1명.
+
+    sid: 원래 학번, name: 이름
+    sid_key: 숫자만 남긴 학번, name_key: 자모 분해한 이름, email_key: 이메일 아이디 ('' = 없음)
+    """
+
+    __slots__ = ('sid', 'name', 'sid_key', 'name_key', 'email_key')
+
+    def __init__(self, sid, name, email=''):
+        self.sid = sid
+        self.name = name
+        self.sid_key = normalize_sid(sid)
+        self.name_key = jamo(name)
+        self.email_key = email_local(email) if email else ''
+
+    def blocking_keys(self):
+        """이 레코드가 들어가는 bucket key들 (종류별로 구분)"""
+        keys = {('학번', k) for k in deletion_keys(self.sid_key) if k}
+        keys.update(('이름', k) for k in deletion_keys(self.name_key) if k)
+        return keys
+
+    def email_keys(self):
+        """신청서 쪽 이메일 key: 아이디, 아이디 속 숫자(학번과 비교)"""
+        if not self.email_key:
+            return set()
+        keys = {('이메일', self.email_key)}
+        digits = normalize_sid(self.email_key)
+        if digits:
+            keys.add(('이메일', digits))
+        return keys
+
+
+class BlockingIndex:
+    """학적부 레코드의 bucket 색인. key → [Record, ...]"""
+
+    def __init__(self, records):
+        self.buckets = defaultdict(list)
+        for record in records:
+            keys = record.blocking_keys()
+            # 학적부 쪽 이메일 key: 이메일 아이디, 학번 숫자 (신청서 이메일 아이디 속 숫자와 비교)
+            keys.add(('이메일', record.sid_key))
+            if record.email_key:
+                keys.add(('이메일', record.email_key))
+            for key in keys:
+                self.buckets[key].append(record)
+
+    def candidates(self, record):
+        """record와 bucket을 공유하는 학적부 레코드들 (MAX_BUCKET 초과 bucket 제외)"""
+        found = {}
+        for key in record.blocking_keys() | record.email_keys():
+            bucket = self.buckets.get(key)
+            if bucket and len(bucket) <= MAX_BUCKET:
+                for other in bucket:
+                    found[id(other)] = other
+        return found.values()
+
+
+def score_pair(inp, comp):
+    """
+    신청서 레코드와 학적부 레코드의 유사도.
+
+    Returns: (점수, 학번 유사도, 이름 유사도, 이메일 일치 여부)
+    """
+    sid_sim = similarity(inp.sid_key, comp.sid_key)
+    name_sim = similarity(inp.name_key, comp.name_key)
+    email_match = bool(inp.email_key) and (
+        inp.email_key == comp.email_key or normalize_sid(inp.email_key) == comp.sid_key)
+    score = (sid_sim + name_sim) / 2
+    if email_match:
+        score = min(1.0, score + EMAIL_BONUS)
+    return score, sid_sim, name_sim, email_match
+
+
+def suggest_pairs(input_records, compare_records, min_score=MIN_SCORE, limit=MAX_SUGGESTIONS):
+    """
+    신청서 레코드마다 같은 사람으로 보이는 학적부 레코드를 제안합니다.
+
+    Returns: [ (점수, 학번 유사도, 이름 유사도, 이메일 일치, 신청서 Record, 학적부 Record), ... ]
+             (점수 내림차순, 같은 점수면 신청서 학번 순)
+    """
+    index = BlockingIndex(compare_records)
+    suggestions = []
+    for inp in input_records:
+        scored = []
+        for comp in index.candidates(inp):
+            score, sid_sim, name_sim, email_match = score_pair(inp, comp)
+            if score >= min_score:
+                scored.append((score, sid_sim, name_sim, email_match, inp, comp))
+        scored.sort(key=lambda s: (-s[0], s[5].sid))
+        suggestions.extend(scored[:limit])
+    suggestions.sort(key=lambda s: (-s[0], s[4].sid, s[5].sid))
+    return suggestions
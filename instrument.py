@@ -0,0 +1,142 @@
+"""
+배정 과정 계측 (run.py --profile)
+
+seat.run_allocation / locker.main 등의 단계별 소요 시간과 카운터를 기록합니다.
+계측 대상 코드는 다음처럼 구간을 표시합니다.
+
+    with instrument.section('phase', name=...) as sec:
+        ...
+        if sec is not None:
+            sec.count('assigned')
+            sec.observe('pool_size', pool.size)
+
+profiling()으로 Profiler를 켜지 않으면 section()은 아무것도 하지 않는 공용 객체를 반환하고
+sec는 None이 되므로, 꺼져 있을 때의 비용은 구간마다 함수 호출 1회와 None 비교뿐입니다.
+(학생/좌석 단위 루프 안에서는 sec가 None인지만 확인하고 카운터 계산을 건너뜁니다.)
+
+구간은 중첩되며, 결과는 구간 트리 JSON(Profiler.report)으로 저장합니다.
+"""
+
+import contextlib
+import json
+import time
+
+
+_profiler = None  # 현재 활성 Profiler (꺼져 있으면 None)
+
+
+class _NullSection:
+    """계측이 꺼져 있을 때 section()이 반환하는 빈 context manager (as 값은 None)"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class Section:
+    """
+    계측 구간 1개.
+
+    fields: 구간 식별 정보 (phase 이름, 지망 순위 등)
+    counters: 누적 카운트 (count)
+    stats: 관측값 요약 {'n', 'sum', 'min', 'max'} (observe)
+    """
+
+    __slots__ = ('name', 'fields', 'seconds', 'counters', 'stats', 'children')
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.seconds = 0.0
+        self.counters = {}
+        self.stats = {}
+        self.children = []
+
+    def count(self, key, n=1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def observe(self, key, value):
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = {'n': 1, 'sum': value, 'min': value, 'max': value}
+        else:
+            stat['n'] += 1
+            stat['sum'] += value
+            stat['min'] = min(stat['min'], value)
+            stat['max'] = max(stat['max'], value)
+
+    def to_dict(self):
+        data = {'name': self.name, **self.fields, 'seconds': round(self.seconds, 6)}
+        if self.counters:
+            data['counters'] = dict(self.counters)
+        if self.stats:
+            data['stats'] = {key: {**stat, 'mean': stat['sum'] / stat['n']}
+                             for key, stat in self.stats.items()}
+        if self.children:
+            data['children'] = [child.to_dict() for child in self.children]
+        return data
+
+
+class Profiler:
+    """구간 트리를 기록합니다. profiling(profiler)로 활성화한 동안의 section()이 여기에 쌓입니다."""
+
+    def __init__(self):
+        self.roots = []
+        self._stack = []
+
+    @contextlib.contextmanager
+    def section(self, name, **fields):
+        sec = Section(name, fields)
+        (self._stack[-1].children if self._stack else self.roots).append(sec)
+        self._stack.append(sec)
+        start = time.perf_counter()
+        try:
+            yield sec
+        finally:
+            sec.seconds = time.perf_counter() - start
+            self._stack.pop()
+
+    def report(self):
+        return {'sections': [sec.to_dict() for sec in self.roots]}
+
+    def save(self, filepath):
+        with open(filepath, mode='wt', encoding='UTF-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def print_summary(self):
+        """구간 트리를 들여쓰기로 출력합니다 (시간, 카운터, 관측값 평균)."""
+        def walk(sec, depth):
+            label = sec.name + "".join(f" {k}={v}" for k, v in sec.fields.items())
+            extra = [f"{k}={v}" for k, v in sec.counters.items()]
+            extra += [f"{k}(avg)={s['sum'] / s['n']:.1f}" for k, s in sec.stats.items()]
+            print(f"[*] {'  ' * depth}{label:<40} {sec.seconds * 1000:>9.1f}ms  {' '.join(extra)}")
+            for child in sec.children:
+                walk(child, depth + 1)
+
+        for sec in self.roots:
+            walk(sec, 0)
+
+
+def section(name, **fields):
+    """
+    계측 구간을 엽니다. 계측이 꺼져 있으면 as 값이 None인 빈 context manager를 반환합니다.
+    """
+    if _profiler is None:
+        return _NULL_SECTION
+    return _profiler.section(name, **fields)
+
+
+@contextlib.contextmanager
+def profiling(profiler):
+    """with 블록 동안 profiler를 활성화합니다."""
+    global _profiler
+    previous, _profiler = _profiler, profiler
+    try:
+        yield profiler
+    finally:
+        _profiler = previous
@@ -0,0 +1,193 @@
+"""
+배정 원장 (SQLite, 선택 사항)
+
+config.yaml의 ledger에 경로를 지정하면 좌석/잔여석/사물함 배정 상태를 SQLite 파일에 함께 기록합니다.
+추가 배정(--mode=add)은 결과 CSV를 다시 파싱하는 대신 원장을 인덱스로 조회하고,
+변경분을 한 트랜잭션으로 기록한 뒤, 잔여석 CSV와 사물함 xlsx를 원장에서 다시 내보냅니다.
+CSV/xlsx 출력은 원장을 쓰지 않을 때와 바이트 단위로 같습니다.
+
+테이블 (id는 기록 순서 = 출력 파일의 행 순서):
+  seat_assignment:   좌석 배정 결과 (seat_result.csv 행 + 회차 wave, 본 배정 0 / 추가 배정 1, 2, ...)
+  remaining_seat:    잔여 좌석 (seat_unmatched_seat.csv 행)
+  locker_assignment: 사물함 배정 결과 (seat_locker_result.csv 행 + 회차 wave)
+
+원장을 켜기 전에 본 배정을 마친 경우, 첫 추가 배정 때 기존 출력 파일에서 원장을 만듭니다.
+"""
+
+import csv
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seat_assignment (
+    id INTEGER PRIMARY KEY,
+    student_key TEXT NOT NULL,      -- 이름_학번뒤2자리
+    name TEXT NOT NULL,
+    sid_tail TEXT NOT NULL,
+    room TEXT NOT NULL,
+    seat_number TEXT NOT NULL,
+    first_pref TEXT NOT NULL,
+    wave INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seat_assignment_student ON seat_assignment (student_key);
+CREATE INDEX IF NOT EXISTS idx_seat_assignment_seat ON seat_assignment (room, seat_number);
+
+CREATE TABLE IF NOT EXISTS remaining_seat (
+    id INTEGER PRIMARY KEY,
+    seat_type TEXT NOT NULL,
+    room TEXT NOT NULL,
+    seat_number TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_remaining_seat_seat ON remaining_seat (room, seat_number);
+
+CREATE TABLE IF NOT EXISTS locker_assignment (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    sid_tail TEXT NOT NULL,
+    room TEXT NOT NULL,
+    seat_number TEXT NOT NULL,
+    location TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    first_pref TEXT NOT NULL,
+    wave INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_locker_assignment_locker ON locker_assignment (location, number);
+"""
+
+
+def _read_rows(filepath, skip_header):
+    with open(filepath, mode='rt', encoding='UTF-8', newline='') as file:
+        reader = csv.reader(file)
+        if skip_header:
+            next(reader, None)
+        return [row for row in reader if row]
+
+
+class Ledger:
+    """
+    배정 원장 연결. with Ledger(path) as ledger: 형태로 사용합니다.
+
+    seat 행:   [이름, 학번뒤2자리, 열람실, 좌석번호, 1지망배정여부]
+    좌석 행:   [학년, 열람실, 좌석번호, open/closed]
+    locker 행: [이름, 학번뒤2자리, 열람실, 좌석번호, 사물함, 사물함번호, 1지망배정여부]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------
+
+    def reset_seats(self, seat_rows, remaining_rows):
+        """본 배정 결과로 좌석 배정/잔여석을 새로 기록합니다 (사물함 기록도 비움)."""
+        with self.conn:
+            self.conn.execute("DELETE FROM seat_assignment")
+            self.conn.execute("DELETE FROM remaining_seat")
+            self.conn.execute("DELETE FROM locker_assignment")
+            self._insert_seats(seat_rows, wave=0)
+            self.conn.executemany(
+                "INSERT INTO remaining_seat (seat_type, room, seat_number, status) VALUES (?, ?, ?, ?)",
+                (row[:4] for row in remaining_rows))
+
+    def record_additional_seats(self, seat_rows):
+        """
+        추가 배정 결과를 새 회차로 기록하고, 배정된 좌석을 잔여석에서 지웁니다 (한 트랜잭션).
+
+        Returns: 회차 번호
+        """
+        seat_rows = list(seat_rows)
+        with self.conn:
+            wave = self.current_wave() + 1
+            self._insert_seats(seat_rows, wave)
+            self.conn.executemany(
+                "DELETE FROM remaining_seat WHERE room = ? AND seat_number = ?",
+                ((row[2], row[3]) for row in seat_rows))
+        return wave
+
+    def record_lockers(self, locker_rows, replace=False):
+        """사물함 배정 결과를 현재 회차로 기록합니다. replace=True면 기존 기록을 지우고 새로 씁니다."""
+        with self.conn:
+            if replace:
+                self.conn.execute("DELETE FROM locker_assignment")
+            wave = self.current_wave()
+            self.conn.executemany(
+                "INSERT INTO locker_assignment "
+                "(name, sid_tail, room, seat_number, location, number, first_pref, wave) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (list(row[:5]) + [int(row[5]), row[6], wave] for row in locker_rows))
+
+    def _insert_seats(self, seat_rows, wave):
+        self.conn.executemany(
+            "INSERT INTO seat_assignment "
+            "(student_key, name, sid_tail, room, seat_number, first_pref, wave) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ([f"{row[0]}_{row[1]}"] + list(row[:5]) + [wave] for row in seat_rows))
+
+    def import_files(self, paths):
+        """
+        원장이 비어 있으면 기존 출력 파일(seat_result.csv, seat_unmatched_seat.csv,
+        seat_locker_result.csv)로 원장을 만듭니다. 이미 기록이 있으면 아무것도 하지 않습니다.
+        """
+        if self.conn.execute("SELECT 1 FROM seat_assignment LIMIT 1").fetchone():
+            return
+        self.reset_seats(_read_rows(paths['output_result'], skip_header=True),
+                         _read_rows(paths['output_unmatched_seats'], skip_header=False))
+        self.record_lockers(_read_rows(paths['output_locker_result'], skip_header=True))
+        print(f"[+] 기존 결과 파일로 배정 원장 생성: {self.path}")
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    def current_wave(self):
+        return self.conn.execute("SELECT COALESCE(MAX(wave), 0) FROM seat_assignment").fetchone()[0]
+
+    def is_assigned(self, student_key):
+        """'이름_학번뒤2자리' 학생에게 배정된 좌석이 있는지 (student_key 인덱스 조회)"""
+        return self.conn.execute(
+            "SELECT 1 FROM seat_assignment WHERE student_key = ? LIMIT 1", (student_key,)).fetchone() is not None
+
+    def remaining_seats(self):
+        """잔여 좌석 행을 기록 순서대로 반환합니다."""
+        return [list(row) for row in self.conn.execute(
+            "SELECT seat_type, room, seat_number, status FROM remaining_seat ORDER BY id")]
+
+    def used_lockers(self):
+        """사용 중인 (사물함 위치, 번호) 목록"""
+        return self.conn.execute("SELECT location, number FROM locker_assignment").fetchall()
+
+    def locker_rows(self):
+        """사물함 배정 결과 행을 기록 순서대로 하나씩 반환합니다 (사물함번호는 int)."""
+        for row in self.conn.execute(
+                "SELECT name, sid_tail, room, seat_number, location, number, first_pref "
+                "FROM locker_assignment ORDER BY id"):
+            yield list(row)
+
+    # ------------------------------------------------------------
+    # 내보내기
+    # ------------------------------------------------------------
+
+    def export_remaining_seats(self, filepath):
+        """잔여 좌석을 seat_unmatched_seat.csv로 내보냅니다 (추가 배정 후의 파일 형식)."""
+        with open(filepath, mode='wt', encoding='UTF-8', newline='') as file:
+            csv.writer(file).writerows(self.remaining_seats())
+
+
+def open_ledger(config):
+    """config의 ledger 경로가 있으면 Ledger를, 없으면 None을 반환합니다."""
+    path = config.get('ledger')
+    return Ledger(path) if path else None
@@ -4,20 +4,26 @@
 좌석 배정 결과(seat_result.csv)를 읽어, 각 열람실에 해당하는 사물함 번호를 배정합니다.
 
 배정 흐름:
-  1. config.yaml에서 열람실 → 사물함 매핑 정보를 로드
+  1. config.yaml에서 열람실 → 사물함 매핑 정보와 사용 불가 번호를 로드
   2. 좌석 배정 결과를 읽어 학생 목록을 만듦
   3. 학생 순서를 랜덤 셔플
-  4. 각 학생의 열람실에 맞는 사물함을 순차 배정 (overflow 자동 처리)
+  4. 각 학생의 열람실에 맞는 사물함을 빈 번호 순으로 배정 (overflow 자동 처리)
   5. 결과를 CSV 파일로 저장
 """
 
 import random
 import csv
 import argparse
+import os
+import sys
+import time
+from bisect import bisect_right
 from collections import defaultdict
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 
+import instrument
 from config import load_config
+from ledger import open_ledger
 # [2025.8.] 추가 배정 시 생방송 진행하는 대신 input file 기반 시드 고정
 from seat import get_seed_from_file
 
@@ -26,207 +32,405 @@ from seat import get_seed_from_file
 # 사물함 상태 관리
 # ============================================================
 
-def build_locker_state(config):
+def build_location_index(segments):
     """
-    config의 locker_mapping을 기반으로 사물함 배정 상태를 초기화합니다.
+    사물함 위치별 번호 구간 인덱스를 만듭니다.
 
-    각 열람실의 사물함은 리스트로 정의되어 있어, 첫 번째 사물함이 가득 차면
-    다음 사물함으로 자동 overflow됩니다.
+    같은 위치의 구간은 서로 겹치지 않으므로(config 검증), 시작번호로 정렬해 두면
+    번호 하나가 속한 구간을 bisect로 찾을 수 있습니다.
 
-    Returns:
-        locker_state: 각 사물함의 현재 배정 상태
-            { (열람실, 순번): { 'location': 위치명, 'start': 시작번호, 'current': 다음배정번호, 'end': 끝번호 } }
-        room_to_lockers: 열람실 → 사물함 키 목록 (순서대로 채움)
-            { 열람실: [(열람실, 0), (열람실, 1), ...] }
+    Args:
+        segments: [(위치명, 시작번호, 끝번호, 구간 키), ...]
+
+    Returns: { 위치명: ([시작번호, ...], [(끝번호, 구간 키), ...]) } (시작번호 오름차순)
     """
-    locker_state = {}
-    room_to_lockers = {}
+    intervals = defaultdict(list)
+    for location, start, end, key in segments:
+        intervals[location].append((start, end, key))
+
+    index = {}
+    for location, items in intervals.items():
+        items.sort()
+        index[location] = ([start for start, _, _ in items], [(end, key) for _, end, key in items])
+    return index
 
-    for room, info in config['locker_mapping'].items():
-        room_to_lockers[room] = []
-        for idx, locker in enumerate(info['lockers']):
-            key = (room, idx)
-            locker_state[key] = {
-                'location': locker['location'],
-                'start': locker['start'],
-                'current': locker['start'],
-                'end': locker['end'],
-            }
-            room_to_lockers[room].append(key)
 
-    return locker_state, room_to_lockers
+def find_locker(index, location, number):
+    """위치명과 번호로 해당 구간 키를 찾습니다. 어느 구간에도 없으면 None."""
+    entry = index.get(location)
+    if entry is None:
+        return None
+    starts, ends = entry
+    i = bisect_right(starts, number) - 1
+    if i >= 0 and number <= ends[i][0]:
+        return ends[i][1]
+    return None
 
 
-def assign_locker(room, locker_state, room_to_lockers):
+class LockerAllocator:
     """
-    주어진 열람실에 대해 사물함 번호를 하나 배정합니다.
+    열람실별 사물함 배정기.
 
-    lockers 리스트를 순서대로 순회하며, 첫 번째 사물함이 가득 차면 다음으로 overflow합니다.
-    예) 15동 404호(칸막이) → 404(A) 55~66번 다 차면 → 404(B) 1~150번으로 이동
+    사물함 위치마다 빈 번호를 비트셋(정수, n번 비트가 1이면 n번 사물함이 비어 있음)으로 관리합니다.
+    각 열람실은 config의 lockers 구간을 순서대로 사용하며, 구간의 빈 번호 중 가장 작은 번호를
+    배정하고, 구간이 가득 차면 다음 구간으로 overflow합니다.
+    예) 15동 404호(칸막이) → 404(A) 60~66번 다 차면 → 404(B) 1~150번으로 이동
 
-    Returns: [사물함위치, 번호] 또는 None (모두 가득 찬 경우)
-    """
-    if room not in room_to_lockers:
-        return None
+    비트셋은 Python 정수이므로 가장 작은 빈 번호 찾기(bits & -bits)와 비트 지우기는 상수 시간이 아니라
+    위치의 사물함 수 N에 비례하는 O(N/word)입니다 (위치당 수백 개 규모라 사실상 정수 연산 몇 번).
 
-    for key in room_to_lockers[room]:
-        state = locker_state[key]
-        if state['current'] <= state['end']:
-            result = [state['location'], state['current']]
-            state['current'] += 1
-            return result
+    config의 locker_out_of_service(고장/제외 번호)는 처음부터 빈 번호에서 빠지므로,
+    구간을 나누지 않고도 중간 번호를 건너뛸 수 있습니다.
 
-    return None
+    segments: { 열람실: [(위치명, 시작번호, 끝번호, 구간 비트마스크), ...] } (overflow 순서)
+    free: { 위치명: 빈 번호 비트셋 }
+    users: { 위치명: [(열람실, 구간 순번), ...] } (그 위치를 쓰는 모든 열람실 구간, release용)
+    """
 
+    def __init__(self, config):
+        self.segments = {}
+        self.free = defaultdict(int)
+        # 열람실별로 아직 빈 번호가 남아있을 수 있는 첫 구간 순번 (그 앞 구간은 모두 가득 참)
+        self.first_open = {}
+        self.users = defaultdict(list)
+        self.out_of_service = defaultdict(int)
+
+        for room, info in config['locker_mapping'].items():
+            self.segments[room] = []
+            for idx, locker in enumerate(info['lockers']):
+                location, start, end = locker['location'], locker['start'], locker['end']
+                mask = ((1 << (end - start + 1)) - 1) << start
+                self.segments[room].append((location, start, end, mask))
+                self.free[location] |= mask
+                self.users[location].append((room, idx))
+            self.first_open[room] = 0
+
+        for location, numbers in config.get('locker_out_of_service', {}).items():
+            for number in numbers:
+                self.out_of_service[location] |= 1 << number
+            self.free[location] &= ~self.out_of_service[location]
+
+        # (위치명, 번호) → (열람실, 구간 순번)
+        self.index = build_location_index(
+            (location, start, end, (room, idx))
+            for room, segments in self.segments.items()
+            for idx, (location, start, end, _) in enumerate(segments))
+
+    def assign(self, room):
+        """
+        주어진 열람실에 대해 사물함 번호를 하나 배정합니다.
+
+        Returns: [사물함위치, 번호] 또는 None (모두 가득 찬 경우)
+        """
+        segments = self.segments.get(room)
+        if segments is None:
+            return None
+
+        for idx in range(self.first_open[room], len(segments)):
+            location, _, _, mask = segments[idx]
+            bits = self.free[location] & mask
+            if bits:
+                number = (bits & -bits).bit_length() - 1  # 가장 작은 빈 번호
+                self.free[location] &= ~(1 << number)
+                self.first_open[room] = idx
+                return [location, number]
+
+        self.first_open[room] = len(segments)
+        return None
 
-def validate_locker_capacity(locker_state):
-    """사물함 번호가 설정된 용량을 초과했는지 검증합니다."""
-    for (room, idx), state in locker_state.items():
-        if state['current'] > state['end'] + 1:
-            print(f"[-] {state['location']} 사물함 넘버 초과 (열람실: {room})")
+    def take(self, location, number):
+        """
+        이미 배정된 번호를 사용 중으로 표시합니다 (추가 배정 시 기존 결과 복원용).
+
+        Returns: config 구간 안의 번호면 True, 아니면 False
+        """
+        if find_locker(self.index, location, number) is None:
+            return False
+        self.free[location] &= ~(1 << number)
+        return True
+
+    def release(self, location, number):
+        """
+        배정된 번호를 반납하여 다시 배정 가능하게 합니다.
+        그 위치를 쓰는 모든 열람실의 first_open을 반납된 구간까지 되돌립니다.
+
+        Returns: config 구간 안의 사용 가능한 번호면 True, 아니면 False (구간 밖/사용 불가 번호는 무시)
+        """
+        if find_locker(self.index, location, number) is None or self.out_of_service[location] >> number & 1:
+            return False
+        self.free[location] |= 1 << number
+        for room, idx in self.users[location]:
+            if idx < self.first_open[room]:
+                self.first_open[room] = idx
+        return True
+
+    def remaining(self, room):
+        """열람실에 배정 가능한 남은 사물함 수"""
+        return sum((self.free[location] & mask).bit_count()
+                   for location, _, _, mask in self.segments.get(room, []))
 
 
 def load_indices_from_existing(file_path, config):
     """
-    기존 seat_locker_result.csv를 읽어, 이미 배정된 사물함 번호만큼
-    사물함 상태의 current 인덱스를 전진시킵니다 (추가 배정 시 사용).
+    기존 seat_locker_result.csv를 읽어, 이미 배정된 사물함 번호를 사용 중으로 표시한
+    LockerAllocator를 반환합니다 (추가 배정 시 사용).
     """
-    locker_state, room_to_lockers = build_locker_state(config)
+    allocator = LockerAllocator(config)
 
     try:
         with open(file_path, mode='rt', encoding='UTF-8') as csvfile:
             csvreader = csv.reader(csvfile)
             next(csvreader)  # header skip
             for row in csvreader:
-                locker_location = row[4]
-                locker_num = int(row[5])
-
-                # 매칭되는 사물함 상태를 찾아 인덱스 전진
-                for key, state in locker_state.items():
-                    if (state['location'] == locker_location and
-                            state['start'] <= locker_num <= state['end']):
-                        state['current'] = max(state['current'], locker_num + 1)
-                        break
+                allocator.take(row[4], int(row[5]))
     except FileNotFoundError:
         print(f"[!] 기존 파일 {file_path} 없음. 기본 인덱스로 진행하나, 반드시 수작업 필요")
 
-    return locker_state, room_to_lockers
+    return allocator
+
+
+def check_release(config):
+    """
+    열람실마다 사물함을 모두 배정한 뒤(overflow 포함) 첫 번호를 반납하고 다시 배정하여
+    같은 번호가 돌아오는지 확인합니다 (release → assign 왕복).
+
+    Returns: 왕복이 실패한 열람실 목록
+    """
+    allocator = LockerAllocator(config)
+    failed = []
+    for room in config['locker_mapping']:
+        first = allocator.assign(room)
+        if first is None:
+            continue
+        while allocator.assign(room) is not None:
+            pass
+        allocator.release(*first)
+        again = allocator.assign(room)
+        if again != first:
+            failed.append(room)
+            print(f"[-] {room}: {first[0]} {first[1]}번 반납 후 재배정 결과 {again}")
+    if not failed:
+        print(f"[+] 반납 후 재배정 확인 완료 ({len(config['locker_mapping'])}개 열람실)")
+    return failed
+
+# ============================================================
+# 결과 저장
+# ============================================================
+
+RESULT_HEADER = ["이름", "학번뒤2자리", "열람실", "좌석번호", "사물함", "사물함번호", "1지망배정여부"]
+
+
+def write_locker_csv(filepath, rows, write_header=True):
+    """결과를 CSV로 저장합니다. write_header=False면 기존 파일에 추가합니다."""
+    mode = 'wt' if write_header else 'at'
+    with open(filepath, mode=mode, encoding='utf-8') as file:
+        if write_header:
+            file.write(",".join(RESULT_HEADER) + "\n")
+        for r in rows:
+            file.write(f"{r[0]},{r[1]},{r[2]},{r[3]},{r[4]},{r[5]},{r[6]}\n")
+    print(f'[+] 좌석 및 사물함 배치 결과 저장 경로: {filepath}')
+
+
+def _save_xlsx(wb, filepath):
+    """xlsx 저장. 실패해도 전체 프로세스를 중단하지 않는다."""
+    try:
+        wb.save(filepath)
+        print(f'[+] 좌석 및 사물함 배치 결과 저장 경로: {filepath}')
+        return True
+    except PermissionError:
+        print(f'[!] {filepath} 저장 실패: 파일이 다른 프로그램(Excel 등)에서 열려 있습니다.')
+        print(f'    CSV 파일은 정상 저장되었으니, xlsx는 파일을 닫고 다시 실행해주세요.')
+    except Exception as e:
+        print(f'[!] {filepath} 저장 실패: {e}')
+        print(f'    CSV 파일은 정상 저장되었으니, xlsx는 다시 실행해주세요.')
+    return False
+
+
+def read_locker_csv(filepath):
+    """결과 CSV의 데이터 행을 하나씩 반환합니다 (사물함번호는 int, 나머지는 문자열)."""
+    with open(filepath, mode='rt', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        next(reader)  # 헤더 skip
+        for r in reader:
+            yield r[:5] + [int(r[5]), r[6]]
+
+
+def write_locker_xlsx(filepath, rows, csv_path=None):
+    """
+    결과를 xlsx 파일로 저장합니다 (새로 생성).
+
+    write-only 모드로 행을 바로 스트리밍하므로 셀 객체를 메모리에 쌓지 않습니다.
+    rows는 한 번만 순회하므로 generator도 됩니다.
+    csv_path를 주면 저장 후 xlsx의 수정 시각을 그 CSV와 같게 맞춥니다 (xlsx_edited 참고).
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet")
+    ws.append(RESULT_HEADER)
+    for r in rows:
+        ws.append(list(r))
+    if _save_xlsx(wb, filepath) and csv_path is not None:
+        os.utime(filepath, ns=(time.time_ns(), os.stat(csv_path).st_mtime_ns))
+
+
+def xlsx_edited(filepath, csv_path):
+    """
+    전체 결과 xlsx가 결과 CSV보다 나중에 수정되었는지 (= 직원이 xlsx를 직접 고쳐 저장했는지).
+    이 모듈이 쓴 xlsx는 수정 시각을 CSV와 같게 맞추므로, 더 새로우면 외부에서 저장한 것입니다.
+    """
+    try:
+        return os.stat(filepath).st_mtime_ns > os.stat(csv_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def backup_edited_xlsx(filepath):
+    """직접 수정된 xlsx를 '<이름>.edited-<시각>.xlsx'로 옮겨 보관하고 경고합니다."""
+    root, ext = os.path.splitext(filepath)
+    backup = f"{root}.edited-{time.strftime('%Y%m%d-%H%M%S')}{ext}"
+    os.replace(filepath, backup)
+    print(f"[!] {filepath}이(가) 결과 CSV보다 나중에 수정되었습니다 (직접 수정한 내용이 있을 수 있음).")
+    print(f"    CSV 기준으로 다시 쓰기 전에 기존 파일을 {backup}(으)로 옮겨 두었습니다. 수정 내용은 CSV에 반영해주세요.")
+
+
+def rebuild_locker_xlsx(filepath, csv_path):
+    """
+    추가 배정 후 전체 결과 xlsx를 갱신합니다.
+
+    기존 xlsx를 load_workbook으로 다시 읽어 행을 덧붙이는 대신, 방금 추가분까지 append한
+    결과 CSV(원본 기록)를 스트리밍으로 읽어 xlsx를 새로 씁니다. 셀을 파싱하지 않고 쓰기만 하므로
+    회차가 늘어도 훨씬 가볍지만, 비용은 여전히 누적 행 수에 비례합니다 (추가분만은 *_additional.xlsx).
+    이전 xlsx 저장이 실패했던 경우(Excel에서 열려 있던 경우 등)에도 CSV와 같은 내용으로 맞춰집니다.
+    """
+    write_locker_xlsx(filepath, read_locker_csv(csv_path), csv_path)
 
 
 # ============================================================
 # 메인 실행
 # ============================================================
 
-def main(mode="normal"):
-    """좌석 배정 결과를 읽어 사물함을 배정합니다."""
-    config = load_config()
-    paths = config['paths']
+def assign_lockers(students, allocator):
+    """
+    좌석 배정 결과 행마다 LockerAllocator로 사물함을 배정합니다 (students 순서대로).
 
-    # 좌석배치 완료된 파일에서 학생 정보 로드
-    if mode == "normal":
-        file_path = paths['output_result']
-        locker_state, room_to_lockers = build_locker_state(config)
-    else:
-        file_path = paths['output_result_additional']
-        # 추가 배정: 입력 파일 해시 기반 시드 → 동일 입력이면 동일 결과 보장
-        random.seed(get_seed_from_file(file_path))
-        locker_state, room_to_lockers = load_indices_from_existing(
-            paths['output_locker_result'], config)
-
-    students = []
-    with open(file_path, mode='rt', encoding='UTF-8', newline='') as csvfile:
-        csvreader = csv.reader(csvfile)
-        next(csvreader)  # 헤더 skip
-        for row in csvreader:
-            students.append(row)
-    random.shuffle(students)
-
-    # 각 학생에게 사물함 배정
-    # student: [이름, 학번뒤2자리, 열람실, 좌석번호, 1지망배정여부]
-    # locker:  [사물함위치, 사물함번호]
-    # 출력 순서: 이름, 학번뒤2자리, 열람실, 좌석번호, 사물함, 사물함번호, 1지망배정여부
+    student: [이름, 학번뒤2자리, 열람실, 좌석번호, 1지망배정여부]
+    locker:  [사물함위치, 사물함번호]
+
+    Returns: (result, failed)
+        result: [이름, 학번뒤2자리, 열람실, 좌석번호, 사물함, 사물함번호, 1지망배정여부] 리스트
+        failed: { 열람실: 실패 횟수 }
+    """
     result = []
     failed = defaultdict(int)
 
     for student in students:
         room = student[2]  # 열람실명
-        locker = assign_locker(room, locker_state, room_to_lockers)
+        locker = allocator.assign(room)
         if locker is None:
             failed[room] += 1
             continue
         first_pref = student[4]  # 1지망배정여부 (O/X)
         result.append(student[:4] + locker + [first_pref])
 
-    # 검증
-    validate_locker_capacity(locker_state)
+    return result, failed
 
-    if len(result) != len(students):
-        print("[-] 전체 숫자 안맞음. 데이터 오타 확인할 것")
-        print(f"[-] 배정 성공: {len(result)}, 전체: {len(students)}, 실패: {sum(failed.values())}")
 
-    if failed:
-        for room, count in failed.items():
-            print(f"[-] 열람실: {room}, 실패 횟수: {count}")
-
-    # 결과 CSV 저장
-    HEADER = ["이름", "학번뒤2자리", "열람실", "좌석번호", "사물함", "사물함번호", "1지망배정여부"]
-
-    def write_locker_csv(filepath, rows, write_header=True):
-        mode = 'wt' if write_header else 'at'
-        with open(filepath, mode=mode, encoding='utf-8') as file:
-            if write_header:
-                file.write(",".join(HEADER) + "\n")
-            for r in rows:
-                file.write(f"{r[0]},{r[1]},{r[2]},{r[3]},{r[4]},{r[5]},{r[6]}\n")
-        print(f'[+] 좌석 및 사물함 배치 결과 저장 경로: {filepath}')
+def main(mode="normal", config=None, students=None):
+    """
+    좌석 배정 결과를 읽어 사물함을 배정합니다.
 
-    def _save_xlsx(wb, filepath):
-        """xlsx 저장. 실패해도 전체 프로세스를 중단하지 않는다."""
-        try:
-            wb.save(filepath)
-            print(f'[+] 좌석 및 사물함 배치 결과 저장 경로: {filepath}')
-        except PermissionError:
-            print(f'[!] {filepath} 저장 실패: 파일이 다른 프로그램(Excel 등)에서 열려 있습니다.')
-            print(f'    CSV 파일은 정상 저장되었으니, xlsx는 파일을 닫고 다시 실행해주세요.')
-        except Exception as e:
-            print(f'[!] {filepath} 저장 실패: {e}')
-            print(f'    CSV 파일은 정상 저장되었으니, xlsx는 다시 실행해주세요.')
-
-    def write_locker_xlsx(filepath, rows):
-        """결과를 xlsx 파일로 저장합니다 (새로 생성)."""
-        wb = Workbook()
-        ws = wb.active
-        ws.append(HEADER)
-        for r in rows:
-            ws.append(list(r))
-        _save_xlsx(wb, filepath)
-
-    def append_locker_xlsx(filepath, rows):
-        """기존 xlsx 파일에 행을 추가합니다."""
-        try:
-            wb = load_workbook(filepath)
-            ws = wb.active
-        except FileNotFoundError:
-            wb = Workbook()
-            ws = wb.active
-            ws.append(HEADER)
-        for r in rows:
-            ws.append(list(r))
-        _save_xlsx(wb, filepath)
+    run.py 파이프라인은 seat.main/main_additional이 반환한 결과 행을 students로 넘기며,
+    이 경우 seat_result(_additional).csv를 다시 읽지 않습니다 (행 순서는 파일과 같음).
+    """
+    if config is None:
+        config = load_config()
+    paths = config['paths']
+    ledger = open_ledger(config)
 
-    if mode == "normal":
-        write_locker_csv(paths['output_locker_result'], result)
-        write_locker_xlsx(paths['output_locker_result_xlsx'], result)
-    else:
-        # 추가 배정: 기존 파일에 append + 별도 추가분 파일 생성
-        write_locker_csv(paths['output_locker_result'], result, write_header=False)
-        append_locker_xlsx(paths['output_locker_result_xlsx'], result)
-        write_locker_csv(paths['output_locker_result_additional'], result)
-        write_locker_xlsx(paths['output_locker_result_additional_xlsx'], result)
+    try:
+        # 좌석배치 완료된 파일에서 학생 정보 로드
+        if mode == "normal":
+            file_path = paths['output_result']
+            allocator = LockerAllocator(config)
+        else:
+            file_path = paths['output_result_additional']
+            # 추가 배정: 입력 파일 해시 기반 시드 → 동일 입력이면 동일 결과 보장
+            # (디스크에 쓰인 바이트 기준이므로 파이프라인에서도 파일 해시를 사용)
+            random.seed(get_seed_from_file(file_path))
+            if ledger is not None:
+                # 원장의 사용 중 사물함으로 복원 (결과 CSV를 다시 파싱하지 않음)
+                ledger.import_files(paths)
+                allocator = LockerAllocator(config)
+                for location, number in ledger.used_lockers():
+                    allocator.take(location, number)
+            else:
+                allocator = load_indices_from_existing(paths['output_locker_result'], config)
+
+        if students is None:
+            students = []
+            with instrument.section('load'):
+                with open(file_path, mode='rt', encoding='UTF-8', newline='') as csvfile:
+                    csvreader = csv.reader(csvfile)
+                    next(csvreader)  # 헤더 skip
+                    for row in csvreader:
+                        students.append(row)
+        else:
+            students = list(students)
+        random.shuffle(students)
+
+        # 각 학생에게 사물함 배정
+        # 출력 순서: 이름, 학번뒤2자리, 열람실, 좌석번호, 사물함, 사물함번호, 1지망배정여부
+        with instrument.section('assign_lockers') as sec:
+            result, failed = assign_lockers(students, allocator)
+            if sec is not None:
+                sec.count('students', len(students))
+                sec.count('assigned', len(result))
+                sec.count('failed', sum(failed.values()))
+
+        # 검증
+        if len(result) != len(students):
+            print("[-] 전체 숫자 안맞음. 데이터 오타 확인할 것")
+            print(f"[-] 배정 성공: {len(result)}, 전체: {len(students)}, 실패: {sum(failed.values())}")
+
+        if failed:
+            for room, count in failed.items():
+                print(f"[-] 열람실: {room}, 실패 횟수: {count}")
+
+        # 결과 저장
+        if mode == "normal":
+            with instrument.section('write_csv'):
+                write_locker_csv(paths['output_locker_result'], result)
+            with instrument.section('write_xlsx'):
+                write_locker_xlsx(paths['output_locker_result_xlsx'], result, paths['output_locker_result'])
+            if ledger is not None:
+                ledger.record_lockers(result, replace=True)
+        else:
+            # 추가 배정: 기존 파일에 append + 별도 추가분 파일 생성
+            # 전체 결과 xlsx는 CSV 기준으로 새로 쓰므로, 직접 수정된 xlsx는 CSV append 전에 확인해 보관
+            if xlsx_edited(paths['output_locker_result_xlsx'], paths['output_locker_result']):
+                backup_edited_xlsx(paths['output_locker_result_xlsx'])
+            with instrument.section('write_csv'):
+                write_locker_csv(paths['output_locker_result'], result, write_header=False)
+                write_locker_csv(paths['output_locker_result_additional'], result)
+            with instrument.section('write_xlsx'):
+                if ledger is not None:
+                    # 전체 결과 xlsx는 원장에서 내보냄
+                    ledger.record_lockers(result)
+                    write_locker_xlsx(paths['output_locker_result_xlsx'], ledger.locker_rows(),
+                                      paths['output_locker_result'])
+                else:
+                    rebuild_locker_xlsx(paths['output_locker_result_xlsx'], paths['output_locker_result'])
+                write_locker_xlsx(paths['output_locker_result_additional_xlsx'], result)
+    finally:
+        if ledger is not None:
+            ledger.close()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--mode", choices=["normal", "add"], default="normal")
+    parser.add_argument("--check", action="store_true",
+                        help="배정하지 않고, 열람실마다 사물함 반납 후 같은 번호가 다시 배정되는지만 확인")
     args = parser.parse_args()
+    if args.check:
+        sys.exit(1 if check_release(load_config()) else 0)
     main(mode=args.mode)
@@ -0,0 +1,412 @@
+"""
+최적 배정 엔진 (최소 비용 흐름)
+
+추첨(seat.run_allocation의 phase 순차 랜덤 배정) 대신, 같은 배정 규칙 안에서
+지망 만족도가 가장 높은 배정을 한 번에 구합니다. 추첨 결과가 "가능한 최선"에
+얼마나 가까운지 비교하는 기준선으로 씁니다 (config.yaml의 allocation_engine: "optimal").
+
+배정 규칙 (추첨과 같음):
+  - 지망 매칭: 학생의 N지망 열람실 좌석 중, 어떤 preference phase에서 그 학생의 학년이
+    대상이고 좌석타입이 허용되는 좌석만 배정 가능
+  - 잔여석 배정: unmatched phase가 있으면 남은 어떤 좌석이든 배정 가능 (지망 순위 0)
+    1~3지망에 노트북 금지 열람실이 없는 학생은 허용 열람실 좌석을 우선
+
+목표 (앞의 항목이 항상 우선, 사전식):
+  1. 배정 인원 최대
+  2. 1지망 배정 인원 최대 → 2지망 → 3지망
+  3. 잔여석 배정 시 노트북 허용 열람실 우선 (금지 열람실 미신청자)
+  4. 학년에 맞는 좌석타입 배정 인원 최대
+같은 목표값의 배정이 여럿이면 난수(random 모듈, 호출 전 시드)로 고릅니다.
+
+구현:
+  학생은 (학년, 1~3지망)이 같으면 구별할 필요가 없고, 좌석도 (열람실, 좌석타입)이 같으면
+  구별할 필요가 없으므로 학생 묶음 → 좌석 버킷의 수송 문제(최소 비용 흐름)로 풉니다.
+  노드 포텐셜 Dijkstra로 최단 거리를 구한 뒤 보정 비용 0인 경로로 여러 번 흐름을 늘리는
+  primal-dual 방식이며, 학생 묶음 노드를 접어서 좌석 버킷과 잔여석 허브만으로 이루어진
+  잔여 그래프에서 경로를 찾습니다 (min_cost_flow). 현재 규모 약 0.01초, 10배 규모 약 0.2초.
+  흐름이 정해지면 묶음 안의 학생과 버킷 안의 좌석을 무작위로 짝짓습니다.
+
+비교: python optimal.py [--runs 100] [--seed 1234]
+      (추첨 N회 평균과 최적 배정의 지망 순위별 인원, 학년 매칭 인원을 비교 출력)
+"""
+
+import argparse
+import heapq
+import random
+from collections import Counter
+
+import instrument
+
+
+def _eligible_types(phases, codebook):
+    """
+    preference phase들의 (대상 학년 코드 집합, 좌석타입 코드 집합) 목록과 unmatched phase 존재 여부.
+    빈 집합은 전체를 뜻합니다.
+    """
+    rules = []
+    has_unmatched = False
+    for phase in phases:
+        if phase['type'] == 'preference':
+            rules.append(({codebook.grade(g) for g in phase.get('student_types', [])},
+                          codebook.seat_types.code_set(phase.get('seat_types', []))))
+        elif phase['type'] == 'unmatched':
+            has_unmatched = True
+        else:
+            raise ValueError(f"[!] 알 수 없는 phase type: {phase['type']}")
+    return rules, has_unmatched
+
+
+class Network:
+    """
+    최적 배정용 흐름 네트워크.
+
+    노드: 좌석 버킷 0..K-1, 잔여석 허브 K..K+H-1
+    classes:   [ [학생 key, ...], ... ]  (학년, 1~3지망이 같은 학생 묶음)
+    buckets:   [ [좌석 id, ...], ... ]   (같은 (열람실, 좌석타입)의 남은 좌석, 풀 순서)
+    edges:     edges[c] = { 노드: 비용 }  (배정 가능한 지망 버킷, 잔여석 허브는 비용 0)
+    ranks:     ranks[c] = { 버킷: 지망 순위 1~3 }
+    hub_costs: hub_costs[h] = { 버킷: 잔여석 배정 비용 }
+    잔여석 배정 비용은 학생의 (우선 좌석타입, 노트북 금지 열람실 신청 여부)에만 달려 있으므로
+    묶음마다 모든 버킷으로 간선을 두는 대신 이 조합별 허브 하나를 거치게 합니다.
+    """
+
+    def __init__(self):
+        self.classes = []
+        self.buckets = []
+        self.edges = []
+        self.ranks = []
+        self.hub_costs = []
+
+
+def build_network(students, pool, phases, codebook):
+    """students와 pool의 남은 좌석으로 Network를 만듭니다."""
+    rules, has_unmatched = _eligible_types(phases, codebook)
+    laptop_rooms = codebook.laptop_rooms
+    net = Network()
+
+    bucket_of = {}
+    for seat_id, seat in enumerate(pool.seats):
+        if pool.alive[seat_id]:
+            key = (seat.room, seat.seat_type)
+            if key not in bucket_of:
+                bucket_of[key] = len(net.buckets)
+                net.buckets.append([])
+            net.buckets[bucket_of[key]].append(seat_id)
+    bucket_keys = list(bucket_of)
+    n_buckets = len(bucket_keys)
+    room_buckets = {}
+    for (room, _), b in bucket_of.items():
+        room_buckets.setdefault(room, []).append(b)
+
+    groups = {}
+    for key, student in students.items():
+        groups.setdefault((student.grade, student.prefs), []).append(key)
+
+    # 사전식 목표를 정수 가중치로: 아래 단계의 합이 위 단계 1명분보다 항상 작도록 (n+1)배씩 띄움
+    unit = len(students) + 1
+    type_penalty, zone_penalty = 1, unit
+    rank_reward = {3: unit ** 2, 2: unit ** 3, 1: unit ** 4}
+
+    hub_of = {}
+    for (grade, prefs), keys in groups.items():
+        sample = students[keys[0]]
+        cost, rank = {}, {}
+        for pref_rank, room in enumerate(prefs, 1):
+            for b in room_buckets.get(room, ()):
+                seat_type = bucket_keys[b][1]
+                if not any((not grades or grade in grades) and (not types or seat_type in types)
+                           for grades, types in rules):
+                    continue
+                c = -rank_reward[pref_rank] + (seat_type != sample.seat_type) * type_penalty
+                if b not in cost or c < cost[b]:
+                    cost[b] = c
+                    rank[b] = pref_rank
+        if has_unmatched and n_buckets:
+            hub_key = (sample.seat_type, sample.laptop)
+            if hub_key not in hub_of:
+                hub_of[hub_key] = len(net.hub_costs)
+                net.hub_costs.append({
+                    b: (seat_type != sample.seat_type) * type_penalty
+                       + (not sample.laptop and room in laptop_rooms) * zone_penalty
+                    for b, (room, seat_type) in enumerate(bucket_keys)})
+            cost[n_buckets + hub_of[hub_key]] = 0
+        if cost:
+            net.classes.append(keys)
+            net.edges.append(cost)
+            net.ranks.append(rank)
+    return net
+
+
+def min_cost_flow(net, tie):
+    """
+    학생 묶음 → (허브 →) 좌석 버킷 최소 비용 최대 흐름 (primal-dual).
+
+    잔여 그래프에서 학생 묶음 노드를 접으면 노드 u → v 간선의 비용은
+    "u에 흐름이 있는 묶음 c 중 edges[c][v] - edges[c][u]의 최솟값"이 됩니다.
+    이 값과 출발 비용(남은 학생이 있는 묶음 중 edges[c][v] 최솟값)을 지연 삭제 힙으로 유지하므로
+    최단 경로는 버킷+허브 노드(수십~수백 개)만으로 찾습니다.
+    같은 비용이면 tie[c](묶음별 난수)가 작은 묶음을 먼저 씁니다.
+
+    Returns: (flow, hub_flow, 증가 횟수)
+      flow[c] = { 노드: 인원 }, hub_flow[h] = { 버킷: 인원 }
+    """
+    edges, hub_costs = net.edges, net.hub_costs
+    n_buckets = len(net.buckets)
+    n_nodes = n_buckets + len(hub_costs)
+    supply = [len(keys) for keys in net.classes]
+    capacity = [len(seat_ids) for seat_ids in net.buckets]
+    flow = [{} for _ in supply]
+    hub_flow = [{} for _ in hub_costs]
+    hub_users = [set() for _ in range(n_buckets)]  # 버킷 → 그 버킷으로 흐름을 보낸 허브
+
+    # 출발 비용 힙: start[v] = [(비용, tie, 묶음)], supply > 0인 묶음만 유효
+    start = [[] for _ in range(n_nodes)]
+    for c, cost in enumerate(edges):
+        for v, value in cost.items():
+            start[v].append((value, tie[c], c))
+    for heap in start:
+        heapq.heapify(heap)
+
+    # 묶음 경유 간선 힙: moves[u][v] = [(비용 차, tie, 묶음)], flow[c][u] > 0인 묶음만 유효
+    moves = [{} for _ in range(n_nodes)]
+
+    def add_flow(c, v, amount):
+        before = flow[c].get(v, 0)
+        flow[c][v] = before + amount
+        if before == 0:
+            base = edges[c][v]
+            for v2, value in edges[c].items():
+                if v2 != v:
+                    heapq.heappush(moves[v].setdefault(v2, []), (value - base, tie[c], c))
+
+    def top_start(v):
+        heap = start[v]
+        while heap and supply[heap[0][2]] == 0:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def top_move(u, v):
+        heap = moves[u][v]
+        while heap and flow[heap[0][2]].get(u, 0) == 0:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    # 노드 포텐셜 (sink = 남은 좌석이 있는 버킷에서 비용 0으로 가는 도착 노드)
+    sink = n_nodes
+    potential = [0] * (n_nodes + 1)
+
+    def update_potential():
+        """
+        포텐셜로 보정한 비용(음수 없음)으로 Dijkstra를 돌려 포텐셜을 갱신합니다.
+        sink에 도달하면 멈추며, 확정되지 않은 노드는 sink까지의 거리만큼만 올립니다
+        (그래도 보정 비용이 음수가 되지 않음). sink에 도달할 수 없으면 False.
+        """
+        dist = [None] * (n_nodes + 1)
+        done = [False] * (n_nodes + 1)
+        heap = []
+
+        def relax(v, d):
+            if dist[v] is None or d < dist[v]:
+                dist[v] = d
+                heapq.heappush(heap, (d, v))
+
+        for v in range(n_nodes):
+            entry = top_start(v)
+            if entry is not None:
+                relax(v, entry[0] - potential[v])
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            if u == sink:
+                break
+            for v, cost, _ in successors(u):
+                if not done[v]:
+                    relax(v, d + cost + potential[u] - potential[v])
+        if not done[sink]:
+            return False
+        reach = dist[sink]
+        for v in range(n_nodes + 1):
+            potential[v] += dist[v] if done[v] else reach
+        return True
+
+    def successors(u):
+        """노드 u에서 나가는 잔여 간선 (v, 비용, 경로 기록용 how)"""
+        if u < n_buckets and capacity[u] > 0:
+            yield sink, 0, ('sink', u)
+        for v in list(moves[u]):
+            entry = top_move(u, v)
+            if entry is None:
+                del moves[u][v]
+            else:
+                yield v, entry[0], ('move', u, entry[2])
+        if u >= n_buckets:  # 허브 → 버킷
+            for b, value in hub_costs[u - n_buckets].items():
+                yield b, value, ('hub', u)
+        else:               # 버킷 → 허브 (허브 흐름 되돌리기)
+            for h in hub_users[u]:
+                yield n_buckets + h, -hub_costs[h][u], ('unhub', u)
+
+    def admissible_path(dead):
+        """
+        보정 비용이 0인 간선만으로 sink까지 가는 경로를 DFS로 찾습니다 (같은 포텐셜로 여러 번 증가).
+        막다른 노드는 dead에 표시해 다시 탐색하지 않습니다.
+        Returns: [(how, 도착 노드), ...] (sink 쪽부터) 또는 None
+        """
+        for first in range(n_nodes):
+            entry = top_start(first)
+            if dead[first] or entry is None or entry[0] != potential[first]:
+                continue
+            stack = [(first, ('start', entry[2]), successors(first))]
+            on_stack = {first}
+            while stack:
+                u, _, edges_out = stack[-1]
+                for v, cost, how in edges_out:
+                    if v in on_stack or dead[v] or cost + potential[u] != potential[v]:
+                        continue
+                    if v == sink:
+                        return [(how, v)] + [(h, n) for n, h, _ in reversed(stack)]
+                    stack.append((v, how, successors(v)))
+                    on_stack.add(v)
+                    break
+                else:
+                    dead[u] = True
+                    stack.pop()
+                    on_stack.discard(u)
+        return None
+
+    def augment(path):
+        """경로의 병목만큼 흐름을 늘립니다."""
+        amount = None
+        for how, v in path:
+            if how[0] == 'sink':
+                limit = capacity[how[1]]
+            elif how[0] == 'start':
+                limit = supply[how[1]]
+            elif how[0] == 'move':
+                limit = flow[how[2]][how[1]]
+            elif how[0] == 'unhub':
+                limit = hub_flow[v - n_buckets][how[1]]
+            else:
+                continue
+            amount = limit if amount is None else min(amount, limit)
+
+        for how, v in path:
+            if how[0] == 'sink':
+                capacity[how[1]] -= amount
+            elif how[0] == 'start':
+                supply[how[1]] -= amount
+                add_flow(how[1], v, amount)
+            elif how[0] == 'move':
+                flow[how[2]][how[1]] -= amount
+                add_flow(how[2], v, amount)
+            elif how[0] == 'hub':
+                h = how[1] - n_buckets
+                hub_flow[h][v] = hub_flow[h].get(v, 0) + amount
+                hub_users[v].add(h)
+            else:
+                h = v - n_buckets
+                hub_flow[h][how[1]] -= amount
+                if hub_flow[h][how[1]] == 0:
+                    hub_users[how[1]].discard(h)
+
+    augments = 0
+    while update_potential():
+        dead = [False] * (n_nodes + 1)
+        while True:
+            path = admissible_path(dead)
+            if path is None:
+                break
+            augment(path)
+            augments += 1
+
+    return flow, hub_flow, augments
+
+
+def allocate_optimal(students, pool, phases, codebook):
+    """
+    phases의 배정 규칙 안에서 최적 배정을 구합니다 (seat.run_allocation의 engine="optimal").
+
+    배정된 학생은 students에서, 좌석은 pool에서 제거됩니다 (in-place, 추첨과 같음).
+    Returns: { '이름_학번': (Student, Seat, 지망 순위) } (1지망→2지망→3지망→잔여석 순, 각 순위 안은 무작위)
+    """
+    with instrument.section('optimal') as sec:
+        net = build_network(students, pool, phases, codebook)
+        tie = [random.random() for _ in net.classes]
+        flow, hub_flow, augments = min_cost_flow(net, tie)
+        if sec is not None:
+            sec.fields.update(classes=len(net.classes), buckets=len(net.buckets),
+                              hubs=len(net.hub_costs), augments=augments)
+
+    # 묶음 안의 학생, 버킷 안의 좌석을 무작위로 짝지음 (허브를 거친 학생은 허브의 좌석과 짝지음)
+    n_buckets = len(net.buckets)
+    buckets = net.buckets
+    for seat_ids in buckets:
+        random.shuffle(seat_ids)
+    hub_students = [[] for _ in net.hub_costs]
+    assigned = []
+    for c, keys in enumerate(net.classes):
+        keys = list(keys)
+        random.shuffle(keys)
+        for v, amount in sorted(flow[c].items()):
+            for _ in range(amount):
+                if v < n_buckets:
+                    assigned.append((net.ranks[c][v], keys.pop(), buckets[v].pop()))
+                else:
+                    hub_students[v - n_buckets].append(keys.pop())
+    for h, keys in enumerate(hub_students):
+        random.shuffle(keys)
+        for b, amount in sorted(hub_flow[h].items()):
+            for _ in range(amount):
+                assigned.append((0, keys.pop(), buckets[b].pop()))
+    random.shuffle(assigned)
+    assigned.sort(key=lambda item: item[0] or 4)
+
+    result = {}
+    for pref_rank, key, seat_id in assigned:
+        pool.take(seat_id)
+        result[key] = (students.pop(key), pool.seats[seat_id], pref_rank)
+    return result
+
+
+# ============================================================
+# 추첨 vs 최적 비교 (python optimal.py)
+# ============================================================
+
+def summarize(result, total):
+    """배정 결과의 지망 순위별 인원, 학년 매칭 좌석 인원, 미배정 인원"""
+    counts = Counter(pref for _, _, pref in result.values())
+    matched = sum(1 for student, seat, _ in result.values() if seat.seat_type == student.seat_type)
+    return {'1지망': counts[1], '2지망': counts[2], '3지망': counts[3], '잔여석': counts[0],
+            '학년매칭': matched, '미배정': total - len(result)}
+
+
+def main():
+    from config import load_config
+    from seat import AllocationContext
+    from simulate import make_seeds
+
+    parser = argparse.ArgumentParser(description='추첨 배정과 최적 배정 비교')
+    parser.add_argument('--runs', type=int, default=100, help='추첨 반복 횟수 (기본 100)')
+    parser.add_argument('--seed', type=int, default=1234, help='마스터 시드 (기본 1234)')
+    args = parser.parse_args()
+
+    config = load_config()
+    context = AllocationContext(config)
+    total = len(context.students)
+
+    best = summarize(context.run(args.seed, engine='optimal'), total)
+    lottery = Counter()
+    for seed in make_seeds(args.seed, args.runs):
+        lottery.update(summarize(context.run(seed), total))
+
+    print(f"[*] 신청자 {total}명, 추첨 {args.runs}회 평균 vs 최적 배정")
+    print(f"    {'항목':<8} {'추첨 평균':>10} {'최적':>8} {'차이':>8}")
+    for name, value in best.items():
+        mean = lottery[name] / args.runs
+        print(f"    {name:<8} {mean:>10.1f} {value:>8} {value - mean:>+8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ config.yaml + seatlist.csv를 읽어 다음을 출력합니다:
   2. 좌석 중복 검증: 동일 (열람실, 좌석번호) 중복 여부
   3. 사물함 매핑: 열람실 → 사물함 위치/번호 범위
 
+seatlist.csv는 한 번만 읽어 SeatInventory로 한 번에 집계하고, 모든 섹션이 그 집계를 함께 씁니다.
 결과는 콘솔에 출력되고 config_preview.txt로 저장됩니다.
 
 사용법: python preview.py
@@ -16,7 +17,7 @@ import re
 import unicodedata
 from collections import defaultdict
 
-from config import load_config
+from config import compiled_config, load_config
 
 
 # ============================================================
@@ -46,47 +47,95 @@ def pad(text, target_width, align='left'):
 
 
 # ============================================================
-# 1. 좌석 현황
+# 좌석 목록 집계 (모든 섹션 공통)
 # ============================================================
 
-def generate_seat_summary(config):
-    """seatlist.csv를 읽어 열람실별 좌석 현황 표를 생성합니다."""
-    paths = config['paths']
-    laptop_zones = set(config.get('laptop_not_allowed_zones', []))
+def get_room_type(room_name):
+    """열람실 이름의 괄호 안 텍스트 (예: '칸막이', '평상', 없으면 '')"""
+    m = re.search(r'\(([^)]+)\)', room_name)
+    return m.group(1) if m else ""
+
+
+class SeatInventory:
+    """
+    seatlist.csv를 한 번 읽고 한 번 훑어 만든 집계. 좌석 현황과 좌석 검증이 함께 씁니다.
+
+    counts: (열람실, 좌석타입, 상태) → 좌석 수
+    room_totals: (열람실, 상태) → 좌석 수
+    rooms_order: 열람실 등장 순서, room_index: 열람실 → 등장 순번
+    grades / statuses: 등장한 좌석타입 / 상태 집합
+    open_rooms / open_seat_types: open 좌석이 있는 열람실 / 좌석타입 집합
+    duplicates: [(열람실, 좌석번호, (첫 좌석타입, 첫 상태), (중복 좌석타입, 중복 상태)), ...]
+    """
+
+    def __init__(self, rows):
+        self.counts = defaultdict(int)
+        self.room_totals = defaultdict(int)
+        self.rooms_order = []
+        self.room_index = {}
+        self.grades = set()
+        self.statuses = set()
+        self.open_rooms = set()
+        self.open_seat_types = set()
+        self.duplicates = []
+
+        seen = {}  # (room, seat_num) → (grade, status) 첫 등장
+        for row in rows:
+            if len(row) < 4:
+                continue
+            grade, room, seat_num, status = row[0], row[1], row[2], row[3]
+            self.counts[(room, grade, status)] += 1
+            self.room_totals[(room, status)] += 1
+            self.grades.add(grade)
+            self.statuses.add(status)
+            if room not in self.room_index:
+                self.room_index[room] = len(self.rooms_order)
+                self.rooms_order.append(room)
+            if status == 'open':
+                self.open_rooms.add(room)
+                self.open_seat_types.add(grade)
+
+            key = (room, seat_num)
+            if key in seen:
+                self.duplicates.append((room, seat_num, seen[key], (grade, status)))
+            else:
+                seen[key] = (grade, status)
+
+    def sorted_rooms(self):
+        """칸막이 → 평상 → 기타 순 (같은 유형 내에서는 등장 순서 유지)"""
+        def room_sort_key(room_name):
+            room_type = get_room_type(room_name)
+            # 칸막이=0, 평상=1, 기타=2
+            type_order = 0 if room_type == "칸막이" else (1 if room_type == "평상" else 2)
+            return (type_order, self.room_index[room_name])
+
+        return sorted(self.rooms_order, key=room_sort_key)
 
-    with open(paths['input_seats'], mode='rt', encoding='UTF-8') as f:
+
+def load_seat_inventory(config):
+    """config의 seatlist.csv를 읽어 SeatInventory를 만듭니다."""
+    with open(config['paths']['input_seats'], mode='rt', encoding='UTF-8') as f:
         reader = csv.reader(f)
         next(reader)  # 헤더 건너뛰기
-        rows = [row for row in reader if len(row) >= 4]
-
-    # 집계: (열람실, 좌석타입, 상태) → 좌석 수
-    counts = defaultdict(int)  # (room, grade, status) → count
-    rooms_order = []  # 등장 순서 유지
-    rooms_seen = set()
-    grades_seen = set()
-    statuses_seen = set()
-
-    for row in rows:
-        grade, room, seat_num, status = row[0], row[1], row[2], row[3]
-        counts[(room, grade, status)] += 1
-        grades_seen.add(grade)
-        statuses_seen.add(status)
-        if room not in rooms_seen:
-            rooms_seen.add(room)
-            rooms_order.append(room)
-
-    grades = sorted(grades_seen)
-    statuses = sorted(statuses_seen, key=lambda s: (s != 'open', s))  # open 먼저
-
-    # 칸막이 → 평상 순으로 정렬 (같은 유형 내에서는 등장 순서 유지)
-    def room_sort_key(room_name):
-        m = re.search(r'\(([^)]+)\)', room_name)
-        room_type = m.group(1) if m else ""
-        # 칸막이=0, 평상=1, 기타=2
-        type_order = 0 if room_type == "칸막이" else (1 if room_type == "평상" else 2)
-        return (type_order, rooms_order.index(room_name))
-
-    rooms_sorted = sorted(rooms_order, key=room_sort_key)
+        return SeatInventory(reader)
+
+
+# ============================================================
+# 1. 좌석 현황
+# ============================================================
+
+def generate_seat_summary(config, inventory=None):
+    """열람실별 좌석 현황 표를 생성합니다 (inventory가 없으면 seatlist.csv를 읽음)."""
+    if inventory is None:
+        inventory = load_seat_inventory(config)
+    laptop_zones = compiled_config(config).laptop_zones
+    counts = inventory.counts
+    room_totals = inventory.room_totals
+
+    grades = sorted(inventory.grades)
+    statuses = sorted(inventory.statuses, key=lambda s: (s != 'open', s))  # open 먼저
+    rooms_sorted = inventory.sorted_rooms()
+    room_types = {room: get_room_type(room) for room in rooms_sorted}
 
     # 열 폭 계산
     COL_ROOM = 22
@@ -111,29 +160,16 @@ def generate_seat_summary(config):
         lines.append(header)
         lines.append("-" * display_width(header))
 
-        # 열람실을 좌석 유형별로 분류 (괄호 안 텍스트 기준)
-        def get_room_type(room_name):
-            m = re.search(r'\(([^)]+)\)', room_name)
-            return m.group(1) if m else ""
-
+        # 열람실을 좌석 유형별로 분류 (괄호 안 텍스트 기준, 이 상태에 좌석이 있는 열람실만)
         type_groups = []  # [(type_label, [rooms])]
-        current_type = None
-        current_rooms = []
         for room in rooms_sorted:
-            # 이 상태에 좌석이 있는 열람실만 포함
-            room_total = sum(counts.get((room, g, status), 0) for g in grades)
-            if room_total == 0:
+            if not room_totals.get((room, status)):
                 continue
-            rt = get_room_type(room)
-            if rt != current_type:
-                if current_rooms:
-                    type_groups.append((current_type, current_rooms))
-                current_type = rt
-                current_rooms = [room]
+            rt = room_types[room]
+            if type_groups and type_groups[-1][0] == rt:
+                type_groups[-1][1].append(room)
             else:
-                current_rooms.append(room)
-        if current_rooms:
-            type_groups.append((current_type, current_rooms))
+                type_groups.append((rt, [room]))
 
         # 행 출력 (그룹별 소계 포함)
         grand_totals = defaultdict(int)
@@ -146,13 +182,12 @@ def generate_seat_summary(config):
 
             for room in group_rooms:
                 row_str = pad(room, COL_ROOM)
-                row_total = 0
                 for g in grades:
                     n = counts.get((room, g, status), 0)
                     row_str += " " + pad(str(n), COL_NUM, 'right')
                     group_totals[g] += n
                     grand_totals[g] += n
-                    row_total += n
+                row_total = room_totals[(room, status)]
                 row_str += " " + pad(str(row_total), COL_NUM, 'right')
                 group_total += row_total
                 grand_total += row_total
@@ -192,16 +227,13 @@ def generate_seat_summary(config):
 # 2. 좌석 중복 검증
 # ============================================================
 
-def generate_seat_validation(config):
-    """seatlist.csv에서 (열람실, 좌석번호) 중복 및 열람실/좌석타입 유효성을 검증합니다."""
-    paths = config['paths']
-    valid_rooms = set(config.get('valid_rooms', []))
-    valid_seat_types = set(config.get('valid_seat_types', []))
-
-    with open(paths['input_seats'], mode='rt', encoding='UTF-8') as f:
-        reader = csv.reader(f)
-        next(reader)
-        rows = [row for row in reader if len(row) >= 4]
+def generate_seat_validation(config, inventory=None):
+    """(열람실, 좌석번호) 중복 및 열람실/좌석타입 유효성을 검증합니다 (inventory가 없으면 seatlist.csv를 읽음)."""
+    if inventory is None:
+        inventory = load_seat_inventory(config)
+    compiled = compiled_config(config)
+    valid_rooms = compiled.valid_rooms
+    valid_seat_types = compiled.valid_seat_types
 
     lines = []
     lines.append("=" * 60)
@@ -210,19 +242,11 @@ def generate_seat_validation(config):
     lines.append("")
 
     # 열람실/좌석타입 유효성 검증 (open 좌석이 있는 항목만 대상)
-    open_rows = [row for row in rows if row[3] == 'open']
-    invalid_rooms = set()
-    invalid_seat_types = set()
-    for row in open_rows:
-        grade, room = row[0], row[1]
-        if valid_rooms and room not in valid_rooms:
-            invalid_rooms.add(room)
-        if valid_seat_types and grade not in valid_seat_types:
-            invalid_seat_types.add(grade)
+    invalid_rooms = inventory.open_rooms - valid_rooms if valid_rooms else set()
+    invalid_seat_types = inventory.open_seat_types - valid_seat_types if valid_seat_types else set()
 
     # 역방향 검증: valid_rooms에 있지만 seatlist(open)에 없는 열람실
-    open_rooms_in_seatlist = {row[1] for row in open_rows}
-    missing_rooms = valid_rooms - open_rooms_in_seatlist if valid_rooms else set()
+    missing_rooms = valid_rooms - inventory.open_rooms if valid_rooms else set()
 
     if invalid_rooms:
         lines.append(f"[!] seatlist에 valid_rooms에 없는 열람실 {len(invalid_rooms)}건:")
@@ -241,17 +265,7 @@ def generate_seat_validation(config):
     lines.append("")
 
     # 중복 검증
-    seen = {}       # (room, seat_num) → (grade, status) 첫 등장
-    duplicates = [] # 중복 목록
-
-    for row in rows:
-        grade, room, seat_num, status = row[0], row[1], row[2], row[3]
-        key = (room, seat_num)
-        if key in seen:
-            duplicates.append((room, seat_num, seen[key], (grade, status)))
-        else:
-            seen[key] = (grade, status)
-
+    duplicates = inventory.duplicates
     if duplicates:
         lines.append(f"[!] 좌석 중복 {len(duplicates)}건 발견:")
         for room, seat_num, first, second in duplicates:
@@ -276,13 +290,15 @@ LOCKER_LINE_WIDTH = COL_L_ROOM + 1 + COL_L_LOC + 1 + COL_L_RANGE + 1 + COL_L_QTY
 
 
 def format_locker_row(room, loc, range_str, qty):
-    return (f"{pad(room, COL_L_ROOM)} {pad(loc, COL_L_LOC)} "
-            f"{pad(range_str, COL_L_RANGE)} {pad(qty, COL_L_QTY, 'right')}")
+    row = (f"{pad(room, COL_L_ROOM)} {pad(loc, COL_L_LOC)} "
+           f"{pad(range_str, COL_L_RANGE)} {pad(qty, COL_L_QTY, 'right')}")
+    return row.rstrip()  # 수량이 빈 행(제외 번호)은 뒤 공백 없이
 
 
 def generate_locker_preview(config):
     """config의 locker_mapping을 직관적 텍스트 표로 변환합니다."""
     mapping = config['locker_mapping']
+    out_of_service = config.get('locker_out_of_service', {})
     lines = []
 
     lines.append("=" * LOCKER_LINE_WIDTH)
@@ -296,11 +312,14 @@ def generate_locker_preview(config):
 
     for room, info in mapping.items():
         lockers = info['lockers']
+        room_total = 0
         for i, lk in enumerate(lockers):
             loc = lk['location']
             start = lk['start']
             end = lk['end']
-            capacity = end - start + 1
+            excluded = sorted(set(n for n in out_of_service.get(loc, []) if start <= n <= end))
+            capacity = end - start + 1 - len(excluded)
+            room_total += capacity
             total_capacity += capacity
 
             range_str = f"{start}~{end}번"
@@ -308,9 +327,10 @@ def generate_locker_preview(config):
             room_display = room if i == 0 else "  └ overflow →"
 
             lines.append(format_locker_row(room_display, loc, range_str, qty_str))
+            if excluded:
+                lines.append(format_locker_row("", "", f"(제외 {','.join(map(str, excluded))}번)", ""))
 
         if len(lockers) > 1:
-            room_total = sum(l['end'] - l['start'] + 1 for l in lockers)
             lines.append(format_locker_row("", "", "소계", f"{room_total}개"))
 
     lines.append("-" * LOCKER_LINE_WIDTH)
@@ -326,10 +346,11 @@ def generate_locker_preview(config):
 
 def main():
     config = load_config()
+    inventory = load_seat_inventory(config)  # seatlist.csv는 한 번만 읽음
 
     all_lines = []
-    all_lines += generate_seat_summary(config)
-    all_lines += generate_seat_validation(config)
+    all_lines += generate_seat_summary(config, inventory)
+    all_lines += generate_seat_validation(config, inventory)
     all_lines += generate_locker_preview(config)
 
     output = "\n".join(all_lines)
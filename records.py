@@ -0,0 +1,123 @@
+"""
+학생/좌석 레코드와 코드표
+
+열람실, 좌석타입, 학년/지위 문자열을 config.yaml의 valid_* 목록 순서대로
+작은 정수 코드로 변환(intern)하여 다룹니다. 배정 로직의 비교는 모두 정수 비교이고,
+문자열은 결과 파일을 쓸 때만 코드표로 되돌립니다.
+
+config에 없는 값이 입력에 나오면 목록 뒤에 새 코드를 붙여 그대로 처리합니다
+(유효성 검증은 check_input.py / preview.py의 역할).
+"""
+
+from config import compiled_config
+
+
+class Interner:
+    """문자열 ↔ 정수 코드 변환표. 코드는 등록 순서대로 0, 1, 2, ..."""
+
+    def __init__(self, values=()):
+        self.names = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        """value의 코드를 반환합니다 (처음 보는 값이면 새로 등록)."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.names)
+            self.codes[value] = code
+            self.names.append(value)
+        return code
+
+    def code_set(self, values):
+        return {self.code(v) for v in values}
+
+    def __getitem__(self, code):
+        return self.names[code]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Codebook:
+    """
+    한 번의 실행에서 공유하는 코드표 묶음.
+
+    rooms / seat_types / grades: 각 Interner
+    preferred_seat_type[학년코드]: 우선 배정 좌석타입 코드 (grade_to_seat_type, 없으면 학년명 그대로)
+    laptop_rooms: 노트북 금지 열람실 코드 집합
+    """
+
+    def __init__(self, config):
+        compiled = compiled_config(config)
+        self.rooms = Interner(config.get('valid_rooms', []))
+        self.seat_types = Interner(config.get('valid_seat_types', []))
+        self.grades = Interner()
+        self.grade_map = compiled.grade_to_seat_type
+        self.preferred_seat_type = []
+        for grade in config.get('valid_student_types', []):
+            self.grade(grade)
+        # 코드 등록 순서가 config 순서와 같도록 집합(compiled.laptop_zones) 대신 목록을 씀
+        self.laptop_rooms = self.rooms.code_set(config.get('laptop_not_allowed_zones', []))
+
+    def grade(self, value):
+        """학년/지위 코드를 반환하고, 새 학년이면 우선 좌석타입도 함께 계산해 둡니다."""
+        code = self.grades.code(value)
+        if code == len(self.preferred_seat_type):
+            self.preferred_seat_type.append(
+                self.seat_types.code(self.grade_map.get(value, value)))
+        return code
+
+
+class Student:
+    """
+    설문 응답 1건.
+
+    name, student_id: 이름, 학번 (문자열)
+    grade: 학년 코드, prefs: (1지망, 2지망, 3지망) 열람실 코드
+    seat_type: 우선 배정 좌석타입 코드
+    laptop: 1~3지망 중 노트북 금지 열람실 신청 여부
+    """
+
+    __slots__ = ('name', 'student_id', 'grade', 'prefs', 'seat_type', 'laptop')
+
+    def __init__(self, name, student_id, grade, prefs, codebook):
+        self.name = name
+        self.student_id = student_id
+        self.grade = codebook.grade(grade)
+        self.prefs = tuple(codebook.rooms.code(p) for p in prefs)
+        self.seat_type = codebook.preferred_seat_type[self.grade]
+        self.laptop = any(p in codebook.laptop_rooms for p in self.prefs)
+
+    @property
+    def key(self):
+        """'이름_학번' (학생 dict의 key)"""
+        return f"{self.name}_{self.student_id}"
+
+    @property
+    def short_key(self):
+        """'이름_학번뒤2자리' (결과 파일의 식별자)"""
+        return f"{self.name}_{self.student_id[-2:]}"
+
+
+class Seat:
+    """
+    좌석 1개.
+
+    seat_type: 좌석타입 코드, room: 열람실 코드
+    number: 좌석번호, status: 배치유무 ('open' 등) — 출력에만 쓰이므로 문자열 그대로 보관
+    """
+
+    __slots__ = ('seat_type', 'room', 'number', 'status')
+
+    def __init__(self, row, codebook):
+        self.seat_type = codebook.seat_types.code(row[0])
+        self.room = codebook.rooms.code(row[1])
+        self.number = row[2]
+        self.status = row[3]
+
+    def to_row(self, codebook):
+        """['학년', '열람실', '좌석번호', 'open/closed'] 문자열 행으로 되돌립니다."""
+        return [codebook.seat_types[self.seat_type], codebook.rooms[self.room],
+                self.number, self.status]
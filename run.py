@@ -1,18 +1,107 @@
-import hashlib
+import io
+import os
+import cProfile
 import argparse
 
 import check_input
+import digest
+import instrument
 import seat
 import locker
 from config import load_config
+from records import Codebook
 
 
-def print_file_hash(label, filepath):
-    """파일 경로와 SHA256 해시를 출력합니다 (무결성 검증용)."""
-    print(f"[***]{label} 경로 : {filepath}")
-    with open(filepath, "rb") as f:
-        data = f.read()
-    print(f"[***]{label} 해시(SHA256) : {hashlib.sha256(data).hexdigest()}")
+# 모드별 매니페스트에 기록할 출력 파일 (config paths 키)
+OUTPUT_KEYS = {
+    "normal": ['output_result', 'output_unmatched_students', 'output_unmatched_seats',
+               'output_locker_result', 'output_locker_result_xlsx'],
+    "add": ['output_result_additional', 'output_result', 'output_unmatched_seats',
+            'output_locker_result', 'output_locker_result_xlsx',
+            'output_locker_result_additional', 'output_locker_result_additional_xlsx'],
+}
+
+MANIFEST_KEYS = {"normal": 'output_manifest', "add": 'output_manifest_additional'}
+
+
+def write_manifest(config, mode, input_digests):
+    """
+    입력/출력 파일의 해시 매니페스트를 출력하고 JSON으로 저장합니다 (무결성 검증용).
+
+    입력값(신청자, 좌석)은 메모를 쓰지 않고 다시 읽어 해시한 뒤, 실행 시작 때 읽은 내용의 해시
+    (input_digests: { 'input_students': ..., 'input_seats': ... })와 비교해 실행 중 바뀌지 않았는지 확인합니다.
+    """
+    paths = config['paths']
+    manifest = digest.Manifest()
+    for key in ('input_students', 'input_seats'):
+        manifest.add('input', key, paths[key], fresh=True)
+    for key in OUTPUT_KEYS[mode]:
+        manifest.add('output', key, paths[key])
+
+    manifest.print()
+    current = {e['name']: e['sha256'] for e in manifest.entries if e['kind'] == 'input'}
+    unchanged = all(current.get(key) == value for key, value in input_digests.items())
+    if unchanged:
+        print("[***]입력값 불변 확인 : OK")
+    else:
+        print("[!] 입력값 불변 확인 : 실행 중 입력 파일이 바뀌었습니다!")
+
+    manifest_path = paths.get(MANIFEST_KEYS[mode])
+    if manifest_path:
+        manifest.save(manifest_path, mode=mode, input_unchanged=unchanged)
+        print(f"[+] 해시 매니페스트 저장 경로: {manifest_path}")
+
+
+def read_lines(data):
+    """파일 내용(bytes)을 텍스트 모드로 연 파일의 readlines()와 같은 줄 목록으로 변환합니다 (BOM 제거)."""
+    return io.StringIO(data.decode("utf-8-sig"), newline=None).readlines()
+
+
+def main(config, mode="normal", expected=None):
+    """
+    입력 검증 → 좌석 배정 → 사물함 배정 전체 흐름을 실행합니다.
+
+    config와 입력 파일(신청자, 좌석)은 여기서 한 번만 읽고, 파싱한 결과를 각 단계에 넘깁니다.
+    좌석 배정 결과도 메모리로 사물함 배정에 넘기며, 파일은 출력으로만 씁니다.
+    입력/출력 파일의 해시는 마지막에 매니페스트 하나로 모아 출력합니다 (write_manifest).
+    """
+    paths = config['paths']
+
+    with instrument.section('load'):
+        # 읽은 내용으로 해시를 계산해 두면 시드 계산에서 파일을 다시 읽지 않음
+        student_data, student_digest = digest.read_file(paths['input_students'])
+        seat_data, seat_digest = digest.read_file(paths['input_seats'])
+        input_digests = {'input_students': student_digest, 'input_seats': seat_digest}
+        student_lines = read_lines(student_data)
+        seat_lines = read_lines(seat_data)
+
+    # 입력 데이터 검증
+    with instrument.section('check_input'):
+        check_input.main(config, student_lines, seat_lines)
+
+    # 좌석 배정 (파싱은 검증 통과 후)
+    with instrument.section('seat'):
+        codebook = Codebook(config)
+        students = seat.parse_students(student_lines, codebook)
+        if mode == "normal":
+            seatlist_all = seat.parse_seats(seat_lines, codebook)
+            seat_rows = seat.main(config, codebook, students, seatlist_all)
+        else:
+            seat_rows = seat.main_additional(
+                paths['input_students'],
+                paths['output_result'],
+                paths['output_unmatched_seats'],
+                expected=expected,
+                config=config, codebook=codebook, students=students,
+                seed=digest.seed_from_digest(student_digest))
+
+    # 사물함 배정
+    with instrument.section('locker'):
+        locker.main(mode=mode, config=config, students=seat_rows)
+
+    # 입력/출력 해시 매니페스트
+    with instrument.section('manifest'):
+        write_manifest(config, mode, input_digests)
 
 
 if __name__ == "__main__":
@@ -21,33 +110,28 @@ if __name__ == "__main__":
                         help="normal: 전체 배정 / add: 추가 배정")
     parser.add_argument("--expected", type=int,
                         help="추가된 데이터 개수 검증용")
+    parser.add_argument("--profile", nargs="?", const="json", choices=["json", "cprofile"],
+                        help="json: 단계별 시간/카운터 리포트 (output/profile.json) / "
+                             "cprofile: cProfile 덤프 (output/profile.prof)")
     args = parser.parse_args()
 
     config = load_config()
-    paths = config['paths']
     mode = args.mode or "normal"
+    output_dir = os.path.dirname(config['paths']['output_result'])
 
-    # 입력값 해시 출력
-    print_file_hash("입력값", paths['input_students'])
-
-    # 입력 데이터 검증
-    check_input.main(config)
-
-    # 좌석 배정
-    if mode == "normal":
-        seat.main()
+    if args.profile == "json":
+        profiler = instrument.Profiler()
+        with instrument.profiling(profiler), instrument.section('run', mode=mode):
+            main(config, mode, args.expected)
+        profile_path = os.path.join(output_dir, "profile.json")
+        profiler.save(profile_path)
+        profiler.print_summary()
+        print(f"[+] 계측 리포트 저장 경로: {profile_path}")
+    elif args.profile == "cprofile":
+        profile_path = os.path.join(output_dir, "profile.prof")
+        profiler = cProfile.Profile()
+        profiler.runcall(main, config, mode, args.expected)
+        profiler.dump_stats(profile_path)
+        print(f"[+] cProfile 덤프 저장 경로: {profile_path} (python -m pstats {profile_path})")
     else:
-        seat.main_additional(
-            paths['input_students'],
-            paths['output_result'],
-            paths['output_unmatched_seats'],
-            expected=args.expected)
-
-    # 사물함 배정
-    locker.main(mode=mode)
-
-    # 불변 검증용 입력값 해시 재출력
-    print_file_hash("입력값", paths['input_students'])
-
-    # 출력값 해시 출력
-    print_file_hash("출력값", paths['output_locker_result'])
+        main(config, mode, args.expected)
@@ -12,137 +12,146 @@ config.yaml에 정의된 단계(phases)에 따라 학생들을 좌석에 배정
   3. 결과를 CSV 파일로 저장
 """
 
+import contextlib
 import csv
 import random
 import argparse
-import hashlib
+from collections import defaultdict
 
+import digest
+import instrument
+from components import ComponentRunner
 from config import load_config
+from ledger import open_ledger
+from optimal import allocate_optimal
+from records import Codebook, Student, Seat
+from seat_pool import SeatPool
 
 
 # ============================================================
 # CSV 로드 함수
 # ============================================================
 
-def load_students(filename):
+def load_students(filename, codebook):
     """
     설문 응답 CSV를 읽어 학생 딕셔너리를 반환합니다.
 
     입력 CSV 형식: 타임스탬프, 이메일, 이름, 학번, 학년, 1지망, 2지망, 3지망
-    반환값: { '이름_학번': ['학년', '1지망', '2지망', '3지망'] }
+    반환값: { '이름_학번': Student } (학년/지망 열람실은 codebook의 정수 코드)
     """
     with open(filename, mode='rt', encoding='UTF-8') as file:
-        reader = csv.reader(file)
-        next(reader)  # 헤더 건너뛰기
-        students = {}
-        for row in reader:
-            row.pop(0)  # 타임스탬프 제거
-            row.pop(0)  # 이메일 제거
-            key = row.pop(0) + "_" + row.pop(0)  # 이름_학번
-            if len(key) > 1:  # 빈 행 방어
-                students[key] = row  # ['학년', '1지망', '2지망', '3지망']
+        return parse_students(file, codebook)
+
+
+def parse_students(lines, codebook):
+    """헤더를 포함한 설문 응답 CSV 텍스트 줄들을 학생 딕셔너리로 변환합니다 (load_students 참조)."""
+    reader = csv.reader(lines)
+    next(reader)  # 헤더 건너뛰기
+    students = {}
+    for row in reader:
+        # 타임스탬프, 이메일은 사용하지 않음
+        name, student_id = row[2], row[3]
+        key = name + "_" + student_id  # 이름_학번
+        if len(key) > 1:  # 빈 행 방어
+            students[key] = Student(name, student_id, row[4], row[5:8], codebook)
     return students
 
 
-def load_seats(filename):
+def load_seats(filename, codebook):
     """
     좌석 목록 CSV를 읽어 좌석 리스트를 반환합니다.
 
-    반환값: [ ['학년', '열람실', '좌석번호', 'open/closed'], ... ]
+    CSV 형식: 학년(좌석타입), 열람실, 좌석번호, open/closed
+    반환값: [ Seat, ... ]
     """
     with open(filename, mode='rt', encoding='UTF-8') as file:
-        reader = csv.reader(file)
-        next(reader)  # 헤더 건너뛰기
-        return [row for row in reader if len(row) > 1]
+        return parse_seats(file, codebook)
+
+
+def parse_seats(lines, codebook):
+    """헤더를 포함한 좌석 목록 CSV 텍스트 줄들을 좌석 리스트로 변환합니다 (load_seats 참조)."""
+    reader = csv.reader(lines)
+    next(reader)  # 헤더 건너뛰기
+    return [Seat(row, codebook) for row in reader if len(row) > 1]
 
 
 # ============================================================
 # 배정 핵심 로직
 # ============================================================
 
-def get_preferred_seat_type(student_grade, grade_map):
-    """
-    학년에 따라 우선 배정할 좌석 타입을 반환합니다.
-    예: '1학년' → '2학년' 좌석 우선, '3학년' → '3학년' 좌석 우선
-    매핑에 없는 학년은 그대로 반환합니다.
-    """
-    return grade_map.get(student_grade, student_grade)
-
-
-def allocate_by_preference(students, seatlist, target_grades, target_seat_types, grade_map):
+def allocate_by_preference(students, pool, target_grades, target_seat_types):
     """
     지망(1지망→2지망→3지망) 순서로 학생을 좌석에 매칭합니다.
 
     동작 방식:
-      1. target_grades에 해당하는 학생만 대상으로 선별 (빈 리스트면 전체)
+      1. target_grades에 해당하는 학생만 대상으로 선별 (빈 집합이면 전체)
       2. 1지망부터 3지망까지 순서대로:
          - 학생 순서를 랜덤 셔플 (공정성)
          - 각 학생의 N지망 열람실에서 빈 좌석을 찾음
          - 학년에 맞는 좌석 타입을 우선 배정, 없으면 다른 타입이라도 배정
-      3. 배정된 학생과 좌석은 원본 리스트에서 제거됨 (in-place)
+      3. 배정된 학생은 students에서, 좌석은 pool에서 제거됨 (in-place)
 
     Args:
         students: 전체 학생 dict (배정되면 제거됨)
-        seatlist: 전체 좌석 list (배정되면 제거됨)
-        target_grades: 이 단계에서 배정할 학년 리스트 (예: ['3학년', '수료생'])
-        target_seat_types: 이 단계에서 사용할 좌석 타입 리스트 (예: ['3학년'])
-        grade_map: 학년→좌석타입 매핑 (config에서 로드)
+        pool: 좌석 풀 SeatPool (배정되면 제거됨)
+        target_grades: 이 단계에서 배정할 학년 코드 집합 (예: {3학년, 수료생})
+        target_seat_types: 이 단계에서 사용할 좌석 타입 코드 집합 (예: {3학년})
 
-    Returns: { '이름_학번': ['학년', '열람실', '좌석번호', 'open', '1지망배정여부(O/X)'], ... }
+    Returns: { '이름_학번': (Student, Seat, 배정된 지망 순위 1~3) }
     """
     result = {}
 
     # 배정 대상 학생 선별
     if target_grades:
-        candidates = {k: v for k, v in students.items() if v[0] in target_grades}
+        candidates = {k: v for k, v in students.items() if v.grade in target_grades}
     else:
         candidates = students.copy()
 
-    def process_preference(pref_idx):
-        """pref_idx번째 지망(1~3)에 대해 매칭 처리"""
+    def process_preference(pref_idx, sec):
+        """pref_idx번째 지망(1~3)에 대해 매칭 처리 (sec: 계측 구간, 꺼져 있으면 None)"""
         candidate_keys = list(candidates.keys())
         random.shuffle(candidate_keys)
 
         for student_key in candidate_keys:
-            student_grade = candidates[student_key][0]
-            preferred_type = get_preferred_seat_type(student_grade, grade_map)
-            preferred_room = candidates[student_key][pref_idx]
-
-            # 지망 열람실 내 좌석을 학년 우선/비우선으로 분류
-            seats_preferred = []  # 학년 타입이 맞는 좌석
-            seats_other = []     # 학년 타입이 다른 좌석
-            for seat in seatlist:
-                if target_seat_types and seat[0] not in target_seat_types:
-                    continue
-                if seat[1] == preferred_room:
-                    if seat[0] == preferred_type:
-                        seats_preferred.append(seat)
-                    else:
-                        seats_other.append(seat)
+            student = candidates[student_key]
+            preferred_type = student.seat_type
+            preferred_room = student.prefs[pref_idx - 1]
+
+            # 지망 열람실 내 좌석 버킷을 학년 우선/비우선으로 분류
+            room_types = [t for t in pool.room_types.get(preferred_room, [])
+                          if not target_seat_types or t in target_seat_types]
+            seats_preferred = pool.room_type_buckets(
+                [(preferred_room, t) for t in room_types if t == preferred_type])
+            seats_other = pool.room_type_buckets(
+                [(preferred_room, t) for t in room_types if t != preferred_type])
+
+            if sec is not None:
+                scanned = sum(map(len, seats_preferred)) or sum(map(len, seats_other))
+                sec.count('candidates')
+                sec.count('seats_scanned', scanned)
+                sec.observe('pool_size', pool.size)
 
             # 우선 타입 좌석이 있으면 그 중에서 랜덤 배정, 없으면 비우선 좌석에서 배정
-            chosen_seat = None
-            if seats_preferred:
-                chosen_seat = random.choice(seats_preferred)
-            elif seats_other:
-                chosen_seat = random.choice(seats_other)
-
-            if chosen_seat:
-                # 1지망 배정 여부 태그 추가 (pref_idx==1이면 O, 아니면 X)
-                first_pref = 'O' if pref_idx == 1 else 'X'
-                result[student_key] = chosen_seat + [first_pref]
-                seatlist.remove(chosen_seat)
+            seat_id = pool.draw(seats_preferred)
+            if seat_id is None:
+                seat_id = pool.draw(seats_other)
+
+            if seat_id is not None:
+                result[student_key] = (student, pool.seats[seat_id], pref_idx)
                 students.pop(student_key)
                 candidates.pop(student_key)
+                if sec is not None:
+                    sec.count('assigned')
 
     # 1지망 → 2지망 → 3지망 순서로 처리
     for pref_idx in [1, 2, 3]:
-        process_preference(pref_idx)
+        with instrument.section('round', pref=pref_idx) as sec:
+            process_preference(pref_idx, sec)
 
     return result
 
 
-def allocate_remaining(students, seatlist, grade_map, laptop_zones):
+def allocate_remaining(students, pool):
     """
     지망에 매칭되지 못한 학생을 남은 좌석에 랜덤 배정합니다.
 
@@ -151,74 +160,61 @@ def allocate_remaining(students, seatlist, grade_map, laptop_zones):
          그 외 학생 → 허용 열람실 좌석 우선
       2. 학년에 맞는 좌석 타입을 우선 배정
 
+    후보 좌석은 pool의 (좌석타입, 노트북금지여부) 인덱스에서 바로 얻으며,
+    노트북 금지 열람실 신청 여부는 로드 시 계산해 둔 Student.laptop을 사용합니다.
+
     Args:
         students: 미배정 학생 dict (배정되면 제거됨)
-        seatlist: 잔여 좌석 list (배정되면 제거됨)
-        grade_map: 학년→좌석타입 매핑
-        laptop_zones: 노트북 금지 열람실 리스트
+        pool: 잔여 좌석 풀 SeatPool (배정되면 제거됨)
+
+    Returns: { '이름_학번': (Student, Seat, 0) } (잔여 배정은 지망 순위 0)
     """
     result = {}
     student_keys = list(students.keys())
     random.shuffle(student_keys)
 
-    laptop_zones_set = set(laptop_zones)
-
-    for student_key in student_keys:
-        student_data = students[student_key]
-        student_grade = student_data[0]
-        preferred_type = get_preferred_seat_type(student_grade, grade_map)
-
-        # 이 학생이 1~3지망 중 노트북 금지 열람실을 신청했는지 확인
-        applied_laptop_zone = any(
-            student_data[i] in laptop_zones_set for i in (1, 2, 3)
-        )
-
-        # 좌석 분류
-        #   - 금지 열람실 신청자 → 허용/금지 구분 없이 학년 매칭만 우선
-        #   - 그 외 학생      → 허용 좌석 우선, 금지 좌석 후순위
-        if applied_laptop_zone:
-            # 금지 열람실 신청자: 학년 매칭만 고려
-            seats_matched = []
-            seats_other = []
-            for seat in seatlist:
-                if seat[0] == preferred_type:
-                    seats_matched.append(seat)
-                else:
-                    seats_other.append(seat)
-            pools = (seats_matched, seats_other)
-        else:
-            # 비신청자: 허용 좌석 우선 + 학년 매칭 우선
-            seats_allowed_matched = []    # 허용 + 학년 매칭
-            seats_allowed_other = []      # 허용 + 학년 미매칭
-            seats_banned_matched = []     # 금지 + 학년 매칭
-            seats_banned_other = []       # 금지 + 학년 미매칭
-            for seat in seatlist:
-                is_banned = seat[1] in laptop_zones_set
-                is_grade_match = seat[0] == preferred_type
-                if not is_banned and is_grade_match:
-                    seats_allowed_matched.append(seat)
-                elif not is_banned:
-                    seats_allowed_other.append(seat)
-                elif is_grade_match:
-                    seats_banned_matched.append(seat)
-                else:
-                    seats_banned_other.append(seat)
-            pools = (seats_allowed_matched, seats_allowed_other,
-                     seats_banned_matched, seats_banned_other)
-
-        chosen_seat = None
-        for pool in pools:
-            if pool:
-                chosen_seat = random.choice(pool)
-                break
-        if chosen_seat is None and seatlist:
-            chosen_seat = random.choice(seatlist)
-
-        if chosen_seat:
-            # 잔여 배정은 1지망 배정이 아니므로 X
-            result[student_key] = chosen_seat + ['X']
-            seatlist.remove(chosen_seat)
-            students.pop(student_key)
+    with instrument.section('round', pref=0) as sec:
+        for student_key in student_keys:
+            student = students[student_key]
+            matched = [student.seat_type]
+            others = [t for t in pool.seat_types if t != student.seat_type]
+
+            # 좌석 분류
+            #   - 금지 열람실 신청자 → 허용/금지 구분 없이 학년 매칭만 우선
+            #   - 그 외 학생      → 허용 좌석 우선, 금지 좌석 후순위
+            if student.laptop:
+                # 금지 열람실 신청자: 학년 매칭만 고려
+                pools = (pool.type_zone_buckets(matched, False) + pool.type_zone_buckets(matched, True),
+                         pool.type_zone_buckets(others, False) + pool.type_zone_buckets(others, True))
+            else:
+                # 비신청자: 허용 좌석 우선 + 학년 매칭 우선
+                pools = (pool.type_zone_buckets(matched, False),    # 허용 + 학년 매칭
+                         pool.type_zone_buckets(others, False),     # 허용 + 학년 미매칭
+                         pool.type_zone_buckets(matched, True),     # 금지 + 학년 매칭
+                         pool.type_zone_buckets(others, True))      # 금지 + 학년 미매칭
+
+            if sec is not None:
+                # 실제로 추첨이 일어나는 첫 번째 비어있지 않은 후보군의 크기
+                scanned = 0
+                for candidate_buckets in pools:
+                    scanned = sum(map(len, candidate_buckets))
+                    if scanned:
+                        break
+                sec.count('candidates')
+                sec.count('seats_scanned', scanned)
+                sec.observe('pool_size', pool.size)
+
+            seat_id = None
+            for candidate_buckets in pools:
+                seat_id = pool.draw(candidate_buckets)
+                if seat_id is not None:
+                    break
+
+            if seat_id is not None:
+                result[student_key] = (student, pool.seats[seat_id], 0)
+                students.pop(student_key)
+                if sec is not None:
+                    sec.count('assigned')
 
     return result
 
@@ -227,38 +223,116 @@ def allocate_remaining(students, seatlist, grade_map, laptop_zones):
 # 배정 실행 (config 기반)
 # ============================================================
 
-def run_allocation(students, seatlist, config, phases=None):
+def run_allocation(students, seatlist, config, codebook, phases=None, pool_mode=None, jobs=None,
+                   engine=None):
     """
     config의 phases에 따라 배정 단계를 순서대로 실행합니다.
 
     students와 seatlist는 in-place로 수정됩니다 (배정된 항목이 제거됨).
+    모든 단계는 seatlist로 만든 하나의 SeatPool을 공유하고, 마지막에 남은 좌석을
+    원래 순서대로 seatlist에 반영합니다. seatlist 자리에 SeatPool을 넘기면 그 풀을 그대로 갱신합니다.
     phases를 지정하면 해당 단계만 실행합니다 (추가 배정 시 사용).
+    pool_mode를 지정하지 않으면 config의 seat_pool_mode를 따릅니다 (기본 compat).
+    codebook은 students/seatlist를 로드할 때 사용한 코드표여야 합니다.
+    jobs(지정하지 않으면 config의 allocation_jobs, 기본 1)가 2 이상이면 지망 매칭 phase를
+    독립 열람실 묶음별로 병렬 배정합니다 (components.py, 대상 학생이 많은 phase만, 결과는 직렬 배정과 다름).
+    engine(지정하지 않으면 config의 allocation_engine, 기본 "lottery")이 "optimal"이면
+    phase 순차 추첨 대신 같은 규칙 안의 최적 배정을 구합니다 (optimal.py).
+
+    Returns: { '이름_학번': (Student, Seat, 지망 순위) } (지망 순위 1~3, 잔여석 배정은 0)
     """
     if phases is None:
         phases = config['phases']
+    if jobs is None:
+        jobs = config.get('allocation_jobs', 1)
+    if engine is None:
+        engine = config.get('allocation_engine', 'lottery')
+
+    if isinstance(seatlist, SeatPool):
+        pool = seatlist
+    else:
+        pool = SeatPool(seatlist, mode=pool_mode or config.get('seat_pool_mode', 'compat'),
+                        laptop_rooms=codebook.laptop_rooms)
 
-    grade_map = config['grade_to_seat_type']
-    laptop_zones = config['laptop_not_allowed_zones']
+    if engine == 'optimal':
+        result_total = allocate_optimal(students, pool, phases, codebook)
+        if pool is not seatlist:
+            seatlist[:] = pool.remaining_seats()
+        return result_total
 
     result_total = {}
-    for phase in phases:
-        if phase['type'] == 'preference':
-            result = allocate_by_preference(
-                students, seatlist,
-                phase.get('student_types', []),
-                phase.get('seat_types', []),
-                grade_map)
-        elif phase['type'] == 'unmatched':
-            result = allocate_remaining(
-                students, seatlist,
-                grade_map, laptop_zones)
-        else:
-            raise ValueError(f"[!] 알 수 없는 phase type: {phase['type']}")
-        result_total.update(result)
+    with ComponentRunner(jobs) if jobs > 1 else contextlib.nullcontext() as runner:
+        for phase in phases:
+            with instrument.section('phase', phase=phase['name']) as sec:
+                if sec is not None:
+                    sec.fields.update(students_before=len(students), pool_before=pool.size)
+                if phase['type'] == 'preference':
+                    target_grades = {codebook.grade(g) for g in phase.get('student_types', [])}
+                    target_seat_types = codebook.seat_types.code_set(phase.get('seat_types', []))
+                    result = None
+                    if runner is not None:
+                        result = runner.allocate(students, pool, target_grades, target_seat_types, codebook, sec)
+                    if result is None:
+                        result = allocate_by_preference(students, pool, target_grades, target_seat_types)
+                elif phase['type'] == 'unmatched':
+                    result = allocate_remaining(students, pool)
+                else:
+                    raise ValueError(f"[!] 알 수 없는 phase type: {phase['type']}")
+                if sec is not None:
+                    sec.count('assigned', len(result))
+            result_total.update(result)
+
+    if pool is not seatlist:
+        seatlist[:] = pool.remaining_seats()
 
     return result_total
 
 
+class AllocationContext:
+    """
+    같은 입력으로 배정을 반복 실행하기 위한 컨텍스트 (시뮬레이션 등).
+
+    입력 파일은 생성 시 한 번만 읽고, 열람실별 open 좌석 수(room_total)도 미리 집계합니다.
+    run()은 학생 dict의 얕은 복사본(레코드는 불변)과 reset()한 SeatPool로 배정하므로
+    매 회차에 CSV를 다시 파싱하거나 좌석 인덱스를 재구축하지 않습니다.
+    student_lines/seat_lines(헤더 포함 CSV 줄)를 주면 파일 대신 그 내용을 씁니다 (simulate.py --sweep).
+    """
+
+    def __init__(self, config, pool_mode='fast', student_lines=None, seat_lines=None):
+        paths = config['paths']
+        self.config = config
+        self.codebook = Codebook(config)
+        if student_lines is None:
+            self.students = load_students(paths['input_students'], self.codebook)
+        else:
+            self.students = parse_students(student_lines, self.codebook)
+        if seat_lines is None:
+            seats = load_seats(paths['input_seats'], self.codebook)
+        else:
+            seats = parse_seats(seat_lines, self.codebook)
+        self.seats = [s for s in seats if s.status == 'open']
+        self.pool = SeatPool(self.seats, mode=pool_mode, laptop_rooms=self.codebook.laptop_rooms)
+
+        # 열람실코드 → open 좌석 수
+        self.room_total = defaultdict(int)
+        for seat in self.seats:
+            self.room_total[seat.room] += 1
+
+    def run(self, seed, phases=None, engine='lottery'):
+        """
+        seed로 1회 배정을 실행합니다. 컨텍스트의 학생/좌석 원본은 바뀌지 않습니다.
+        engine은 run_allocation과 같습니다 (시뮬레이션은 config와 관계없이 추첨 기준).
+
+        Returns: run_allocation 결과
+        """
+        self.pool.reset()
+        students = dict(self.students)
+        random.seed(seed)
+        # 회차 단위로 이미 병렬화하므로(simulate.py --jobs) 묶음 병렬 배정은 쓰지 않음
+        return run_allocation(students, self.pool, self.config, self.codebook, phases=phases, jobs=1,
+                              engine=engine)
+
+
 # ============================================================
 # 결과 CSV 저장 유틸리티
 # ============================================================
@@ -269,131 +343,194 @@ def get_seed_from_file(filename):
 
     [2025.8.] 추가 배정 시 생방송 진행하는 대신 input file 기반 시드 고정.
     동일한 입력 파일이면 항상 동일한 시드가 생성되어 결과 재현 가능.
+    파일은 나눠 읽으며 해시하고, 한 번의 실행 안에서 같은 파일의 해시는 다시 계산하지 않습니다 (digest.py).
     """
-    with open(filename, 'rb') as f:
-        content = f.read()
-    return int(hashlib.sha256(content).hexdigest(), 16) % (2**32)
+    return digest.seed_from_digest(digest.file_sha256(filename))
+
+
+def result_rows(result, codebook):
+    """배정 결과를 [이름, 학번뒤2자리, 열람실, 좌석번호, 1지망배정여부] 행으로 반환합니다."""
+    rooms = codebook.rooms
+    for student, seat, pref_rank in result.values():
+        student_id = student.student_id[-2:]  # 가명처리: 뒷 2자리만
+        first_pref = 'O' if pref_rank == 1 else 'X'  # 1지망 배정 여부
+        yield [student.name, student_id, rooms[seat.room], seat.number, first_pref]
 
 
-def write_result_csv(filepath, result, mode='wt'):
+def write_result_csv(filepath, result, codebook, mode='wt'):
     """배정 결과를 CSV로 저장합니다. mode='at'이면 기존 파일에 추가합니다."""
     with open(filepath, mode=mode, encoding='UTF-8') as file:
         if mode == 'wt':
             file.write("이름,학번뒤2자리,열람실,좌석번호,1지망배정여부\n")
-        for key, value in result.items():
-            name = key.split("_")[0]
-            student_id = key.split("_")[1][-2:]  # 가명처리: 뒷 2자리만
-            first_pref = value[4]  # 'O' 또는 'X'
-            file.write(f"{name},{student_id},{value[1]},{value[2]},{first_pref}\n")
+        for row in result_rows(result, codebook):
+            file.write(",".join(row) + "\n")
 
 
 # ============================================================
 # 메인 실행
 # ============================================================
 
-def main():
-    """전체 배정을 실행합니다."""
-    config = load_config()
+def main(config=None, codebook=None, students=None, seatlist_all=None):
+    """
+    전체 배정을 실행합니다.
+
+    run.py 파이프라인은 이미 읽어 둔 config/코드표/학생/좌석을 넘기며,
+    넘기지 않은 항목은 파일에서 읽습니다 (students, seatlist_all은 codebook으로 만든 것이어야 함).
+
+    Returns: 배정 결과 행 목록 [이름, 학번뒤2자리, 열람실, 좌석번호, 1지망배정여부] (seat_result.csv와 같은 순서)
+    """
+    if config is None:
+        config = load_config()
     paths = config['paths']
+    if codebook is None:
+        codebook = Codebook(config)
 
-    students = load_students(paths['input_students'])
-    seatlist_all = load_seats(paths['input_seats'])
+    with instrument.section('load'):
+        if students is None:
+            students = load_students(paths['input_students'], codebook)
+        if seatlist_all is None:
+            seatlist_all = load_seats(paths['input_seats'], codebook)
 
     # open 좌석만 배정 대상, closed는 잔여석 출력용으로 보관
-    seatlist_open = [s for s in seatlist_all if s[3] == 'open']
-    seatlist_closed = [s for s in seatlist_all if s[3] != 'open']
+    seatlist_open = [s for s in seatlist_all if s.status == 'open']
+    seatlist_closed = [s for s in seatlist_all if s.status != 'open']
 
-    result = run_allocation(students, seatlist_open, config)
+    with instrument.section('run_allocation'):
+        result = run_allocation(students, seatlist_open, config, codebook)
     print(f"[+]미배정된 학생 수: {len(students)}")
     print(f"[+]잔여 좌석 수: {len(seatlist_open)}")
 
     # 배정 결과 저장
-    write_result_csv(paths['output_result'], result)
+    rows = list(result_rows(result, codebook))
+    with instrument.section('write_result'):
+        write_result_csv(paths['output_result'], result, codebook)
     print(f"[+]배치결과 저장 경로: {paths['output_result']}")
 
     # 미배정 학생 저장
     with open(paths['output_unmatched_students'], mode='wt', encoding='UTF-8') as file:
         file.write("이름_학번,학년,1지망,2지망,3지망\n")
-        for key, value in students.items():
-            file.write(f"{key},{value[0]},{value[1]},{value[2]},{value[3]}\n")
+        for key, student in students.items():
+            prefs = ",".join(codebook.rooms[p] for p in student.prefs)
+            file.write(f"{key},{codebook.grades[student.grade]},{prefs}\n")
     print(f"[+]남은 학생 리스트 저장 경로: {paths['output_unmatched_students']}")
 
     # 잔여 좌석 저장
+    remaining_rows = [seat.to_row(codebook) for seat in seatlist_open + seatlist_closed]
     with open(paths['output_unmatched_seats'], mode='wt', encoding='UTF-8') as file:
-        for seat in seatlist_open + seatlist_closed:
-            file.write(f"{seat[0]},{seat[1]},{seat[2]},{seat[3]}\n")
+        for row in remaining_rows:
+            file.write(",".join(row) + "\n")
     print(f"[+]남은 좌석 리스트 저장 경로: {paths['output_unmatched_seats']}")
 
+    # 배정 원장 기록 (config의 ledger 지정 시)
+    ledger = open_ledger(config)
+    if ledger is not None:
+        with ledger:
+            ledger.reset_seats(rows, remaining_rows)
+        print(f"[+]배정 원장 기록: {ledger.path}")
 
-def main_additional(infile_std, infile_result, infile_seat_unmatched, expected=None):
-    """추가 배정을 실행합니다 (기한 후 신청자용)."""
-    config = load_config()
-    paths = config['paths']
+    return rows
+
+
+def main_additional(infile_std, infile_result, infile_seat_unmatched, expected=None,
+                    config=None, codebook=None, students=None, seed=None):
+    """
+    추가 배정을 실행합니다 (기한 후 신청자용).
 
-    # 전체 학생 목록 로드
-    students = load_students(infile_std)
-
-    # 이미 배정된 학생 목록 로드
-    assigned = set()
-    with open(infile_result, mode='rt', encoding='UTF-8') as file:
-        next(file)  # header skip
-        for line in file:
-            parts = line.strip().split(",")
-            if len(parts) >= 2:
-                assigned.add(parts[0] + "_" + parts[1])  # 이름_학번뒤2자리
-
-    # 미배정 학생만 추출 (학번 뒷 2자리로 비교)
-    unassigned = {
-        k: v for k, v in students.items()
-        if (k.split("_")[0] + "_" + k.split("_")[1][-2:]) not in assigned
-    }
-
-    # 예상 인원 검증
-    if expected is not None and expected != len(unassigned):
-        raise ValueError(f"[!] 예상 추가 배정자 수 {expected}명과 실제 {len(unassigned)}명이 다릅니다.")
-
-    # 잔여 좌석 로드
-    seatlist_open = []
-    with open(infile_seat_unmatched, mode='rt', encoding='UTF-8') as file:
-        next(file)
-        for row in csv.reader(file):
-            if row[3] == 'open':
-                seatlist_open.append(row)
-
-    # [2025.8.] 추가 배정: 입력 파일 해시 기반 시드 → 동일 입력이면 동일 결과 보장
-    random.seed(get_seed_from_file(infile_std))
-
-    # config에서 지정된 추가 배정 단계만 실행
-    add_phases = [config['phases'][i] for i in config['add_mode_phase_indices']]
-    result_additional = run_allocation(unassigned, seatlist_open, config, phases=add_phases)
-
-    # 로그 출력
-    print("[+] 추가 배정 결과:")
-    for key, seat in result_additional.items():
-        print(f" - {key}: {seat[1]} {seat[2]}번")
-
-    # 추가 배정 결과 저장
-    write_result_csv(paths['output_result_additional'], result_additional)
-    print(f"[+] 추가 배치결과 저장 경로: {paths['output_result_additional']}")
-
-    # 기존 seat_result.csv에도 추가
-    write_result_csv(paths['output_result'], result_additional, mode='at')
-    print("[+] seat_result.csv 갱신 완료")
-
-    # 잔여 좌석 파일 업데이트 (배정된 좌석 제거)
-    updated_seats = []
-    with open(paths['output_unmatched_seats'], mode='rt', encoding='UTF-8') as file:
-        for row in csv.reader(file):
-            updated_seats.append(row)
-
-    allocated_keys = {(v[1], v[2]) for v in result_additional.values()}
-    updated_seats = [s for s in updated_seats if (s[1], s[2]) not in allocated_keys]
-
-    with open(paths['output_unmatched_seats'], mode='wt', encoding='UTF-8', newline='') as file:
-        writer = csv.writer(file)
-        for s in updated_seats:
-            writer.writerow(s)
-    print("[+] seat_unmatched_seat.csv 갱신 완료")
+    config의 ledger가 지정되어 있으면 배정 여부/잔여 좌석을 원장에서 조회하고,
+    결과를 원장에 기록한 뒤 잔여 좌석 파일을 원장에서 내보냅니다 (출력 파일은 동일).
+    run.py 파이프라인은 이미 읽어 둔 config/코드표/학생과 infile_std 내용으로 계산한 시드를 넘깁니다.
+
+    Returns: 추가 배정 결과 행 목록 (seat_result_additional.csv와 같은 순서)
+    """
+    if config is None:
+        config = load_config()
+    paths = config['paths']
+    if codebook is None:
+        codebook = Codebook(config)
+    ledger = open_ledger(config)
+
+    try:
+        # 전체 학생 목록 로드
+        if students is None:
+            students = load_students(infile_std, codebook)
+
+        if ledger is not None:
+            ledger.import_files(paths)
+            # 미배정 학생만 추출 (이름_학번뒤2자리 인덱스 조회)
+            unassigned = {k: v for k, v in students.items() if not ledger.is_assigned(v.short_key)}
+            # 잔여 좌석: 파일 모드와 같은 결과를 위해 첫 행은 제외
+            # (파일 모드는 seat_unmatched_seat.csv의 첫 행을 헤더로 보고 건너뜀)
+            remaining_rows = ledger.remaining_seats()[1:]
+        else:
+            # 이미 배정된 학생 목록 로드
+            assigned = set()
+            with open(infile_result, mode='rt', encoding='UTF-8') as file:
+                next(file)  # header skip
+                for line in file:
+                    parts = line.strip().split(",")
+                    if len(parts) >= 2:
+                        assigned.add(parts[0] + "_" + parts[1])  # 이름_학번뒤2자리
+
+            # 미배정 학생만 추출 (학번 뒷 2자리로 비교)
+            unassigned = {k: v for k, v in students.items() if v.short_key not in assigned}
+
+            # 잔여 좌석 로드
+            with open(infile_seat_unmatched, mode='rt', encoding='UTF-8') as file:
+                next(file)
+                remaining_rows = list(csv.reader(file))
+
+        # 예상 인원 검증
+        if expected is not None and expected != len(unassigned):
+            raise ValueError(f"[!] 예상 추가 배정자 수 {expected}명과 실제 {len(unassigned)}명이 다릅니다.")
+
+        seatlist_open = [Seat(row, codebook) for row in remaining_rows if row[3] == 'open']
+
+        # [2025.8.] 추가 배정: 입력 파일 해시 기반 시드 → 동일 입력이면 동일 결과 보장
+        random.seed(get_seed_from_file(infile_std) if seed is None else seed)
+
+        # config에서 지정된 추가 배정 단계만 실행
+        add_phases = [config['phases'][i] for i in config['add_mode_phase_indices']]
+        with instrument.section('run_allocation'):
+            result_additional = run_allocation(unassigned, seatlist_open, config, codebook, phases=add_phases)
+
+        # 로그 출력
+        print("[+] 추가 배정 결과:")
+        for key, (_, seat, _) in result_additional.items():
+            print(f" - {key}: {codebook.rooms[seat.room]} {seat.number}번")
+
+        # 추가 배정 결과 저장
+        write_result_csv(paths['output_result_additional'], result_additional, codebook)
+        print(f"[+] 추가 배치결과 저장 경로: {paths['output_result_additional']}")
+
+        # 기존 seat_result.csv에도 추가
+        write_result_csv(paths['output_result'], result_additional, codebook, mode='at')
+        print("[+] seat_result.csv 갱신 완료")
+
+        # 잔여 좌석 파일 업데이트 (배정된 좌석 제거)
+        if ledger is not None:
+            wave = ledger.record_additional_seats(result_rows(result_additional, codebook))
+            ledger.export_remaining_seats(paths['output_unmatched_seats'])
+            print(f"[+] 배정 원장 기록: {ledger.path} ({wave}차 추가 배정)")
+        else:
+            updated_seats = []
+            with open(paths['output_unmatched_seats'], mode='rt', encoding='UTF-8') as file:
+                for row in csv.reader(file):
+                    updated_seats.append(row)
+
+            allocated_keys = {(codebook.rooms[seat.room], seat.number)
+                              for _, seat, _ in result_additional.values()}
+            updated_seats = [s for s in updated_seats if (s[1], s[2]) not in allocated_keys]
+
+            with open(paths['output_unmatched_seats'], mode='wt', encoding='UTF-8', newline='') as file:
+                writer = csv.writer(file)
+                for s in updated_seats:
+                    writer.writerow(s)
+        print("[+] seat_unmatched_seat.csv 갱신 완료")
+
+        return list(result_rows(result_additional, codebook))
+    finally:
+        if ledger is not None:
+            ledger.close()
 
 
 if __name__ == "__main__":
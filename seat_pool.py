@@ -0,0 +1,161 @@
+"""
+좌석 풀(seat pool) 인덱스
+
+배정 가능한 좌석을 두 가지 인덱스로 나누어 관리합니다.
+  - (열람실, 좌석타입) 버킷: 지망 매칭 단계용
+  - (좌석타입, 노트북금지여부) 버킷: 잔여석 배정 단계용
+    (허용/금지 × 학년 매칭/미매칭 후보를 좌석타입 버킷 조합으로 바로 얻음)
+run_allocation의 모든 단계가 하나의 풀을 공유하며, 좌석이 배정되면
+두 인덱스에서 즉시 제거됩니다 (seatlist 전체를 다시 스캔하지 않음).
+
+추첨 방식 (config.yaml의 seat_pool_mode):
+  - compat: 버킷을 seatlist 순서 그대로 유지합니다. 기존 구현(seatlist 전체 스캔 후
+            random.choice)과 난수 소비 순서가 완전히 같아, 동일 시드 → 동일 결과.
+            공개 추첨 결과 검증에는 반드시 이 모드를 사용합니다.
+  - fast:   버킷 내 위치를 기록해 두고 O(1) 추첨 + swap-remove로 제거합니다.
+            배정 확률 분포는 compat과 같지만 같은 시드라도 개별 결과는 다릅니다.
+            (시뮬레이션용)
+"""
+
+import heapq
+import random
+from bisect import bisect_left
+
+
+POOL_MODES = ('compat', 'fast')
+
+
+class _BucketIndex:
+    """
+    좌석 id(seatlist 내 순번)를 key별 버킷으로 나눈 인덱스.
+    좌석 하나는 정확히 한 버킷에 속하며, 버킷은 처음에 id 오름차순(= seatlist 순서)입니다.
+    """
+
+    def __init__(self, keys):
+        self.key_of = keys  # key_of[seat_id] = 버킷 key
+        self.buckets = {}
+        self.pos = [0] * len(keys)  # fast 모드용: 버킷 내 현재 위치
+        for seat_id, key in enumerate(keys):
+            bucket = self.buckets.setdefault(key, [])
+            self.pos[seat_id] = len(bucket)
+            bucket.append(seat_id)
+        # reset()용 초기 상태 스냅샷
+        self._initial_buckets = {key: list(bucket) for key, bucket in self.buckets.items()}
+        self._initial_pos = list(self.pos)
+
+    def reset(self):
+        """초기 상태(모든 좌석이 있는 상태)로 되돌립니다. 리스트 복사만 하므로 재구축보다 저렴합니다."""
+        self.buckets = {key: list(bucket) for key, bucket in self._initial_buckets.items()}
+        self.pos = list(self._initial_pos)
+
+    def remove_ordered(self, seat_id):
+        """순서를 유지하며 제거합니다 (compat). 버킷이 정렬되어 있으므로 bisect로 위치를 찾음."""
+        bucket = self.buckets[self.key_of[seat_id]]
+        del bucket[bisect_left(bucket, seat_id)]
+
+    def remove_swap(self, seat_id):
+        """마지막 원소와 자리를 바꿔 O(1)로 제거합니다 (fast). 버킷 순서는 보장하지 않음."""
+        bucket = self.buckets[self.key_of[seat_id]]
+        idx = self.pos[seat_id]
+        last = bucket.pop()
+        if last != seat_id:
+            bucket[idx] = last
+            self.pos[last] = idx
+
+
+class SeatPool:
+    """
+    배정 가능한 좌석 풀.
+
+    seats는 원본 Seat 레코드 리스트이고, 배정 로직은 좌석 id(seats 내 순번)로 다룹니다.
+    배정된 좌석은 take()로 제거하며, 남은 좌석은 remaining_seats()로 원래 순서대로 얻습니다.
+    같은 좌석으로 배정을 반복할 때는 reset()으로 풀을 처음 상태로 되돌려 재사용합니다.
+    """
+
+    def __init__(self, seatlist, mode='compat', laptop_rooms=()):
+        if mode not in POOL_MODES:
+            raise ValueError(f"[!] 알 수 없는 seat_pool_mode: {mode} (허용: {', '.join(POOL_MODES)})")
+        self.mode = mode
+        self.seats = list(seatlist)
+        self.alive = [True] * len(self.seats)
+        self.size = len(self.seats)
+
+        # (열람실코드, 좌석타입코드) → 좌석 id 버킷
+        self.by_room_type = _BucketIndex([(seat.room, seat.seat_type) for seat in self.seats])
+
+        # (좌석타입코드, 노트북금지여부) → 좌석 id 버킷
+        laptop_rooms = set(laptop_rooms)
+        self.by_type_zone = _BucketIndex(
+            [(seat.seat_type, seat.room in laptop_rooms) for seat in self.seats])
+
+        # 열람실코드 → 좌석타입코드 목록 (등장 순서), 전체 좌석타입코드 목록
+        self.room_types = {}
+        self.seat_types = []
+        for room, seat_type in self.by_room_type.buckets:
+            self.room_types.setdefault(room, []).append(seat_type)
+            if seat_type not in self.seat_types:
+                self.seat_types.append(seat_type)
+
+    def __len__(self):
+        return self.size
+
+    def room_type_buckets(self, keys):
+        """(열람실, 좌석타입) key 목록에 해당하는 버킷들을 반환합니다 (없는 key는 무시)."""
+        buckets = self.by_room_type.buckets
+        return [buckets[key] for key in keys if key in buckets]
+
+    def type_zone_buckets(self, seat_types, banned):
+        """노트북 허용(banned=False) 또는 금지(banned=True) 열람실의 좌석타입별 버킷들을 반환합니다."""
+        buckets = self.by_type_zone.buckets
+        return [buckets[(t, banned)] for t in seat_types if (t, banned) in buckets]
+
+    def draw(self, buckets):
+        """
+        주어진 버킷들을 합친 후보 중 1석을 무작위로 뽑아 풀에서 제거합니다.
+
+        compat 모드는 버킷들을 seatlist 순서로 병합한 리스트에 random.choice를 적용하므로
+        기존 구현의 후보 리스트/난수 소비와 정확히 일치합니다.
+
+        Returns: 좌석 id 또는 None (후보가 없는 경우)
+        """
+        buckets = [b for b in buckets if b]
+        if not buckets:
+            return None
+
+        if self.mode == 'compat':
+            if len(buckets) == 1:
+                seat_id = random.choice(buckets[0])
+            else:
+                seat_id = random.choice(list(heapq.merge(*buckets)))
+        else:
+            r = random.randrange(sum(len(b) for b in buckets))
+            for bucket in buckets:
+                if r < len(bucket):
+                    seat_id = bucket[r]
+                    break
+                r -= len(bucket)
+
+        self.take(seat_id)
+        return seat_id
+
+    def take(self, seat_id):
+        """좌석을 풀에서 제거합니다 (모든 인덱스 갱신)."""
+        self.alive[seat_id] = False
+        self.size -= 1
+        if self.mode == 'compat':
+            self.by_room_type.remove_ordered(seat_id)
+            self.by_type_zone.remove_ordered(seat_id)
+        else:
+            self.by_room_type.remove_swap(seat_id)
+            self.by_type_zone.remove_swap(seat_id)
+
+    def reset(self):
+        """모든 좌석을 다시 배정 가능한 상태로 되돌립니다."""
+        self.alive = [True] * len(self.seats)
+        self.size = len(self.seats)
+        self.by_room_type.reset()
+        self.by_type_zone.reset()
+
+    def remaining_seats(self):
+        """남은 좌석 레코드를 원래 seatlist 순서대로 반환합니다."""
+        return [seat for seat, alive in zip(self.seats, self.alive) if alive]
@@ -0,0 +1,149 @@
+"""
+시뮬레이션 결과 캐시 (simulate.py)
+
+회차별 빈자리 결과({ 열람실명: 빈자리 수 })를 config.yaml 옆 .cache/simulation.sqlite3에 저장해 두고,
+같은 입력/설정/엔진/시드의 회차는 다시 계산하지 않습니다. --runs를 늘려 다시 실행하면 새 시드만 계산합니다.
+
+캐시 키:
+  context: SHA256(입력 파일 해시 + 정규화한 config + 엔진 이름 + 엔진 소스 해시 + 실행 환경 버전)
+    - 정규화한 config: 배정에 영향이 없는 항목(paths, 사물함, 원장 등)을 빼고 키 정렬 JSON으로 직렬화
+    - 엔진 소스: 배정 결과를 정하는 모듈(seat.py, config.py 등)의 소스 해시. 코드가 바뀌면 캐시도 자동으로 무효화
+    - 실행 환경 버전: Python 버전(random 모듈의 난수열), vectorized는 NumPy 버전도 포함
+  (시드, 배치 크기, 배치 내 순번): scalar는 (시드, 0, 0), vectorized는 (배치 시드, 배치 크기, 순번)
+
+최대 항목 수(max_entries, 회차 단위)를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다 (LRU).
+vectorized는 배치 단위로 저장하므로 --runs를 늘리면 크기가 바뀐 마지막 배치는 다시 계산합니다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+
+import digest
+
+
+CACHE_FILE = os.path.join('.cache', 'simulation.sqlite3')  # config.yaml과 같은 폴더 기준
+DEFAULT_MAX_ENTRIES = 200000
+
+# 배정 결과에 영향이 없어 캐시 키에서 빼는 config 항목
+IGNORED_CONFIG_KEYS = ('paths', 'locker_mapping', 'locker_out_of_service', 'ledger', 'allocation_jobs')
+
+# 엔진별 결과를 정하는 모듈 (소스 해시를 캐시 키에 포함)
+COMMON_MODULES = ('seat.py', 'records.py', 'config.py', 'components.py', 'optimal.py', 'simulate.py')
+ENGINE_MODULES = {
+    'scalar': ('seat_pool.py',) + COMMON_MODULES,
+    'vectorized': ('vectorized.py',) + COMMON_MODULES,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    context TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    vacancies TEXT NOT NULL,      -- { 열람실명: 빈자리 수 } JSON
+    used INTEGER NOT NULL,        -- 마지막 사용 순번 (LRU)
+    PRIMARY KEY (context, seed, size, idx)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_used ON runs (used);
+"""
+
+
+def runtime_tag(engine):
+    """결과에 영향을 주는 실행 환경 버전 (Python, vectorized는 NumPy까지)"""
+    tag = "python " + ".".join(map(str, sys.version_info[:3]))
+    if engine == 'vectorized':
+        import numpy
+        tag += f" numpy {numpy.__version__}"
+    return tag
+
+
+def context_key(config, engine):
+    """입력 파일, 정규화한 config, 엔진(이름 + 소스), 실행 환경 버전으로 캐시 context 키를 만듭니다."""
+    paths = config['paths']
+    normalized = {k: v for k, v in config.items() if k not in IGNORED_CONFIG_KEYS}
+    h = hashlib.sha256()
+    h.update(digest.file_sha256(paths['input_students']).encode())
+    h.update(digest.file_sha256(paths['input_seats']).encode())
+    h.update(json.dumps(normalized, ensure_ascii=False, sort_keys=True).encode('UTF-8'))
+    h.update(engine.encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ENGINE_MODULES[engine]:
+        h.update(digest.file_sha256(os.path.join(here, name)).encode())
+    h.update(runtime_tag(engine).encode())
+    return h.hexdigest()
+
+
+def task_key(task):
+    """simulate의 실행 단위 → (시드, 배치 크기) (scalar는 크기 0)"""
+    if isinstance(task, tuple):
+        return task
+    return task, 0
+
+
+class SimulationCache:
+    """
+    회차별 빈자리 결과 저장소. with SimulationCache() as cache: 형태로 사용합니다.
+
+    complete(context): 결과가 모두 저장된 실행 단위 키 집합 { (시드, 배치 크기) }
+    get(context, task): 실행 단위의 결과 목록 (없으면 None)
+    put(context, task, results): 실행 단위의 결과 목록 저장 (close 시 커밋 및 LRU 정리)
+    """
+
+    def __init__(self, path=CACHE_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._clock = self.conn.execute("SELECT COALESCE(MAX(used), 0) FROM runs").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def complete(self, context):
+        rows = self.conn.execute(
+            "SELECT seed, size, COUNT(*) FROM runs WHERE context = ? GROUP BY seed, size", (context,))
+        return {(seed, size) for seed, size, count in rows if count == max(size, 1)}
+
+    def get(self, context, task):
+        seed, size = task_key(task)
+        rows = self.conn.execute(
+            "SELECT vacancies FROM runs WHERE context = ? AND seed = ? AND size = ? ORDER BY idx",
+            (context, seed, size)).fetchall()
+        if len(rows) != max(size, 1):
+            return None
+        self.conn.execute("UPDATE runs SET used = ? WHERE context = ? AND seed = ? AND size = ?",
+                          (self._tick(), context, seed, size))
+        return [json.loads(vacancies) for (vacancies,) in rows]
+
+    def put(self, context, task, results):
+        seed, size = task_key(task)
+        used = self._tick()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO runs (context, seed, size, idx, vacancies, used) VALUES (?, ?, ?, ?, ?, ?)",
+            ((context, seed, size, idx, json.dumps(result, ensure_ascii=False), used)
+             for idx, result in enumerate(results)))
+
+    def evict(self):
+        """최대 항목 수를 넘는 만큼 가장 오래 쓰지 않은 항목을 지웁니다."""
+        count = self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM runs WHERE rowid IN (SELECT rowid FROM runs ORDER BY used LIMIT ?)",
+                (count - self.max_entries,))
+
+    def close(self):
+        self.evict()
+        self.conn.commit()
+        self.conn.close()
@@ -4,84 +4,367 @@
 서로 다른 시드로 N번 배정을 시뮬레이션하여
 열람실별 빈자리 발생 통계를 분석합니다.
 
-사용법: python simulate.py --runs=100
+각 회차의 시드는 마스터 시드(--seed)에서 순서대로 만들어지므로,
+같은 마스터 시드면 --jobs 값과 관계없이 항상 같은 통계가 나옵니다.
+
+엔진:
+  - scalar (기본): seat.run_allocation을 회차마다 실행
+  - vectorized:    NumPy로 여러 회차를 한 번에 실행 (vectorized.py, numpy 필요)
+                   --check로 두 엔진의 빈자리 분포가 같은지 확인할 수 있습니다.
+
+회차별 결과는 .cache/simulation.sqlite3에 캐시하므로(simcache.py), 입력/설정/시드가 같으면
+다시 계산하지 않고, --runs를 늘려 다시 실행하면 새 시드만 계산합니다 (--no-cache로 끔).
+
+통계는 회차마다 스트리밍으로 갱신하며(전체 값 목록을 보관하지 않음),
+--precision을 주면 모든 열람실의 빈자리 평균 95% 신뢰구간 반폭이 그 값 이하가 되는
+시점에 멈춥니다 (--runs는 최대 횟수).
+
+--sweep=FILE은 sweep 파일의 설정 변형들(phases, grade_to_seat_type, 노트북 금지 열람실,
+열람실 좌석타입 재분류 등)을 같은 시드로 시뮬레이션하여 변형별로 비교합니다 (sweep.py).
+
+사용법: python simulate.py --runs=100 [--jobs=4] [--seed=1234] [--engine=vectorized]
+        python simulate.py --runs=100000 --precision=0.05
+        python simulate.py --runs=200 --jobs=4 --sweep=sweep.yaml
 """
 
 import argparse
+import contextlib
+import math
+import os
 import random
-import statistics
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 from config import load_config
-from seat import load_students, load_seats, run_allocation
+from seat import AllocationContext
+import simcache
+
+
+# 병렬 실행 시 shard 하나에 담는 최대 실행 단위 수 (조기 종료 시 낭비를 줄이기 위함)
+MAX_SHARD_TASKS = 50
+
+# --precision: 신뢰구간 계산 배수(95%), 첫 수렴 확인 회차, 그 뒤 수렴 확인 간격
+Z_95 = 1.96
+MIN_RUNS_FOR_PRECISION = 30
+PRECISION_CHECK_INTERVAL = 100
 
 
-def run_single_simulation(config, seed):
+def run_single_simulation(config, seed, context=None):
     """
     주어진 seed로 1회 배정을 실행합니다.
+    context(AllocationContext)를 넘기지 않으면 입력 파일을 새로 읽습니다.
 
     Returns: { 열람실명: 빈자리 수 }
     """
-    paths = config['paths']
+    if context is None:
+        context = AllocationContext(config)
 
-    # 매 시뮬레이션마다 데이터를 새로 로드 (run_allocation이 in-place 수정하므로)
-    students = load_students(paths['input_students'])
-    seatlist_all = load_seats(paths['input_seats'])
-    seatlist_open = [s for s in seatlist_all if s[3] == 'open']
+    # 배정 실행 (빈자리 분포만 보므로 fast 추첨 사용)
+    return count_vacancies(context, context.run(seed))
 
-    # 배정 전 열람실별 총 좌석 수
-    room_total = defaultdict(int)
-    for seat in seatlist_open:
-        room_total[seat[1]] += 1
-
-    # 배정 실행
-    random.seed(seed)
-    result = run_allocation(students, seatlist_open, config)
 
+def count_vacancies(context, result):
+    """배정 결과에서 { 열람실명: 빈자리 수 }를 셉니다 (context의 열람실별 open 좌석 수 기준)."""
     # 배정된 좌석 수
     room_allocated = defaultdict(int)
-    for student_key, seat in result.items():
-        room_allocated[seat[1]] += 1
+    for _, seat, _ in result.values():
+        room_allocated[seat.room] += 1
 
     # 빈자리 = 총 좌석 - 배정된 좌석
-    return {room: room_total[room] - room_allocated.get(room, 0) for room in room_total}
+    rooms = context.codebook.rooms
+    return {rooms[room]: total - room_allocated.get(room, 0)
+            for room, total in context.room_total.items()}
+
+
+# ============================================================
+# 실행 단위 / 병렬 실행 (--jobs)
+# ============================================================
+
+# 워커 프로세스별 상태: 입력은 워커 시작 시 한 번만 파싱하여 재사용
+_worker_config = None
+_worker_context = None
+_worker_engine = None
+
+
+def _init_worker(config, engine='scalar'):
+    global _worker_config, _worker_context, _worker_engine
+    _worker_config = config
+    _worker_context = AllocationContext(config)
+    _worker_engine = None
+    if engine == 'vectorized':
+        from vectorized import VectorizedEngine
+        _worker_engine = VectorizedEngine(_worker_context)
+
+
+def _run_task(task):
+    """
+    실행 단위 하나를 처리합니다.
+      - scalar:     task = 시드          → 1회분 결과
+      - vectorized: task = (시드, 회수)  → 회수만큼의 결과
+    Returns: [ { 열람실명: 빈자리 수 }, ... ]
+    """
+    if _worker_engine is None:
+        return [run_single_simulation(_worker_config, task, _worker_context)]
+    seed, size = task
+    vacancies = _worker_engine.run(seed, size)
+    names = _worker_engine.room_names
+    return [dict(zip(names, row)) for row in vacancies.tolist()]
+
+
+def _run_shard(tasks):
+    """실행 단위 묶음(shard)을 순서대로 실행하여 실행 단위별 결과 리스트를 반환합니다."""
+    return [_run_task(task) for task in tasks]
+
+
+def make_seeds(master_seed, runs):
+    """마스터 시드에서 회차별 시드를 만듭니다 (병렬 개수와 무관하게 동일)."""
+    rng = random.Random(master_seed)
+    return [rng.randint(0, 2**32 - 1) for _ in range(runs)]
+
+
+def make_tasks(seeds, engine='scalar', batch=2000):
+    """
+    시드 목록을 실행 단위로 나눕니다.
+    vectorized는 batch회씩 묶고, 각 묶음의 첫 시드를 그 묶음의 시드로 사용합니다.
+    """
+    if engine == 'scalar':
+        return list(seeds)
+    return [(seeds[i], min(batch, len(seeds) - i)) for i in range(0, len(seeds), batch)]
+
+
+def iter_simulations(config, seeds, jobs=1, engine='scalar', batch=2000, cache=None):
+    """
+    seeds의 각 시드로 배정을 실행하며, 회차 순서대로 결과를 하나씩 내보냅니다 (generator).
+
+    jobs > 1이면 실행 단위를 연속 구간(shard)으로 나누어 프로세스 풀에서 실행하고,
+    결과는 shard 순서대로 내보내므로 jobs와 관계없이 순서가 같습니다.
+    중간에 generator를 닫으면(조기 종료) 아직 시작하지 않은 shard는 취소됩니다.
+
+    cache(simcache.SimulationCache)를 주면 저장된 실행 단위는 캐시에서 읽고,
+    나머지만 실행한 뒤 결과를 캐시에 저장합니다.
+    """
+    tasks = make_tasks(seeds, engine, batch)
+    done = 0
+
+    context = None
+    hits = set()
+    if cache is not None:
+        context = simcache.context_key(config, engine)
+        hits = cache.complete(context)
+    missing = [task for task in tasks if simcache.task_key(task) not in hits]
+    if cache is not None:
+        print(f"[*] 캐시: 실행 단위 {len(tasks) - len(missing)}/{len(tasks)}개 재사용")
+
+    executor = None
+    if not missing:
+        computed = iter(())
+    elif jobs <= 1:
+        _init_worker(config, engine)
+        computed = map(_run_task, missing)
+    else:
+        # 진행 상황 출력/부하 분산/조기 종료를 위해 워커 수보다 잘게 나눔
+        shard_size = max(1, min(len(missing) // (jobs * 4), MAX_SHARD_TASKS))
+        shards = [missing[i:i + shard_size] for i in range(0, len(missing), shard_size)]
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                       initargs=(config, engine))
+        computed = (results for shard_result in executor.map(_run_shard, shards)
+                    for results in shard_result)
+
+    try:
+        for task in tasks:
+            if simcache.task_key(task) in hits:
+                results = cache.get(context, task)
+            else:
+                results = next(computed)
+                if cache is not None:
+                    cache.put(context, task, results)
+            for result in results:
+                yield result
+                done += 1
+                if engine == 'scalar' and done % 10 == 0:
+                    print(f"[*] {done}/{len(seeds)} 시뮬레이션 완료")
+            if engine != 'scalar':
+                print(f"[*] {done}/{len(seeds)} 시뮬레이션 완료")
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# ============================================================
+# 스트리밍 통계
+# ============================================================
+
+class RunningStats:
+    """
+    값 하나씩 갱신하는 스트리밍 통계 (전체 값 목록을 보관하지 않음).
+
+    평균/분산은 Welford 방식으로 갱신합니다.
+    분위수는 값별 빈도(히스토그램)로 계산하는데, 빈자리 수는 범위가 좁은 정수라
+    히스토그램 크기가 회차 수와 무관하게 작고 분위수도 정확합니다.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self.histogram = Counter()
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        self.histogram[x] += 1
+
+    @property
+    def variance(self):
+        """표본분산 (n-1)"""
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        """q 분위수 (nearest-rank)"""
+        rank = max(1, math.ceil(q * self.n))
+        seen = 0
+        for value in sorted(self.histogram):
+            seen += self.histogram[value]
+            if seen >= rank:
+                return value
+        return self.max
+
+    def half_width(self, z=Z_95):
+        """평균의 신뢰구간 반폭 (기본 95%)"""
+        return z * self.stdev / math.sqrt(self.n) if self.n > 1 else math.inf
+
+
+def summarize(results, precision=None):
+    """
+    회차별 결과를 스트리밍으로 집계하여 { 열람실명: RunningStats }를 반환합니다.
+
+    precision이 주어지면 MIN_RUNS_FOR_PRECISION회째에 처음, 그 뒤 PRECISION_CHECK_INTERVAL회마다
+    (30, 130, 230, ...) 모든 열람실의 95% 신뢰구간 반폭이 precision 이하인지 확인하고, 만족하면 그 자리에서 중단합니다.
+    확인 시점은 회차 수로만 정해지므로 --jobs와 관계없이 같은 회차에서 멈춥니다.
+    """
+    stats = defaultdict(RunningStats)
+    runs = 0
+    with contextlib.closing(iter(results)) as it:
+        for vacancies in it:
+            for room, count in vacancies.items():
+                stats[room].add(count)
+            runs += 1
+            if (precision is not None and runs >= MIN_RUNS_FOR_PRECISION
+                    and (runs - MIN_RUNS_FOR_PRECISION) % PRECISION_CHECK_INTERVAL == 0
+                    and all(st.half_width() <= precision for st in stats.values())):
+                print(f"[*] 목표 정밀도(±{precision}) 도달: {runs}회에서 중단")
+                break
+    return stats
+
+
+def check_engines(config, seeds, jobs=1, batch=2000, cache=None):
+    """
+    scalar(seat.run_allocation)와 vectorized 엔진을 같은 횟수로 실행하여
+    열람실별 빈자리 평균을 비교합니다. |z| > 4인 열람실이 있으면 분포가 다르다고 판단합니다.
+
+    Returns: 분포 일치 여부
+    """
+    print("[*] scalar 엔진 실행")
+    scalar = summarize(iter_simulations(config, seeds, jobs, 'scalar', cache=cache))
+    print("[*] vectorized 엔진 실행")
+    vectorized = summarize(iter_simulations(config, seeds, jobs, 'vectorized', batch, cache))
+
+    print(f"\n=== 엔진 분포 비교 ({len(seeds)}회) ===")
+    print(f"{'열람실':<25} {'scalar':>8} {'vector':>8} {'z':>7}")
+    print("-" * 52)
+    ok = True
+    for room in sorted(scalar.keys() | vectorized.keys()):
+        a, b = scalar[room], vectorized[room]
+        var = (a.variance / a.n if a.n else 0) + (b.variance / b.n if b.n else 0)
+        diff = a.mean - b.mean
+        z = diff / math.sqrt(var) if var > 0 else (0.0 if diff == 0 else math.inf)
+        flag = "" if abs(z) <= 4 else "  [!]"
+        ok = ok and not flag
+        print(f"{room:<25} {a.mean:>8.2f} {b.mean:>8.2f} {z:>7.2f}{flag}")
+    print("-" * 52)
+    print("[OK] 분포 일치" if ok else "[!] 분포 불일치 열람실이 있습니다.")
+    return ok
 
 
 def main():
     parser = argparse.ArgumentParser(description='좌석 배정 시뮬레이션')
-    parser.add_argument('--runs', type=int, default=100, help='시뮬레이션 횟수 (기본: 100)')
+    parser.add_argument('--runs', type=int, default=100,
+                        help='시뮬레이션 횟수 (기본: 100, --precision 사용 시 최대 횟수)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='병렬 프로세스 수 (기본: 1, 0이면 CPU 코어 수)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='마스터 시드 (지정하지 않으면 무작위, 결과 재현 시 사용)')
+    parser.add_argument('--engine', choices=['scalar', 'vectorized'], default='scalar',
+                        help='scalar: seat.run_allocation 반복 / vectorized: NumPy 배치 엔진')
+    parser.add_argument('--batch', type=int, default=2000,
+                        help='vectorized 엔진의 1회 배치 크기 (기본: 2000)')
+    parser.add_argument('--check', action='store_true',
+                        help='scalar와 vectorized 엔진의 빈자리 분포를 비교')
+    parser.add_argument('--precision', type=float, default=None,
+                        help='모든 열람실의 빈자리 평균 95%% 신뢰구간 반폭이 이 값 이하가 되면 조기 종료')
+    parser.add_argument('--sweep', default=None, metavar='FILE',
+                        help='sweep 파일(YAML)의 설정 변형들을 같은 시드로 시뮬레이션하여 비교 (sweep.py, '
+                             'scalar 엔진/고정 횟수/캐시 없음)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'결과 캐시({simcache.CACHE_FILE})를 읽거나 쓰지 않고 모든 회차를 새로 계산')
+    parser.add_argument('--cache-size', type=int, default=simcache.DEFAULT_MAX_ENTRIES,
+                        help=f'캐시에 보관할 최대 회차 수, 넘으면 오래 안 쓴 것부터 삭제 (기본: {simcache.DEFAULT_MAX_ENTRIES})')
     args = parser.parse_args()
+    if args.sweep:
+        # sweep은 변형별 scalar 엔진 고정 횟수 실행만 지원 (결과 캐시도 쓰지 않음)
+        if args.engine != 'scalar':
+            parser.error("--sweep은 --engine=scalar만 지원합니다")
+        if args.precision is not None:
+            parser.error("--sweep은 --precision을 지원하지 않습니다 (--runs회 고정)")
+        if args.check:
+            parser.error("--sweep과 --check는 함께 쓸 수 없습니다")
 
     config = load_config()
+    jobs = args.jobs or os.cpu_count() or 1
+    master_seed = args.seed if args.seed is not None else random.randint(0, 2**32 - 1)
+    print(f"[*] 마스터 시드: {master_seed} (병렬 {jobs}개, 엔진 {args.engine})")
+    seeds = make_seeds(master_seed, args.runs)
 
-    # 시뮬레이션 실행
-    all_vacancies = defaultdict(list)
+    if args.sweep:
+        print("[*] --sweep은 결과 캐시(.cache/simulation.sqlite3)를 쓰지 않고 모든 회차를 계산합니다")
+        from sweep import run_sweep
+        run_sweep(config, args.sweep, seeds, jobs)
+        return
 
-    for i in range(args.runs):
-        seed = random.randint(0, 2**32 - 1)
-        vacancies = run_single_simulation(config, seed)
-        for room, count in vacancies.items():
-            all_vacancies[room].append(count)
+    cache = None if args.no_cache else simcache.SimulationCache(max_entries=args.cache_size)
+    with cache or contextlib.nullcontext():
+        if args.check:
+            check_engines(config, seeds, jobs, args.batch, cache)
+            return
 
-        if (i + 1) % 10 == 0:
-            print(f"[*] {i + 1}/{args.runs} 시뮬레이션 완료")
+        # 시뮬레이션 실행
+        stats = summarize(iter_simulations(config, seeds, jobs, args.engine, args.batch, cache),
+                          args.precision)
+    runs = max((st.n for st in stats.values()), default=0)
 
     # 결과 출력
-    print(f"\n=== 시뮬레이션 결과 ({args.runs}회) ===")
-    print(f"{'열람실':<25} {'평균':>6} {'최소':>6} {'최대':>6} {'표준편차':>8}")
-    print("-" * 55)
+    print(f"\n=== 시뮬레이션 결과 ({runs}회) ===")
+    print(f"{'열람실':<25} {'평균':>6} {'최소':>6} {'최대':>6} {'표준편차':>8} {'5%':>5} {'95%':>5} {'±95%CI':>7}")
+    print("-" * 78)
 
     total_vacancy_mean = 0
-    for room in sorted(all_vacancies.keys()):
-        data = all_vacancies[room]
-        mean = statistics.mean(data)
-        mn = min(data)
-        mx = max(data)
-        stdev = statistics.stdev(data) if len(data) > 1 else 0
-        print(f"{room:<25} {mean:>6.1f} {mn:>6} {mx:>6} {stdev:>8.2f}")
-        total_vacancy_mean += mean
-
-    print("-" * 55)
+    for room in sorted(stats.keys()):
+        st = stats[room]
+        print(f"{room:<25} {st.mean:>6.1f} {st.min:>6} {st.max:>6} {st.stdev:>8.2f} "
+              f"{st.quantile(0.05):>5} {st.quantile(0.95):>5} {st.half_width():>7.3f}")
+        total_vacancy_mean += st.mean
+
+    print("-" * 78)
     print(f"{'전체 빈자리 합계':<25} {total_vacancy_mean:>6.1f}")
 
 
@@ -3,10 +3,20 @@
 
 좌석 배정 결과를 분석하여 열람실별 1지망/2지망/3지망 충족률을 출력합니다.
 학년 그룹별(1-2학년, 3학년+수료생, 졸업생)로 분리하여 통계를 냅니다.
+
+신청자 지망은 PreferenceIndex로 한 번만 색인하고, 결과 파일마다 한 번씩만 훑어
+(열람실, 학년 그룹, 지망 순위)별 당첨자 수를 셉니다. 결과를 여러 개 주면
+(시뮬레이션의 여러 시드 등) 회차별 당첨자 수와 충족률의 분포(평균, 최소~최대, 표준편차)를 출력합니다.
+
+사용법: python stats.py                         # output/seat_result.csv 1개
+        python stats.py a.csv b.csv ...          # 여러 결과 파일
+        python stats.py --runs=200 [--seed=1234] # 현재 config/입력으로 N회 추첨한 결과 (파일 저장 없음)
 """
 
+import argparse
 import csv
-from collections import defaultdict
+import statistics
+from collections import Counter
 
 from config import load_config
 
@@ -18,6 +28,9 @@ GRADE_GROUPS = {
     '졸업생': ['졸업생'],
 }
 
+# 지망 순위 → 출력 라벨 (0: 1~3지망이 아닌 열람실에 배정)
+RANK_LABELS = {1: '1지망', 2: '2지망', 3: '3지망', 0: '지망X'}
+
 
 def load_applicants(input_path):
     """설문 응답 데이터를 로드합니다."""
@@ -28,79 +41,174 @@ def load_applicants(input_path):
         return [dict(zip(headers, row[:len(headers)])) for row in reader]
 
 
-def load_results(result_path):
-    """좌석 배정 결과를 로드합니다."""
+def read_result_rows(result_path):
+    """좌석 배정 결과 CSV의 행 [성명, 학번뒤2자리, 열람실, 좌석번호, ...]을 하나씩 반환합니다 (헤더 제외)."""
     with open(result_path, mode='r', encoding='utf-8') as infile:
         reader = csv.reader(infile)
         next(reader)
-        return [dict(zip(['성명', '학번뒤2자리', '열람실', '좌석번호'], row)) for row in reader]
+        yield from reader
 
 
-def compute_stats_for_group(students, results_lookup, group_label):
+# ============================================================
+# 집계
+# ============================================================
+
+class PreferenceIndex:
     """
-    학생 그룹에 대한 열람실별 지망 통계를 계산합니다.
+    신청자 지망 색인. 한 번 만들어 두고 여러 배정 결과에 재사용합니다.
 
-    Returns: { "열람실_그룹라벨": { '1지망 지원자 수': N, '1지망 당첨자 수': N, ... } }
+    by_key: '성명+학번뒤2자리' → [(그룹 라벨, (1지망, 2지망, 3지망)), ...] (같은 key의 신청자가 여럿일 수 있음)
+    applied: (열람실, 그룹 라벨, 지망 순위 1~3) → 지원자 수
+    """
+
+    def __init__(self, applicants):
+        group_of = {grade: label for label, grades in GRADE_GROUPS.items() for grade in grades}
+        self.by_key = {}
+        self.applied = Counter()
+        for a in applicants:
+            group = group_of.get(a.get('학년'))
+            if group is None:
+                continue
+            prefs = (a.get('1지망'), a.get('2지망'), a.get('3지망'))
+            self.by_key.setdefault(a['성명'] + a['학번'][-2:], []).append((group, prefs))
+            for rank, room in enumerate(prefs, 1):
+                if room is not None:
+                    self.applied[(room, group, rank)] += 1
+
+    def count(self, result_rows):
+        """
+        배정 결과 행을 한 번 훑어 (열람실, 그룹 라벨, 지망 순위)별 당첨자 수를 셉니다.
+        같은 '성명+학번뒤2자리'가 결과에 여러 번 있으면 마지막 행을 씁니다.
+
+        Returns: Counter { (열람실, 그룹 라벨, 지망 순위 1~3 / 지망X 0): 당첨자 수 }
+        """
+        lookup = {row[0] + row[1]: row[2] for row in result_rows if len(row) >= 3}
+        counts = Counter()
+        for key, entries in self.by_key.items():
+            room = lookup.get(key)
+            if room is None:
+                continue
+            for group, prefs in entries:
+                rank = prefs.index(room) + 1 if room in prefs else 0
+                counts[(room, group, rank)] += 1
+        return counts
+
+    def room_groups(self, counts_list):
+        """통계 대상 (열람실, 그룹 라벨): 그룹 학생이 지망했거나 배정된 열람실"""
+        keys = {(room, group) for room, group, _ in self.applied}
+        for counts in counts_list:
+            keys.update((room, group) for room, group, _ in counts)
+        return keys
+
+
+def summarize(values):
+    """값 목록의 평균, 최소, 최대, 표준편차"""
+    return {'mean': statistics.fmean(values), 'min': min(values), 'max': max(values),
+            'stdev': statistics.pstdev(values)}
+
+
+def room_stats(index, counts_list):
+    """
+    결과별 집계(counts_list)를 열람실_그룹별 통계로 모읍니다.
+
+    Returns: { "열람실_그룹라벨": {
+                 '1지망 지원자 수': N, ...,
+                 '1지망 당첨자 수': [결과별 값, ...], ..., '지망X 당첨자 수': [...] } }
+    """
+    stats = {}
+    for room, group in index.room_groups(counts_list):
+        data = {f"{RANK_LABELS[rank]} 지원자 수": index.applied[(room, group, rank)] for rank in (1, 2, 3)}
+        for rank, label in RANK_LABELS.items():
+            data[f"{label} 당첨자 수"] = [counts[(room, group, rank)] for counts in counts_list]
+        stats[f"{room}_{group}"] = data
+    return stats
+
+
+# ============================================================
+# 출력
+# ============================================================
+
+def is_contested(first_applied, won):
+    """1지망 지원자가 1지망 당첨자보다 많고, 2·3지망/지망X 당첨자가 있는 열람실만 출력"""
+    return (first_applied > won['1지망']
+            and (won['2지망'] > 0 or won['3지망'] > 0 or won['지망X'] > 0))
+
+
+def print_single(stats):
+    """결과 1개: 열람실_그룹별 지원자/당첨자 수"""
+    print("--- 열람실 신청 및 배정 결과 통계 ---")
+    for room in sorted(stats.keys()):
+        data = stats[room]
+        won = {label: data[f"{label} 당첨자 수"][0] for label in RANK_LABELS.values()}
+        if sum(won.values()) > 0 and is_contested(data['1지망 지원자 수'], won):
+            print(f"\n[ {room} ]")
+            print(f"  - 1지망 지원자 / 1지망 당첨자 / 2지망 당첨자 / 3지망 당첨자 / 지망X 당첨자: "
+                  f"{data['1지망 지원자 수']} / {won['1지망']} / {won['2지망']} / "
+                  f"{won['3지망']} / {won['지망X']}")
+
+
+def print_spread(stats, n_results):
     """
-    # 해당 그룹 학생들이 지망한 모든 열람실 수집
-    all_rooms = set()
-    for s in students:
-        all_rooms.update([s['1지망'], s['2지망'], s['3지망']])
-    all_rooms.discard(None)
-
-    stats = {room: defaultdict(int) for room in all_rooms}
-
-    # 1지망 지원자 수
-    for s in students:
-        room = s['1지망']
-        if room in stats:
-            stats[room]['1지망 지원자 수'] += 1
-
-    # 당첨자 지망 매칭 통계
-    for s in students:
-        key = s['성명'] + s['학번'][-2:]
-        if key not in results_lookup:
+    결과 여러 개: 열람실_그룹별 당첨자 수와 N지망 충족률(당첨자 / N지망 지원자)의 분포.
+    당첨자가 있는 모든 열람실을 출력하고, 1지망 경쟁이 있는 열람실(is_contested, 평균 기준)은 표시합니다.
+    """
+    print(f"--- 열람실 신청 및 배정 결과 통계 (결과 {n_results}개) ---")
+    print("    (* 표시: 1지망 지원자가 1지망 당첨자보다 많고 2·3지망/지망X 당첨자가 있는 열람실)")
+    for room in sorted(stats.keys()):
+        data = stats[room]
+        won = {label: summarize(data[f"{label} 당첨자 수"]) for label in RANK_LABELS.values()}
+        if sum(s['max'] for s in won.values()) == 0:
             continue
-        assigned = results_lookup[key]
-        if assigned not in stats:
-            stats[assigned] = defaultdict(int)
-
-        if s['1지망'] == assigned:
-            stats[assigned]['1지망 당첨자 수'] += 1
-        elif s['2지망'] == assigned:
-            stats[assigned]['2지망 당첨자 수'] += 1
-        elif s['3지망'] == assigned:
-            stats[assigned]['3지망 당첨자 수'] += 1
-        else:
-            stats[assigned]['지망X 당첨자 수'] += 1
+        contested = is_contested(data['1지망 지원자 수'], {label: s['mean'] for label, s in won.items()})
+
+        print(f"\n[ {room} ]{' *' if contested else ''}")
+        for rank, label in RANK_LABELS.items():
+            s = won[label]
+            line = (f"  - {label} 당첨자: 평균 {s['mean']:.1f} "
+                    f"(최소 {s['min']} ~ 최대 {s['max']}, 표준편차 {s['stdev']:.1f})")
+            applied = data.get(f"{label} 지원자 수")
+            if applied:
+                rates = summarize([v / applied for v in data[f"{label} 당첨자 수"]])
+                line += (f" / 지원자 {applied}명, 충족률 {rates['mean']:.1%} "
+                         f"({rates['min']:.1%} ~ {rates['max']:.1%})")
+            print(line)
+
+
+def simulated_results(config, runs, master_seed):
+    """
+    현재 config/입력으로 runs회 추첨한 결과 행을 회차마다 반환합니다.
+    simulate.py와 같은 시드 규칙과 추첨 방식(fast)을 쓰므로 같은 시드면 같은 추첨 결과입니다.
+    """
+    from seat import AllocationContext, result_rows
+    from simulate import make_seeds
 
-    return {f"{room}_{group_label}": data for room, data in stats.items()}
+    context = AllocationContext(config, pool_mode='fast')
+    for seed in make_seeds(master_seed, runs):
+        yield result_rows(context.run(seed), context.codebook)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='배정 결과 통계 (열람실별 1~3지망 충족률)')
+    parser.add_argument('results', nargs='*', help='배정 결과 CSV (기본: config의 output_result)')
+    parser.add_argument('--runs', type=int, default=None, help='결과 파일 대신 N회 추첨한 결과로 통계')
+    parser.add_argument('--seed', type=int, default=1234, help='--runs의 마스터 시드 (기본 1234)')
+    args = parser.parse_args()
+
     try:
         config = load_config()
         paths = config['paths']
 
-        applicants = load_applicants(paths['input_students'])
-        results = load_results(paths['output_result'])
-        results_lookup = {r['성명'] + r['학번뒤2자리']: r['열람실'] for r in results}
-
-        all_stats = {}
-        for label, grades in GRADE_GROUPS.items():
-            group = [a for a in applicants if a.get('학년') in grades]
-            all_stats.update(compute_stats_for_group(group, results_lookup, label))
-
-        print("--- 열람실 신청 및 배정 결과 통계 ---")
-        for room in sorted(all_stats.keys()):
-            data = all_stats[room]
-            if (sum(data.values()) > 0 and
-                    data['1지망 지원자 수'] > data['1지망 당첨자 수'] and
-                    (data['2지망 당첨자 수'] > 0 or data['3지망 당첨자 수'] > 0 or data['지망X 당첨자 수'] > 0)):
-                print(f"\n[ {room} ]")
-                print(f"  - 1지망 지원자 / 1지망 당첨자 / 2지망 당첨자 / 3지망 당첨자 / 지망X 당첨자: "
-                      f"{data['1지망 지원자 수']} / {data['1지망 당첨자 수']} / {data['2지망 당첨자 수']} / "
-                      f"{data['3지망 당첨자 수']} / {data['지망X 당첨자 수']}")
+        index = PreferenceIndex(load_applicants(paths['input_students']))
+        if args.runs:
+            counts_list = [index.count(rows) for rows in simulated_results(config, args.runs, args.seed)]
+        else:
+            counts_list = [index.count(read_result_rows(path)) for path in args.results or [paths['output_result']]]
+
+        stats = room_stats(index, counts_list)
+        if len(counts_list) == 1:
+            print_single(stats)
+        else:
+            print_spread(stats, len(counts_list))
 
     except FileNotFoundError as e:
         print(f"오류: '{e.filename}' 파일을 찾을 수 없습니다.")
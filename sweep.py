@@ -0,0 +1,253 @@
+"""
+설정 변형 비교 시뮬레이션 (simulate.py --sweep)
+
+config.yaml을 직접 고치지 않고, sweep 파일(YAML)에 적은 설정 변형들을 같은 시드로 시뮬레이션하여
+변형별 빈자리 합계, 1지망 배정률, 미배정 학생 수와 열람실별 빈자리 평균을 한 표로 비교합니다.
+첫 번째 변형은 항상 현재 config.yaml 그대로입니다.
+
+sweep 파일 형식:
+  variants:                 # 개별 변형: 이름 → 덮어쓸 config 항목
+    졸업생 먼저:
+      phases: [...]
+  grid:                     # 항목별 후보: 모든 조합을 변형으로 만듦 (이름은 "후보1 + 후보2")
+    laptop_not_allowed_zones:
+      노트북 기본: ["15동 401호(평상)", "15동 401호(칸막이)"]
+      노트북 전면 허용: []
+    room_seat_types:
+      재분류 없음: {}
+      국산 2학년석: { "국산(칸막이)": "2학년" }
+
+덮어쓰기 규칙:
+  - dict 항목(grade_to_seat_type 등)은 키 단위로 덮어쓰고, 그 밖의 항목(phases, 목록 등)은 통째로 바꿉니다.
+  - room_seat_types: { 열람실: 좌석타입 } — 그 열람실 좌석을 모두 해당 좌석타입으로 재분류합니다.
+  - paths는 바꿀 수 없습니다 (모든 변형이 같은 입력 파일을 씀).
+
+입력 파일은 한 번만 읽어 워커마다 한 번씩 넘기고, 워커는 변형별 AllocationContext를 한 번만 만들어 재사용합니다.
+모든 변형이 같은 시드 목록을 쓰므로(공통 난수) 변형 간 차이가 시드 편차에 덜 묻힙니다.
+실행 단위 순서대로 집계하므로 --jobs와 관계없이 같은 결과가 나옵니다.
+"""
+
+import copy
+import csv
+import io
+import itertools
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from config import validate_config
+from seat import AllocationContext
+from simulate import RunningStats, count_vacancies
+
+
+BASE_NAME = 'config.yaml'
+MAX_CHUNK_SEEDS = 100  # 실행 단위 하나에 담는 최대 시드 수 (진행 상황 출력/부하 분산)
+
+
+# ============================================================
+# sweep 파일 → 변형 목록
+# ============================================================
+
+def load_sweep(path):
+    """
+    sweep 파일을 읽어 변형 목록을 반환합니다 (config.yaml 기준 변형 제외).
+
+    Returns: [ (변형 이름, { 덮어쓸 항목: 값 }), ... ]
+    """
+    import yaml
+    with open(path, mode='r', encoding='UTF-8') as f:
+        spec = yaml.safe_load(f) or {}
+
+    variants = list((spec.get('variants') or {}).items())
+    grid = spec.get('grid') or {}
+    for key, options in grid.items():
+        if not isinstance(options, dict) or not options:
+            raise ValueError(f"[!] sweep grid의 '{key}'은(는) {{ 후보 이름: 값 }} 형식이어야 합니다.")
+    if grid:
+        keys = list(grid)
+        for combo in itertools.product(*(grid[key].items() for key in keys)):
+            name = " + ".join(label for label, _ in combo)
+            variants.append((name, {key: value for key, (_, value) in zip(keys, combo)}))
+    return variants
+
+
+def apply_overrides(config, overrides):
+    """
+    config 복사본에 덮어쓰기를 적용합니다.
+
+    Returns: (변형 config, { 열람실: 좌석타입 } 재분류)
+    """
+    variant = copy.deepcopy(config)
+    retype = {}
+    for key, value in (overrides or {}).items():
+        if key == 'room_seat_types':
+            retype.update(value or {})
+        elif key == 'paths':
+            raise ValueError("[!] sweep 변형에서 paths는 바꿀 수 없습니다.")
+        elif isinstance(value, dict) and isinstance(variant.get(key), dict):
+            variant[key].update(value)
+        else:
+            variant[key] = value
+    return variant, retype
+
+
+def validate_variant(name, variant, retype):
+    """변형 config와 좌석 재분류가 valid 목록과 맞는지 검증합니다."""
+    errors = []
+    for room, seat_type in retype.items():
+        if room not in variant.get('valid_rooms', []):
+            errors.append(f"room_seat_types의 열람실 '{room}'이(가) valid_rooms에 없습니다.")
+        if seat_type not in variant.get('valid_seat_types', []):
+            errors.append(f"room_seat_types의 좌석타입 '{seat_type}'이(가) valid_seat_types에 없습니다.")
+    if errors:
+        raise ValueError(f"[!] sweep 변형 '{name}' 검증 오류:\n" + "\n".join(f"  - {e}" for e in errors))
+    try:
+        validate_config(variant)
+    except ValueError as e:
+        raise ValueError(f"[!] sweep 변형 '{name}': {e}") from None
+
+
+def retype_seat_lines(seat_lines, retype):
+    """좌석 목록 CSV 줄에서 retype의 열람실 좌석타입을 바꾼 줄들을 반환합니다."""
+    if not retype:
+        return seat_lines
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    for i, row in enumerate(csv.reader(seat_lines)):
+        if i > 0 and len(row) > 1 and row[1] in retype:
+            row[0] = retype[row[1]]
+        writer.writerow(row)
+    return buf.getvalue().splitlines(keepends=True)
+
+
+# ============================================================
+# 실행 (워커)
+# ============================================================
+
+# 워커 프로세스별 상태: 입력 줄은 워커 시작 시 한 번만 받고, 변형별 컨텍스트는 처음 쓸 때 만듦
+_worker_student_lines = None
+_worker_seat_lines = None
+_worker_contexts = {}
+
+
+def _init_worker(student_lines, seat_lines):
+    global _worker_student_lines, _worker_seat_lines
+    _worker_student_lines = student_lines
+    _worker_seat_lines = seat_lines
+    _worker_contexts.clear()
+
+
+def _run_chunk(task):
+    """
+    변형 하나의 시드 묶음을 실행합니다.
+
+    task: (변형 번호, 변형 config, 좌석 재분류, [시드, ...])
+    Returns: (변형 번호, 신청자 수, [ ({ 열람실명: 빈자리 수 }, 1지망 배정 수, 배정 학생 수), ... ])
+    """
+    index, variant, retype, seeds = task
+    context = _worker_contexts.get(index)
+    if context is None:
+        context = AllocationContext(variant, student_lines=_worker_student_lines,
+                                    seat_lines=retype_seat_lines(_worker_seat_lines, retype))
+        _worker_contexts[index] = context
+
+    runs = []
+    for seed in seeds:
+        result = context.run(seed)
+        first = sum(1 for _, _, rank in result.values() if rank == 1)
+        runs.append((count_vacancies(context, result), first, len(result)))
+    return index, len(context.students), runs
+
+
+# ============================================================
+# 집계 / 출력
+# ============================================================
+
+class VariantStats:
+    """
+    변형 하나의 스트리밍 통계.
+
+    rooms: 열람실명 → 빈자리 RunningStats
+    vacancies / first_rate / unassigned: 회차별 빈자리 합계 / 1지망 배정률 / 미배정 학생 수
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.applicants = 0
+        self.rooms = defaultdict(RunningStats)
+        self.vacancies = RunningStats()
+        self.first_rate = RunningStats()
+        self.unassigned = RunningStats()
+
+    def add(self, applicants, vacancies, first, assigned):
+        self.applicants = applicants
+        for room, count in vacancies.items():
+            self.rooms[room].add(count)
+        self.vacancies.add(sum(vacancies.values()))
+        self.first_rate.add(first / applicants if applicants else 0.0)
+        self.unassigned.add(applicants - assigned)
+
+
+def print_comparison(variant_stats, runs):
+    print(f"\n=== 설정 변형 비교 (변형 {len(variant_stats)}개 × {runs}회, 같은 시드) ===")
+    print(f"{'#':>3}  {'변형':<30} {'빈자리 합계':>8} {'±95%CI':>7} {'1지망 배정률':>10} {'미배정 학생':>8}")
+    print("-" * 78)
+    for i, vs in enumerate(variant_stats):
+        print(f"{i:>3}  {vs.name:<30} {vs.vacancies.mean:>8.1f} {vs.vacancies.half_width():>7.2f} "
+              f"{vs.first_rate.mean:>10.1%} {vs.unassigned.mean:>8.1f}")
+
+    print(f"\n--- 열람실별 빈자리 평균 ---")
+    rooms = sorted(set().union(*(vs.rooms.keys() for vs in variant_stats)))
+    print(f"{'열람실':<25}" + "".join(f"{'#' + str(i):>8}" for i in range(len(variant_stats))))
+    print("-" * (25 + 8 * len(variant_stats)))
+    for room in rooms:
+        print(f"{room:<25}" + "".join(f"{vs.rooms[room].mean:>8.1f}" for vs in variant_stats))
+
+
+def run_sweep(config, sweep_path, seeds, jobs=1):
+    """
+    sweep 파일의 변형들을 seeds로 시뮬레이션하고 비교표를 출력합니다.
+
+    Returns: [ VariantStats, ... ] (0번은 config.yaml 그대로)
+    """
+    variants = [(BASE_NAME, {})] + load_sweep(sweep_path)
+    prepared = []
+    for name, overrides in variants:
+        variant, retype = apply_overrides(config, overrides)
+        validate_variant(name, variant, retype)
+        prepared.append((variant, retype))
+    print(f"[*] 설정 변형 {len(variants)}개 × {len(seeds)}회 시뮬레이션 (병렬 {jobs}개)")
+
+    # 입력 파일은 한 번만 읽음
+    paths = config['paths']
+    with open(paths['input_students'], mode='rt', encoding='UTF-8') as f:
+        student_lines = f.readlines()
+    with open(paths['input_seats'], mode='rt', encoding='UTF-8') as f:
+        seat_lines = f.readlines()
+
+    total = len(variants) * len(seeds)
+    chunk = max(1, min(-(-total // (jobs * 4)), MAX_CHUNK_SEEDS))
+    tasks = [(i, variant, retype, seeds[s:s + chunk])
+             for i, (variant, retype) in enumerate(prepared)
+             for s in range(0, len(seeds), chunk)]
+
+    variant_stats = [VariantStats(name) for name, _ in variants]
+    done = 0
+
+    def collect(chunk_results):
+        nonlocal done
+        for index, applicants, runs in chunk_results:
+            for vacancies, first, assigned in runs:
+                variant_stats[index].add(applicants, vacancies, first, assigned)
+            done += len(runs)
+            print(f"[*] {done}/{total} 시뮬레이션 완료")
+
+    if jobs <= 1:
+        _init_worker(student_lines, seat_lines)
+        collect(map(_run_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(student_lines, seat_lines)) as executor:
+            collect(executor.map(_run_chunk, tasks))
+
+    print_comparison(variant_stats, len(seeds))
+    return variant_stats
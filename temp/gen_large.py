@@ -0,0 +1,202 @@
+"""
+대규모 합성 데이터셋 생성기 (벤치마크/스트레스 테스트용)
+
+임의 개수의 열람실/좌석으로 seatlist.csv를, 임의 인원(수백만 명 가능)으로 input_data.csv를 만들고,
+그에 맞는 config.yaml(valid_rooms, laptop_not_allowed_zones, locker_mapping)을 함께 생성합니다.
+나머지 config 항목(학년/좌석타입, phases 등)은 현재 config.yaml을 그대로 사용합니다.
+
+  - 좌석타입 비율: 현재 seatlist.csv의 open 좌석 비율, 열람실마다 타입별로 연속된 번호 구간
+  - 학년 비율: gen_sample.py의 GRADE_COUNTS 비율
+  - 지망 분포: gen_sample.py와 같은 가중치 (자기 학년 좌석 수 + 다른 타입 좌석 수 × 0.3)
+  - 사물함: 열람실마다 좌석 수만큼의 사물함 1개 구간
+
+행은 리스트에 모으지 않고 바로 파일에 쓰며, 같은 --seed면 같은 파일이 생성됩니다.
+
+사용법: python temp/gen_large.py --rooms 200 --seats-per-room 100 --students 1000000 [--seed 42]
+출력:   OUTDIR/config.yaml, OUTDIR/input/seatlist.csv, OUTDIR/input/input_data.csv (기본 OUTDIR: temp/large)
+실행:   cd temp/large && python ../../run.py
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+from bisect import bisect_right
+from collections import Counter
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from config import load_config
+from gen_sample import GRADE_COUNTS, LAST_NAMES, FIRST_SYLLABLES
+
+APPLICANT_HEADER = [
+    "타임스탬프",
+    "이메일 주소",
+    "1. 본인의 성명을 입력해주십시오.",
+    "2. 본인의 학번을 입력해 주십시오",
+    "3. 본인의 학년 또는 지위를 선택해 주십시오.",
+    "4. 1지망~3지망 지정좌석을 각각 선택해 주십시오. [1지망]",
+    "4. 1지망~3지망 지정좌석을 각각 선택해 주십시오. [2지망]",
+    "4. 1지망~3지망 지정좌석을 각각 선택해 주십시오. [3지망]",
+]
+
+SEAT_HEADER = ["학년", "열람실", "번호", "배치유무"]
+
+EMAIL_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def room_name(idx):
+    return f"합성 {idx + 1:04d}호"
+
+
+def seat_type_ratio(config):
+    """현재 seatlist.csv의 open 좌석 좌석타입 비율 (valid_seat_types 순서)"""
+    counts = Counter()
+    with open(config['paths']['input_seats'], mode='rt', encoding='UTF-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if len(row) >= 4 and row[3] == 'open':
+                counts[row[0]] += 1
+    total = sum(counts.values())
+    return [(t, counts[t] / total) for t in config['valid_seat_types'] if counts[t]]
+
+
+def write_seatlist(path, rooms, seats_per_room, ratio, closed_ratio, rng):
+    """
+    열람실마다 seats_per_room석을 좌석타입 비율대로 번호 구간을 나눠 씁니다.
+
+    Returns: { 열람실: { 좌석타입: open 좌석 수 } }
+    """
+    room_type_counts = {}
+    with open(path, mode='wt', encoding='UTF-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(SEAT_HEADER)
+        for room in rooms:
+            counts = Counter()
+            number = 1
+            for i, (seat_type, share) in enumerate(ratio):
+                # 마지막 타입이 나머지를 모두 가져가 열람실 좌석 수를 정확히 맞춤
+                n = seats_per_room - number + 1 if i == len(ratio) - 1 else round(seats_per_room * share)
+                for _ in range(n):
+                    status = 'closed' if rng.random() < closed_ratio else 'open'
+                    writer.writerow([seat_type, room, number, status])
+                    if status == 'open':
+                        counts[seat_type] += 1
+                    number += 1
+            room_type_counts[room] = counts
+    return room_type_counts
+
+
+def grade_cum_weights(config, rooms, room_type_counts):
+    """학년별 열람실 누적 가중치 (gen_sample.load_room_weights와 같은 가중치)"""
+    grade_map = config['grade_to_seat_type']
+    cum_weights = {}
+    for grade in GRADE_COUNTS:
+        preferred_type = grade_map.get(grade, grade)
+        weights = []
+        for room in rooms:
+            counts = room_type_counts[room]
+            matched = counts.get(preferred_type, 0)
+            other = sum(c for t, c in counts.items() if t != preferred_type)
+            weights.append(matched + other * 0.3 + 1e-9)  # 좌석이 모두 closed인 열람실도 선택 가능
+        cum_weights[grade] = list(itertools.accumulate(weights))
+    return cum_weights
+
+
+def pick_preferences(rooms, cum_weights, rng):
+    """누적 가중치로 중복 없는 1~3지망을 뽑습니다 (중복이 나오면 다시 뽑음)."""
+    total = cum_weights[-1]
+    chosen = []
+    while len(chosen) < 3:
+        room = rooms[bisect_right(cum_weights, rng.random() * total)]
+        if room not in chosen:
+            chosen.append(room)
+    return chosen
+
+
+def write_applicants(path, n_students, rooms, cum_weights, rng):
+    """n_students명의 신청 행을 한 줄씩 씁니다. 학번은 '연도-순번' 형식으로 모두 다름."""
+    grades = list(GRADE_COUNTS)
+    grade_cum = list(itertools.accumulate(GRADE_COUNTS.values()))
+    timestamp = "1/11/2000 12:00"
+
+    with open(path, mode='wt', encoding='UTF-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(APPLICANT_HEADER)
+        for i in range(n_students):
+            grade = grades[bisect_right(grade_cum, rng.random() * grade_cum[-1])]
+            name = rng.choice(LAST_NAMES) + rng.choice(FIRST_SYLLABLES) + rng.choice(FIRST_SYLLABLES)
+            email = "".join(rng.choices(EMAIL_CHARS, k=10)) + "@snu.ac.kr"
+            sid = f"{2000 + i // 100000}-{i % 100000:05d}"
+            writer.writerow([timestamp, email, name, sid, grade]
+                            + pick_preferences(rooms, cum_weights[grade], rng))
+            if (i + 1) % 1000000 == 0:
+                print(f"[*] 신청자 {i + 1:,}명 생성")
+
+
+def write_config(path, config, rooms, laptop_rooms, room_type_counts):
+    """현재 config에 열람실/노트북 금지/사물함 매핑(사용 불가 사물함 없음)만 바꿔 저장합니다."""
+    config = dict(config)
+    config['valid_rooms'] = rooms
+    config['laptop_not_allowed_zones'] = laptop_rooms
+    config['locker_mapping'] = {
+        room: {'lockers': [{'location': f"{room} 사물함", 'start': 1,
+                            'end': max(1, sum(room_type_counts[room].values()))}]}
+        for room in rooms
+    }
+    config['locker_out_of_service'] = {}  # 기존 사물함 위치는 새 매핑에 없음
+    with open(path, mode='wt', encoding='UTF-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='대규모 합성 데이터셋 생성기')
+    parser.add_argument('--rooms', type=int, default=100, help='열람실 수 (최소 3, 기본 100)')
+    parser.add_argument('--seats-per-room', type=int, default=60, help='열람실당 좌석 수 (기본 60)')
+    parser.add_argument('--students', type=int, default=None,
+                        help='신청자 수 (기본: 전체 좌석 수의 90%%)')
+    parser.add_argument('--closed-ratio', type=float, default=0.02, help='closed 좌석 비율 (기본 0.02)')
+    parser.add_argument('--laptop-ratio', type=float, default=0.2,
+                        help='노트북 금지 열람실 비율 (기본 0.2)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드 (기본 42)')
+    parser.add_argument('--outdir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'large'),
+                        help='출력 폴더 (기본 temp/large)')
+    args = parser.parse_args()
+
+    if args.rooms < 3:
+        parser.error("--rooms는 3 이상이어야 합니다 (1~3지망이 서로 달라야 함)")
+
+    config = load_config()
+    rng = random.Random(args.seed)
+    n_students = args.students if args.students is not None else int(args.rooms * args.seats_per_room * 0.9)
+
+    rooms = [room_name(i) for i in range(args.rooms)]
+    laptop_rooms = rooms[:round(args.rooms * args.laptop_ratio)]
+
+    input_dir = os.path.join(args.outdir, os.path.dirname(os.path.normpath(config['paths']['input_seats'])))
+    os.makedirs(input_dir, exist_ok=True)
+    os.makedirs(os.path.join(args.outdir, os.path.dirname(os.path.normpath(config['paths']['output_result']))),
+                exist_ok=True)
+
+    seat_path = os.path.normpath(os.path.join(args.outdir, config['paths']['input_seats']))
+    room_type_counts = write_seatlist(seat_path, rooms, args.seats_per_room,
+                                      seat_type_ratio(config), args.closed_ratio, rng)
+    print(f"[+] 좌석 {args.rooms * args.seats_per_room:,}석 ({args.rooms}개 열람실) 생성 완료: {seat_path}")
+
+    applicant_path = os.path.normpath(os.path.join(args.outdir, config['paths']['input_students']))
+    write_applicants(applicant_path, n_students, rooms,
+                     grade_cum_weights(config, rooms, room_type_counts), rng)
+    print(f"[+] 신청자 {n_students:,}명 생성 완료: {applicant_path}")
+
+    config_path = os.path.join(args.outdir, 'config.yaml')
+    write_config(config_path, config, rooms, laptop_rooms, room_type_counts)
+    print(f"[+] config 생성 완료: {config_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ compare.csv (학적부)와 input_data.csv (신청서)를 대조하여 다음을
   4. 1학년/2학년/3학년 외의 학년으로 신청한 사람
   5. 매칭 안 된 사람 (한쪽에만 존재)
   6. input_data 내 동명이인
+  7. 유사 매칭 후보: 5의 양쪽 명단에서 학번 오타 등으로 같은 사람으로 보이는 쌍 (fuzzy_match.py)
 
 해당 목록에 있다고 하여 문제되는 것은 아니며, 단지 검토가 필요한 경우입니다.
 """
@@ -17,6 +18,8 @@ import os
 import sys
 from collections import defaultdict
 
+from fuzzy_match import Record, suggest_pairs
+
 
 def load_compare(path):
     """compare.csv를 읽어 학번을 key로 하는 dict 반환"""
@@ -29,6 +32,7 @@ def load_compare(path):
                 "이름": row["한글성명"].strip(),
                 "학적상태": row["학적상태"].strip(),
                 "학년": row["학년"].strip(),
+                "이메일": (row.get("이메일") or "").strip(),  # 선택 열 (유사 매칭에 사용)
             }
     return students
 
@@ -116,6 +120,12 @@ def validate(compare_path, input_path):
     )
     only_input = sorted(input_ids - compare_ids)
 
+    # 7. 유사 매칭 후보 (input에만 있는 사람 ↔ compare에만 있는 사람, 학번 연도 제한 없음)
+    fuzzy_pairs = suggest_pairs(
+        [Record(sid, inp[sid]["이름"], inp[sid]["이메일"]) for sid in only_input],
+        [Record(sid, compare[sid]["이름"], compare[sid]["이메일"]) for sid in sorted(compare_ids - input_ids)],
+    )
+
     # --- 출력 ---
     print("=" * 60)
     print("1. 이름 불일치 (학번 매칭됨, 이름 다름)")
@@ -188,6 +198,18 @@ def validate(compare_path, input_path):
     else:
         print("    없음")
 
+    print()
+    print("=" * 60)
+    print("7. 유사 매칭 후보 (input에만 있는 사람 → compare에만 있는 사람)")
+    print("=" * 60)
+    if fuzzy_pairs:
+        for score, sid_sim, name_sim, email_match, i_rec, c_rec in fuzzy_pairs:
+            print(f"  신청서: {i_rec.sid} {i_rec.name} → 학적부: {c_rec.sid} {c_rec.name} | "
+                  f"점수 {score:.2f} (학번 {sid_sim:.2f}, 이름 {name_sim:.2f}, "
+                  f"이메일 {'O' if email_match else 'X'})")
+    else:
+        print("  없음")
+
     # 요약
     print()
     print("=" * 60)
@@ -203,6 +225,7 @@ def validate(compare_path, input_path):
     print(f"  동명이인: {len(duplicated_names)}건 ({sum(len(s) for s in duplicated_names.values())}명)")
     print(f"  compare에만 존재: {len(only_compare)}명")
     print(f"  input에만 존재: {len(only_input)}명")
+    print(f"  유사 매칭 후보: {len(fuzzy_pairs)}건")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""
+NumPy 벡터화 배치 시뮬레이션 엔진
+
+AllocationContext와 같은 입력으로 B회의 배정(추첨)을 한 번에 실행합니다.
+config.yaml의 phases 의미는 seat.run_allocation과 같습니다.
+
+같은 (열람실, 좌석타입)의 좌석은 서로 구별할 필요가 없으므로 좌석 하나하나 대신
+남은 좌석 수만 (B, 열람실, 좌석타입) 배열로 추적합니다.
+  - 지망 매칭: 학년 매칭 타입에 자리가 있으면 그 타입, 없으면 나머지 타입 중
+    남은 좌석 수에 비례하여 선택 (= 좌석 단위 균등 추첨과 같은 분포)
+  - 잔여석 배정: 후보 풀(허용/금지 × 학년 매칭/미매칭) 중 첫 번째로 비어있지 않은 풀에서
+    (열람실, 좌석타입)을 남은 좌석 수에 비례하여 선택
+학생 처리 순서는 회차마다 독립적인 무작위 순열입니다.
+
+개별 배정 결과가 아니라 빈자리 분포만 필요할 때(simulate.py --engine=vectorized) 사용합니다.
+"""
+
+import numpy as np
+
+
+def _sample(rng, weights, totals):
+    """행마다 weights에 비례하여 열 index 하나를 뽑습니다 (totals == 0인 행의 값은 무의미)."""
+    u = rng.random(len(weights)) * totals
+    return (np.cumsum(weights, axis=1) <= u[:, None]).sum(axis=1)
+
+
+class VectorizedEngine:
+    """AllocationContext의 학생/좌석을 배열로 바꿔 두고, run()마다 B회를 동시에 배정합니다."""
+
+    def __init__(self, context):
+        codebook = context.codebook
+
+        # phase 설정을 코드로 변환 (코드표 크기가 확정되기 전에 먼저 수행)
+        self.phases = []
+        for phase in context.config['phases']:
+            if phase['type'] == 'preference':
+                grades = sorted(codebook.grade(g) for g in phase.get('student_types', []))
+                seat_types = sorted(codebook.seat_types.code_set(phase.get('seat_types', [])))
+                self.phases.append(('preference', grades, seat_types))
+            elif phase['type'] == 'unmatched':
+                self.phases.append(('unmatched', None, None))
+            else:
+                raise ValueError(f"[!] 알 수 없는 phase type: {phase['type']}")
+
+        students = list(context.students.values())
+        n_rooms = len(codebook.rooms)
+        n_types = len(codebook.seat_types)
+        self.n_rooms, self.n_types = n_rooms, n_types
+
+        self.grade = np.array([s.grade for s in students], dtype=np.int64)
+        self.prefs = np.array([s.prefs for s in students], dtype=np.int64).reshape(-1, 3)
+        self.seat_type = np.array([s.seat_type for s in students], dtype=np.int64)
+        self.laptop = np.array([s.laptop for s in students], dtype=np.int64)
+
+        # (열람실, 좌석타입) → open 좌석 수
+        self.capacity = np.zeros((n_rooms, n_types), dtype=np.int32)
+        for seat in context.seats:
+            self.capacity[seat.room, seat.seat_type] += 1
+
+        # 결과에 포함할 열람실 (open 좌석이 있는 열람실, AllocationContext.room_total과 같은 순서)
+        self.rooms = list(context.room_total)
+        self.room_names = [codebook.rooms[r] for r in self.rooms]
+
+        # 잔여석 배정 후보 풀 마스크: [우선좌석타입, 노트북금지신청여부] → (4, 열람실*좌석타입)
+        banned = np.zeros(n_rooms, dtype=bool)
+        banned[sorted(codebook.laptop_rooms)] = True
+        self.pool_masks = np.zeros((n_types, 2, 4, n_rooms * n_types), dtype=bool)
+        for t in range(n_types):
+            matched = np.zeros((n_rooms, n_types), dtype=bool)
+            matched[:, t] = True
+            others = ~matched
+            # 금지 열람실 신청자: 학년 매칭 → 미매칭 (허용/금지 구분 없음)
+            self.pool_masks[t, 1, 0] = matched.ravel()
+            self.pool_masks[t, 1, 1] = others.ravel()
+            # 비신청자: 허용+매칭 → 허용+미매칭 → 금지+매칭 → 금지+미매칭
+            self.pool_masks[t, 0, 0] = (matched & ~banned[:, None]).ravel()
+            self.pool_masks[t, 0, 1] = (others & ~banned[:, None]).ravel()
+            self.pool_masks[t, 0, 2] = (matched & banned[:, None]).ravel()
+            self.pool_masks[t, 0, 3] = (others & banned[:, None]).ravel()
+
+    def run(self, seed, batch):
+        """
+        seed로 batch회의 배정을 동시에 실행합니다.
+
+        Returns: 빈자리 수 배열 (batch, len(self.rooms)), 열 순서는 self.room_names
+        """
+        rng = np.random.default_rng(seed)
+        remaining = np.broadcast_to(self.capacity, (batch, self.n_rooms, self.n_types)).copy()
+        assigned = np.zeros((batch, len(self.grade)), dtype=bool)
+
+        for kind, grades, seat_types in self.phases:
+            if kind == 'preference':
+                self._allocate_by_preference(rng, remaining, assigned, grades, seat_types)
+            else:
+                self._allocate_remaining(rng, remaining, assigned)
+
+        return remaining.sum(axis=2)[:, self.rooms]
+
+    def _allocate_by_preference(self, rng, remaining, assigned, grades, seat_types):
+        batch = len(remaining)
+        rows = np.arange(batch)
+        candidates = np.flatnonzero(np.isin(self.grade, grades)) if grades else np.arange(len(self.grade))
+        if not len(candidates):
+            return
+
+        type_mask = np.zeros(self.n_types, dtype=np.int32)
+        type_mask[seat_types if seat_types else slice(None)] = 1
+
+        for pref_idx in range(3):
+            order = candidates[np.argsort(rng.random((batch, len(candidates))), axis=1)]
+            for j in range(len(candidates)):
+                student = order[:, j]
+                active = ~assigned[rows, student]
+                b, student = rows[active], student[active]
+                if not len(b):
+                    continue
+
+                room = self.prefs[student, pref_idx]
+                preferred_type = self.seat_type[student]
+                counts = remaining[b, room] * type_mask  # (b, 좌석타입)
+                totals = counts.sum(axis=1)
+
+                # 학년 매칭 타입 우선, 없으면 나머지 타입에서 좌석 수 비례 추첨
+                chosen = preferred_type.copy()
+                ok = totals > 0
+                fallback = np.flatnonzero(ok & (counts[np.arange(len(b)), preferred_type] == 0))
+                if len(fallback):
+                    chosen[fallback] = _sample(rng, counts[fallback], totals[fallback])
+
+                remaining[b[ok], room[ok], chosen[ok]] -= 1
+                assigned[b[ok], student[ok]] = True
+
+    def _allocate_remaining(self, rng, remaining, assigned):
+        batch, n_students = assigned.shape
+        rows = np.arange(batch)
+        flat = remaining.reshape(batch, -1)  # remaining의 view
+
+        order = np.argsort(rng.random((batch, n_students)), axis=1)
+        for j in range(n_students):
+            student = order[:, j]
+            active = ~assigned[rows, student]
+            b, student = rows[active], student[active]
+            if not len(b):
+                continue
+
+            counts = flat[b]  # (b, 열람실*좌석타입)
+            masks = self.pool_masks[self.seat_type[student], self.laptop[student]]  # (b, 4, 열람실*좌석타입)
+            pool_totals = (masks * counts[:, None, :]).sum(axis=2)  # (b, 4)
+
+            # 비어있지 않은 첫 번째 풀에서 좌석 수 비례 추첨
+            nonempty = pool_totals > 0
+            first = nonempty.argmax(axis=1)
+            idx = np.arange(len(b))
+            cell = _sample(rng, counts * masks[idx, first], pool_totals[idx, first])
+
+            ok = nonempty.any(axis=1)
+            flat[b[ok], cell[ok]] -= 1
+            assigned[b[ok], student[ok]] = True